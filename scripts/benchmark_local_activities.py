@@ -0,0 +1,206 @@
+"""
+Compares VideoEditWorkflow orchestration overhead with regular and local
+activities for the cheap steps (safety_precheck, plan_iteration, qa_iteration).
+
+The real activities are replaced by instant stubs under the same names, so the
+numbers measure Temporal scheduling and dispatch only: end-to-end latency per
+job and history events per workflow. Like the real ones, the stubs are sync
+activities run on per-queue thread pools, so dispatch costs the same. Run against a Temporal server:
+
+    python scripts/benchmark_local_activities.py --jobs 50
+    python scripts/benchmark_local_activities.py --dev-server   # downloads the Temporal CLI dev server
+    python scripts/benchmark_local_activities.py --time-skipping   # downloads the Temporal test server
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Unique queues keep the stubs away from tasks of real workers on the same server.
+# The workflow reads the executor and prefetch queues from settings, so set them before importing it.
+BENCH_SUFFIX = uuid.uuid4().hex[:8]
+os.environ["TEMPORAL_EXECUTOR_TASK_QUEUE"] = f"bench-executor-{BENCH_SUFFIX}"
+os.environ["TEMPORAL_PREFETCH_TASK_QUEUE"] = f"bench-prefetch-{BENCH_SUFFIX}"
+
+from temporalio import activity
+from temporalio.client import Client
+from temporalio.worker import Worker
+
+from video_platform.config import settings
+from video_platform.worker.contracts import (
+    ActivityExecutionResult,
+    ActivityPlanResult,
+    ActivityQAResult,
+    ActivitySafetyResult,
+    WorkflowInput,
+)
+from video_platform.worker.workflows import VideoEditWorkflow
+
+
+@activity.defn(name="safety_precheck")
+def stub_safety_precheck(job_id: str) -> ActivitySafetyResult:
+    return ActivitySafetyResult(allowed=True)
+
+
+@activity.defn(name="plan_iteration")
+def stub_plan_iteration(
+    job_id: str, iteration: int, prior_issues: list[dict], speculative: bool = False, variants: int = 1
+) -> ActivityPlanResult:
+    return ActivityPlanResult(edit_plan={}, variants=[{} for _ in range(variants)] if variants > 1 else [])
+
+
+@activity.defn(name="prefetch_input")
+def stub_prefetch_input(job_id: str) -> None:
+    return None
+
+
+@activity.defn(name="execute_iteration")
+def stub_execute_iteration(
+    job_id: str, iteration: int, edit_plan: dict, variant: int | None = None
+) -> ActivityExecutionResult:
+    return ActivityExecutionResult(output_uri=f"minio://output/{job_id}/edited.mp4", execution_log={})
+
+
+@activity.defn(name="select_variant")
+def stub_select_variant(job_id: str, iteration: int, candidates: list[dict]) -> ActivityExecutionResult:
+    return ActivityExecutionResult(output_uri=candidates[0]["output_uri"], execution_log=candidates[0]["execution_log"])
+
+
+@activity.defn(name="qa_iteration")
+def stub_qa_iteration(job_id: str, iteration: int, output_uri: str) -> ActivityQAResult:
+    return ActivityQAResult(report={}, passed=True)
+
+
+@activity.defn(name="finalize_success")
+def stub_finalize_success(job_id: str, iteration: int, report: dict, output_uri: str) -> None:
+    return None
+
+
+async def run_mode(client: Client, task_queue: str, jobs: int, concurrency: int, local: bool) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> tuple[float, int]:
+        async with semaphore:
+            job_id = f"bench-{uuid.uuid4()}"
+            started = time.perf_counter()
+            handle = await client.start_workflow(
+                VideoEditWorkflow.run,
+                WorkflowInput(job_id=job_id, local_activities=local),
+                id=f"video-edit-{job_id}",
+                task_queue=task_queue,
+            )
+            await handle.result()
+            elapsed = time.perf_counter() - started
+            history = await handle.fetch_history()
+            return elapsed, len(history.events)
+
+    results = await asyncio.gather(*(one() for _ in range(jobs)))
+    latencies = sorted(r[0] * 1000 for r in results)
+    return {
+        "mode": "local" if local else "regular",
+        "jobs": jobs,
+        "mean_ms": statistics.fmean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "history_events": statistics.fmean(r[1] for r in results),
+    }
+
+
+def build_workers(client: Client, control_queue: str) -> tuple[list[Worker], list[ThreadPoolExecutor]]:
+    """Control, executor and prefetch workers with the same pools and limits as run_worker.build_workers."""
+    control_pool = ThreadPoolExecutor(max_workers=settings.worker_max_concurrent_activities)
+    executor_slots = max(1, settings.worker_max_concurrent_executions)
+    executor_pool = ThreadPoolExecutor(max_workers=executor_slots)
+    prefetches = max(1, settings.worker_max_concurrent_prefetches)
+    prefetch_pool = ThreadPoolExecutor(max_workers=prefetches)
+    control = Worker(
+        client,
+        task_queue=control_queue,
+        activity_executor=control_pool,
+        max_concurrent_activities=settings.worker_max_concurrent_activities,
+        workflows=[VideoEditWorkflow],
+        activities=[
+            stub_safety_precheck,
+            stub_plan_iteration,
+            stub_select_variant,
+            stub_qa_iteration,
+            stub_finalize_success,
+        ],
+    )
+    executor_worker = Worker(
+        client,
+        task_queue=settings.temporal_executor_task_queue,
+        activity_executor=executor_pool,
+        max_concurrent_activities=executor_slots,
+        activities=[stub_execute_iteration],
+    )
+    prefetch_worker = Worker(
+        client,
+        task_queue=settings.temporal_prefetch_task_queue,
+        activity_executor=prefetch_pool,
+        max_concurrent_activities=prefetches,
+        activities=[stub_prefetch_input],
+    )
+    return [control, executor_worker, prefetch_worker], [control_pool, executor_pool, prefetch_pool]
+
+
+async def run_benchmark(client: Client, jobs: int, concurrency: int, warmup: int) -> list[dict]:
+    control_queue = f"bench-control-{BENCH_SUFFIX}"
+    (control, executor_worker, prefetch_worker), pools = build_workers(client, control_queue)
+    rows = []
+    try:
+        async with control, executor_worker, prefetch_worker:
+            for local in (False, True):
+                if warmup:
+                    await run_mode(client, control_queue, warmup, 1, local)
+                rows.append(await run_mode(client, control_queue, jobs, concurrency, local))
+    finally:
+        for pool in pools:
+            pool.shutdown()
+    return rows
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--dev-server", action="store_true", help="start a throwaway Temporal dev server")
+    parser.add_argument(
+        "--time-skipping", action="store_true", help="start a throwaway time-skipping Temporal test server"
+    )
+    args = parser.parse_args()
+
+    env = None
+    if args.dev_server or args.time_skipping:
+        from temporalio.testing import WorkflowEnvironment
+
+        if args.time_skipping:
+            env = await WorkflowEnvironment.start_time_skipping()
+        else:
+            env = await WorkflowEnvironment.start_local()
+        client = env.client
+    else:
+        client = await Client.connect(settings.temporal_address, namespace=settings.temporal_namespace)
+
+    try:
+        rows = await run_benchmark(client, args.jobs, args.concurrency, args.warmup)
+    finally:
+        if env is not None:
+            await env.shutdown()
+
+    print(f"{'mode':<8} {'jobs':>5} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'history events':>15}")
+    for row in rows:
+        print(
+            f"{row['mode']:<8} {row['jobs']:>5} {row['mean_ms']:>9.1f} {row['p50_ms']:>8.1f} "
+            f"{row['p95_ms']:>8.1f} {row['history_events']:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+
+from video_platform.runners.masks import MaskSequence
+from video_platform.services.artifact_cache import ArtifactCache, artifact_key
+
+
+def test_artifact_key_depends_on_params():
+    base = artifact_key("abc", "track", {"points": [[1, 2]], "fixes": []})
+    assert base == artifact_key("abc", "track", {"fixes": [], "points": [[1, 2]]})
+    assert base != artifact_key("abc", "track", {"points": [[1, 2]], "fixes": ["instruction_partial_match"]})
+    assert base != artifact_key("def", "track", {"points": [[1, 2]], "fixes": []})
+
+
+def test_artifact_cache_round_trips_frames_and_masks(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    frames = [np.full((4, 6, 3), i, dtype=np.uint8) for i in range(3)]
+    masks = [np.eye(4, 6, dtype=np.uint8) * 255 for _ in range(3)]
+
+    assert cache.load_frames("decode", "k1") is None
+    stored = cache.store_frames("k1", iter(frames))
+    assert stored.shape == (3, 4, 6, 3)
+    cache.store_masks("k2", MaskSequence.from_masks(masks))
+
+    loaded = cache.load_frames("decode", "k1")
+    assert loaded.shape == (3, 4, 6, 3)
+    assert int(loaded[2, 0, 0, 0]) == 2
+    assert all(np.array_equal(a, b) for a, b in zip(cache.load_masks("track", "k2"), masks))
+    assert cache.stats == {"decode": "hit", "track": "hit"}
+
+
+def test_artifact_key_depends_on_step_version():
+    assert artifact_key("abc", "track", {}, version=1) != artifact_key("abc", "track", {}, version=2)
+
+
+def test_artifact_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = ArtifactCache(str(tmp_path), max_bytes=2500)
+    frames = [np.zeros((10, 10, 3), dtype=np.uint8)] * 4  # 1200 bytes per entry
+    cache.store_frames("old", iter(frames))
+    cache.store_frames("used", iter(frames))
+    os.utime(tmp_path / "old.frames", (1, 1))
+    os.utime(tmp_path / "old.frames.json", (1, 1))
+    os.utime(tmp_path / "used.frames", (2, 2))
+    os.utime(tmp_path / "used.frames.json", (2, 2))
+    assert cache.load_frames("decode", "used") is not None
+
+    cache.store_frames("new", iter(frames))
+    assert cache.load_frames("decode", "old") is None
+    assert cache.load_frames("decode", "used") is not None
+    assert cache.load_frames("decode", "new") is not None
+
+
+class FakeRemote:
+    def __init__(self):
+        self.objects = {}
+
+    def fetch(self, name, path):
+        if name not in self.objects:
+            return False
+        path.write_bytes(self.objects[name])
+        return True
+
+    def upload(self, path):
+        self.objects[path.name] = path.read_bytes()
+
+
+def test_artifact_cache_falls_back_to_remote_tier(tmp_path):
+    remote = FakeRemote()
+    masks = MaskSequence.from_masks([np.eye(4, 6, dtype=np.uint8) * 255] * 2)
+    ArtifactCache(str(tmp_path / "worker_a"), remote=remote).store_masks("k", masks)
+
+    other = ArtifactCache(str(tmp_path / "worker_b"), remote=remote)
+    loaded = other.load_masks("track", "k")
+    assert other.stats == {"track": "remote_hit"}
+    assert len(loaded) == 2 and np.array_equal(loaded[1], masks[1])
+    assert other.load_masks("track", "k") is not None
+    assert other.stats == {"track": "hit"}
@@ -0,0 +1,56 @@
+from fastapi.testclient import TestClient
+
+from video_platform.api.main import app
+from video_platform.config import settings
+
+TOKEN = {"X-API-Token": "dev-token"}
+
+
+def _job(instruction: str) -> dict:
+    return {"instruction": instruction, "input_uri": "file://samples/1601_raw.mp4"}
+
+
+def test_batch_creates_all_jobs_under_one_batch_id():
+    client = TestClient(app)
+    res = client.post(
+        "/api/v1/jobs:batch",
+        json={"jobs": [_job("Do a celebrity face swap deepfake"), _job("Make a deepfake of a politician")]},
+        headers=TOKEN,
+    )
+    assert res.status_code == 201
+    body = res.json()
+    assert len(body["items"]) == 2
+    assert len({item["job_id"] for item in body["items"]}) == 2
+    assert body["batch_id"]
+
+
+def test_batch_is_idempotent_and_bounded():
+    client = TestClient(app)
+    headers = {**TOKEN, "Idempotency-Key": "batch-idempotency-test"}
+    payload = {"jobs": [_job("Do a celebrity face swap deepfake")]}
+    first = client.post("/api/v1/jobs:batch", json=payload, headers=headers).json()
+    second = client.post("/api/v1/jobs:batch", json=payload, headers=headers).json()
+    assert first["batch_id"] == second["batch_id"]
+    assert [item["job_id"] for item in first["items"]] == [item["job_id"] for item in second["items"]]
+
+    too_many = {"jobs": [_job("remove the cup")] * (settings.batch_max_jobs + 1)}
+    assert client.post("/api/v1/jobs:batch", json=too_many, headers=TOKEN).status_code == 400
+
+
+def test_batch_progress_is_404_only_for_unknown_batches(monkeypatch):
+    from temporalio.service import RPCError, RPCStatusCode
+
+    from video_platform.api.routes import jobs
+
+    def failing_with(code):
+        async def get_batch_progress(batch_id):
+            raise RPCError("boom", code, b"")
+
+        return get_batch_progress
+
+    client = TestClient(app)
+    monkeypatch.setattr(jobs, "get_batch_progress", failing_with(RPCStatusCode.NOT_FOUND))
+    assert client.get("/api/v1/jobs:batch/missing", headers=TOKEN).status_code == 404
+
+    monkeypatch.setattr(jobs, "get_batch_progress", failing_with(RPCStatusCode.UNAVAILABLE))
+    assert client.get("/api/v1/jobs:batch/missing", headers=TOKEN).status_code == 503
@@ -0,0 +1,67 @@
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "benchmark_local_activities.py"
+
+
+def _load_benchmark():
+    spec = importlib.util.spec_from_file_location("benchmark_local_activities", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def _start_time_skipping():
+    from temporalio.testing import WorkflowEnvironment
+
+    try:
+        return await WorkflowEnvironment.start_time_skipping()
+    except RuntimeError as exc:  # the test server is downloaded on first use
+        pytest.skip(f"Temporal test server unavailable: {exc}")
+
+
+def test_benchmark_runs_against_time_skipping_server():
+    bench = _load_benchmark()
+    from video_platform.worker.contracts import WorkflowInput
+    from video_platform.worker.workflows import VideoEditWorkflow
+
+    async def scenario():
+        env = await _start_time_skipping()
+        try:
+            rows = await bench.run_benchmark(env.client, jobs=2, concurrency=2, warmup=0)
+            control_queue = "bench-smoke"
+            (control, executor_worker, prefetch_worker), pools = bench.build_workers(env.client, control_queue)
+            async with control, executor_worker, prefetch_worker:
+                result = await env.client.execute_workflow(
+                    VideoEditWorkflow.run,
+                    WorkflowInput(job_id="bench-smoke", speculative_planning=True, plan_variants=2),
+                    id="video-edit-bench-smoke",
+                    task_queue=control_queue,
+                )
+            for pool in pools:
+                pool.shutdown()
+        finally:
+            await env.shutdown()
+        return rows, result
+
+    rows, result = asyncio.run(scenario())
+    assert [row["mode"] for row in rows] == ["regular", "local"]
+    assert all(row["jobs"] == 2 and row["history_events"] > 0 for row in rows)
+    assert result.final_status == "succeeded"
+
+
+def test_benchmark_stubs_are_sync_like_the_real_activities():
+    import inspect
+
+    from video_platform.worker import activities
+
+    bench = _load_benchmark()
+    stubs = [value for name, value in vars(bench).items() if name.startswith("stub_")]
+    assert stubs
+    for stub in stubs:
+        real = getattr(activities, stub.__name__.removeprefix("stub_"))
+        assert not inspect.iscoroutinefunction(stub)
+        assert not inspect.iscoroutinefunction(real)
@@ -0,0 +1,120 @@
+import shutil
+import subprocess
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from video_platform.runners.ffmpeg_utils import FrameSource
+from video_platform.runners.masks import MaskSequence
+from video_platform.services import executor
+from video_platform.services.checkpoint import ChunkCheckpoint
+from video_platform.services.model_registry import ModelRegistry
+from video_platform.services.planner import generate_plan
+
+
+def _commit_chunks(workspace, count, frames=10):
+    checkpoint = ChunkCheckpoint(str(workspace))
+    checkpoint.restore("fp-1")
+    for index in range(count):
+        path = workspace / f"chunk_{index:05d}.mp4"
+        path.write_bytes(b"chunk")
+        checkpoint.commit(index, str(path), frames)
+    return checkpoint
+
+
+def test_checkpoint_resumes_after_finished_chunks(tmp_path):
+    _commit_chunks(tmp_path, 3)
+
+    resumed = ChunkCheckpoint(str(tmp_path))
+    assert resumed.restore("fp-1") == 30
+    assert resumed.done(2) and not resumed.done(3)
+    assert resumed.paths() == [str(tmp_path / f"chunk_{i:05d}.mp4") for i in range(3)]
+    assert resumed.summary()["resumed_frames"] == 30
+
+
+def test_checkpoint_ignores_other_plans_and_stops_at_missing_chunk(tmp_path):
+    _commit_chunks(tmp_path, 3)
+
+    assert ChunkCheckpoint(str(tmp_path)).restore("fp-2") == 0
+
+    (tmp_path / "chunk_00001.mp4").unlink()
+    partial = ChunkCheckpoint(str(tmp_path))
+    assert partial.restore("fp-1") == 10
+    assert [chunk["index"] for chunk in partial.chunks] == [0]
+
+
+class _FakeSAM2:
+    def load(self, model_dir, device="cpu"):
+        pass
+
+    def unload(self):
+        pass
+
+    def predict(self, input_path, source_size=None, **kwargs):
+        width, height = source_size
+        mask = np.zeros((height, width), np.uint8)
+        mask[8:24, 8:24] = 255
+        return MaskSequence.from_masks([mask] * 60)
+
+
+class _FakeProPainter:
+    inferred = 0
+    crash_after = None
+
+    def load(self, model_dir, device="cpu"):
+        pass
+
+    def unload(self):
+        pass
+
+    def iter_predict(self, frames, masks, roi=None, window_size=None, window_overlap=0):
+        for frame in frames:
+            if _FakeProPainter.crash_after is not None and _FakeProPainter.inferred >= _FakeProPainter.crash_after:
+                raise RuntimeError("worker killed")
+            _FakeProPainter.inferred += 1
+            yield np.array(frame)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_windowed_run_resumes_without_reinferring_finished_frames(monkeypatch, tmp_path):
+    clip = tmp_path / "clip.mp4"
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-f", "lavfi", "-i", "testsrc=size=64x48:rate=30:duration=2",
+         "-pix_fmt", "yuv420p", str(clip)],
+        check=True,
+    )
+    info = {"width": 64, "height": 48, "fps": 30.0, "duration": 2.0, "nb_frames": 60, "content_hash": "clip"}
+    monkeypatch.setattr(
+        executor, "settings", replace(executor.settings, checkpoint_chunk_frames=10, temporal_smoothing_strength=0.0)
+    )
+    registry = ModelRegistry(device="cpu")
+    registry.register("sam2", _FakeSAM2, "sam2")
+    registry.register("propainter", _FakeProPainter, "propainter")
+    monkeypatch.setattr(executor, "model_registry", registry)
+    plan = generate_plan(instruction="remove the cup", model_bundle="lite_cpu_bundle", video_metadata=info)
+    plan.constraints.update(
+        source_video=info, inpaint_window_size=20, inpaint_window_overlap=4, segment_parallel=False, roi_inpaint=False
+    )
+    workspace = tmp_path / "work"
+    workspace.mkdir()
+    output = tmp_path / "output.mp4"
+
+    def run():
+        executor._run_remove_object_pipeline(
+            str(clip), str(output), str(workspace), plan, checkpoint=ChunkCheckpoint(str(workspace))
+        )
+
+    monkeypatch.setattr(_FakeProPainter, "inferred", 0)
+    monkeypatch.setattr(_FakeProPainter, "crash_after", 35)
+    with pytest.raises(RuntimeError, match="worker killed"):
+        run()
+    finished = ChunkCheckpoint(str(workspace))
+    assert finished.restore(executor._checkpoint_fingerprint(str(clip), plan, info)) == 30
+
+    monkeypatch.setattr(_FakeProPainter, "inferred", 0)
+    monkeypatch.setattr(_FakeProPainter, "crash_after", None)
+    run()
+    # Only the window overlap before the 30 finished frames is inferred again.
+    assert _FakeProPainter.inferred == 60 - 30 + 4
+    assert len(FrameSource(str(output), width=64, height=48).read_all()) == 60
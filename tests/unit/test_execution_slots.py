@@ -0,0 +1,60 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from video_platform.core.enums import JobStatus
+from video_platform.db import db_session
+from video_platform.services.planner import generate_plan
+from video_platform.services.repository import create_job, set_job_status
+from video_platform.worker import activities
+
+
+def test_executions_wait_for_a_free_slot(monkeypatch):
+    with db_session() as session:
+        job, _ = create_job(
+            session,
+            instruction="remove the cup",
+            input_uri="file://samples/1601_raw.mp4",
+            metadata={},
+            max_iterations=3,
+        )
+        job_id = job.id
+        set_job_status(session, job_id, JobStatus.planning)
+    fake_activity = SimpleNamespace(
+        info=lambda: SimpleNamespace(heartbeat_details=[], attempt=1),
+        heartbeat=lambda *details: None,
+        is_cancelled=lambda: False,
+    )
+    monkeypatch.setattr(activities, "activity", fake_activity)
+    monkeypatch.setattr(activities, "execution_slots", threading.BoundedSemaphore(1))
+
+    lock = threading.Lock()
+    running = []
+    overlaps = []
+
+    def execute_plan(job_id, iteration, input_uri, instruction, plan, progress=None, variant=None):
+        with lock:
+            running.append(variant)
+            overlaps.append(len(running))
+        time.sleep(0.1)
+        with lock:
+            running.remove(variant)
+        return {"output_uri": f"minio://output/{job_id}/iter_{iteration}_v{variant}/edited.mp4", "execution_log": {}}
+
+    monkeypatch.setattr(activities.executor, "execute_plan", execute_plan)
+    plan = generate_plan(instruction="remove the cup", model_bundle="lite_cpu_bundle").model_dump(mode="json")
+    results = []
+    threads = [
+        threading.Thread(target=lambda v=v: results.append(activities.execute_iteration(job_id, 1, plan, v)))
+        for v in (0, 1)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert overlaps == [1, 1]
+    assert sorted(r.output_uri for r in results) == [
+        f"minio://output/{job_id}/iter_1_v0/edited.mp4",
+        f"minio://output/{job_id}/iter_1_v1/edited.mp4",
+    ]
@@ -0,0 +1,68 @@
+import shutil
+import subprocess
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from video_platform.runners.ffmpeg_utils import FrameSink, FrameSource, count_frames
+from video_platform.runners.frame_io import ordered_map, read_rgb, write_rgb
+
+
+def test_ordered_map_keeps_order_and_bounds_in_flight():
+    lock = threading.Lock()
+    started = []
+
+    def work(i):
+        with lock:
+            started.append(i)
+        time.sleep(0.001 * (i % 3))
+        return i * i
+
+    consumed = []
+    for value in ordered_map(work, range(20), max_in_flight=4):
+        consumed.append(value)
+        # Never more than max_in_flight items ahead of the consumer.
+        assert len(started) <= len(consumed) + 4
+    assert consumed == [i * i for i in range(20)]
+
+
+def test_write_and_read_rgb_round_trip(tmp_path):
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+    frame[..., 0] = 200
+    path = str(tmp_path / "000001.png")
+    write_rgb(path, frame)
+    assert np.array_equal(read_rgb(path), frame)
+
+
+def test_frame_sink_command_applies_preset_crf_and_audio_passthrough():
+    sink = FrameSink("out.mp4", width=64, height=48, fps=25.0, audio_source="in.mp4", preset="veryfast", crf=30)
+    cmd = sink._command()
+
+    assert cmd[cmd.index("-preset") + 1] == "veryfast"
+    assert cmd[cmd.index("-crf") + 1] == "30"
+    # Audio comes from the second input and is copied, not re-encoded.
+    assert cmd[cmd.index("-i", cmd.index("-i") + 1) + 1] == "in.mp4"
+    assert cmd[cmd.index("-c:a") + 1] == "copy"
+    assert "1:a:0?" in cmd
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_frame_sink_copies_source_audio(tmp_path):
+    source = tmp_path / "source.mp4"
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-f", "lavfi", "-i", "testsrc=size=64x48:rate=25:duration=2",
+         "-f", "lavfi", "-i", "sine=frequency=440:duration=2", "-c:v", "libx264", "-pix_fmt", "yuv420p",
+         "-c:a", "aac", "-shortest", str(source)],
+        check=True,
+    )
+    output = tmp_path / "edited.mp4"
+    with FrameSource(str(source), width=64, height=48) as frames, FrameSink(
+        str(output), width=64, height=48, fps=25.0, audio_source=str(source), preset="veryfast", crf=30
+    ) as sink:
+        sink.write_batch(frames)
+
+    probe = subprocess.run(["ffmpeg", "-hide_banner", "-i", str(output)], capture_output=True, text=True).stderr
+    assert "Audio: aac" in probe
+    assert sink.frames_written == 50 and count_frames(str(output)) == 50
@@ -0,0 +1,63 @@
+import numpy as np
+
+from video_platform.runners.masks import MaskSequence, rle_decode, rle_encode
+from video_platform.runners.roi import stable_roi
+from video_platform.services import qa
+
+
+def _masks():
+    masks = []
+    for i in range(6):
+        mask = np.zeros((20, 30), dtype=np.uint8)
+        if i != 3:
+            mask[5:10, i:i + 4] = 255
+        masks.append(mask)
+    return masks
+
+
+def test_rle_round_trip_including_set_first_pixel():
+    mask = np.zeros((3, 4), dtype=np.uint8)
+    mask[0, 0] = 255
+    mask[2, 1:] = 255
+    counts = rle_encode(mask)
+    assert counts[0] == 0
+    assert np.array_equal(rle_decode(counts, 3, 4), mask)
+
+
+def test_mask_sequence_decodes_slices_and_boxes(tmp_path):
+    masks = _masks()
+    seq = MaskSequence.from_masks(masks)
+    assert len(seq) == 6
+    assert seq.nbytes < sum(m.nbytes for m in masks)
+    assert np.array_equal(seq[2], masks[2])
+    assert [np.array_equal(a, b) for a, b in zip(seq[1:3], masks[1:3])] == [True, True]
+    assert seq.bbox(0) == (0, 5, 4, 10)
+    assert seq.bbox(3) is None
+    assert seq.union_bbox() == (0, 5, 9, 10)
+    assert stable_roi(seq, 30, 20, min_pad=0, align=1, max_area_ratio=1.0) == stable_roi(
+        masks, 30, 20, min_pad=0, align=1, max_area_ratio=1.0
+    )
+
+    path = str(tmp_path / "masks.npz")
+    seq.save(path)
+    loaded = MaskSequence.load(path)
+    assert len(loaded) == 6
+    assert loaded.bbox(3) is None
+    assert all(np.array_equal(a, b) for a, b in zip(loaded, masks))
+
+
+def test_qa_reports_tracking_dropout_from_masks(tmp_path):
+    path = str(tmp_path / "masks.npz")
+    MaskSequence.from_masks(_masks()).save(path)
+    report = qa.evaluate(
+        qa.QAContext(
+            instruction="remove the person",
+            iteration=3,
+            capability="remove_object",
+            output_uri="minio://output/x.mp4",
+            video_metadata={"fps": 1.0, "duration": 6.0},
+            mask_path=path,
+        )
+    )
+    dropout = [issue for issue in report.issues if issue["code"] == "tracking_dropout"]
+    assert dropout and dropout[0]["timeline"] == "00:00:03.000-00:00:04.000"
@@ -0,0 +1,205 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from video_platform.runners.base import BaseRunner
+from video_platform.runners.masks import MaskSequence
+from video_platform.services import executor
+from video_platform.services import model_registry as registry_module
+from video_platform.services.model_registry import ModelRegistry
+from video_platform.services.planner import generate_plan
+from video_platform.services.toolchain import StepContext, prefetch
+
+
+class FakeRunner(BaseRunner):
+    unloaded: list = []
+
+    def __init__(self, name):
+        self.name = name
+
+    def check_installed(self) -> bool:
+        return True
+
+    def load(self, model_dir: str, device: str = "cuda"):
+        self.model_dir = model_dir
+
+    def predict(self, *args, **kwargs):
+        return self.name
+
+    def unload(self):
+        FakeRunner.unloaded.append(self.name)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # Footprints come from the registration estimates, not process memory.
+    monkeypatch.setattr(registry_module, "_memory_in_use", lambda device: 0)
+    FakeRunner.unloaded = []
+    registry = ModelRegistry(budget_bytes=100, device="cpu")
+    for name in ("a", "b", "c"):
+        registry.register(name, lambda name=name: FakeRunner(name), f"models/{name}", footprint_bytes=40)
+    return registry
+
+
+def test_registry_reuses_resident_runner(registry):
+    with registry.acquire("a") as first:
+        pass
+    with registry.acquire("a") as second:
+        pass
+    assert first is second
+    stats = registry.stats()["models"]["a"]
+    assert (stats["loads"], stats["hits"], stats["refs"]) == (1, 1, 0)
+
+
+def test_registry_evicts_least_recently_used_idle_runner(registry):
+    with registry.acquire("a"):
+        pass
+    with registry.acquire("b"):
+        pass
+    with registry.acquire("a"):
+        pass
+    with registry.acquire("c"):
+        pass
+    assert FakeRunner.unloaded == ["b"]
+    assert registry.resident_bytes() == 80
+
+
+def test_registry_never_evicts_runner_in_use(registry):
+    with registry.acquire("a"), registry.acquire("b"):
+        with registry.acquire("c"):
+            assert FakeRunner.unloaded == []
+            assert registry.resident_bytes() == 120
+    assert registry.evict("a") is True
+    assert FakeRunner.unloaded == ["a"]
+
+
+def test_registry_warmup_loads_and_runs_each_model(registry):
+    warmed = []
+    registry.register("d", lambda: FakeRunner("d"), "models/d", warmup=lambda runner: warmed.append(runner.name))
+    timings = registry.warmup(["d"])
+    assert warmed == ["d"]
+    assert set(timings["d"]) == {"load_seconds", "warmup_seconds"}
+    assert registry.stats()["models"]["d"]["resident"] is True
+
+
+def test_slow_load_does_not_block_other_models_and_is_shared(registry):
+    with registry.acquire("b"):
+        pass
+    release = threading.Event()
+    loading = threading.Event()
+
+    class SlowRunner(FakeRunner):
+        def load(self, model_dir: str, device: str = "cuda"):
+            loading.set()
+            assert release.wait(5)
+
+    registry.register("slow", lambda: SlowRunner("slow"), "models/slow", footprint_bytes=10)
+    runners = []
+
+    def use_slow():
+        with registry.acquire("slow") as runner:
+            runners.append(runner)
+
+    threads = [threading.Thread(target=use_slow) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    assert loading.wait(5)
+
+    # The resident model is served while "slow" is still loading.
+    with registry.acquire("b") as runner:
+        assert runner.name == "b"
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(runners) == 2 and runners[0] is runners[1]
+    stats = registry.stats()["models"]["slow"]
+    assert (stats["loads"], stats["refs"]) == (1, 0)
+
+
+def test_registry_lends_a_runner_to_one_caller_at_a_time(registry):
+    active = []
+    overlaps = []
+
+    def use_a():
+        with registry.acquire("a"):
+            active.append(1)
+            overlaps.append(len(active))
+            time.sleep(0.05)
+            active.pop()
+
+    threads = [threading.Thread(target=use_a) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert overlaps == [1, 1, 1]
+    assert registry.stats()["models"]["a"]["loads"] == 1
+
+
+def test_abandoned_pipelined_stage_hands_its_runner_back(registry):
+    def inpaint():
+        with registry.acquire("a") as runner:
+            for _ in range(100):
+                yield runner.name
+
+    # The stage is consumed on the prefetch thread and abandoned after one frame,
+    # as when the encoder downstream of it fails.
+    with prefetch(inpaint(), maxsize=1) as frames:
+        assert next(frames) == "a"
+
+    # A stage started on one thread and closed on another releases it too.
+    stage = inpaint()
+    started = threading.Thread(target=next, args=(stage,))
+    started.start()
+    started.join(5)
+    stage.close()
+
+    acquired = []
+
+    def use_a():
+        with registry.acquire("a") as runner:
+            acquired.append(runner.name)
+
+    thread = threading.Thread(target=use_a)
+    thread.start()
+    thread.join(5)
+    assert acquired == ["a"]
+    assert registry.stats()["models"]["a"]["refs"] == 0
+
+
+class FakeTracker(FakeRunner):
+    def predict(self, input_path, source_size=None, **kwargs):
+        width, height = source_size
+        return MaskSequence.from_masks([np.full((height, width), 255, np.uint8)] * 2)
+
+
+def test_executor_keeps_runners_resident_across_runs(registry, monkeypatch, tmp_path):
+    warmed = []
+    def warmup(runner):
+        warmed.append(runner.name)
+
+    registry.register("sam2", lambda: FakeTracker("sam2"), "models/sam2", warmup=warmup)
+    registry.register("propainter", lambda: FakeRunner("propainter"), "models/propainter", warmup=warmup)
+    monkeypatch.setattr(executor, "model_registry", registry)
+
+    assert set(executor.warmup_models("balanced_12g_bundle")) == {"sam2", "propainter"}
+    assert warmed == ["sam2", "propainter"]
+
+    plan = generate_plan(instruction="remove the cup", model_bundle="balanced_12g_bundle")
+    video_info = {"width": 16, "height": 12, "nb_frames": 2, "content_hash": "clip"}
+    for _ in range(2):
+        ctx = StepContext(
+            input_path=str(tmp_path / "clip.mp4"),
+            output_path=str(tmp_path / "out.mp4"),
+            workspace=str(tmp_path),
+            plan=plan,
+            video_info=video_info,
+        )
+        executor._sam2_segment_step(ctx, {"prompt": {"points": [(8, 6)], "labels": [1]}})
+
+    stats = registry.stats()["models"]["sam2"]
+    assert (stats["resident"], stats["loads"], stats["hits"], stats["refs"]) == (True, 1, 2, 0)
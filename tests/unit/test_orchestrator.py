@@ -0,0 +1,101 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from video_platform.core.enums import JobStatus
+from video_platform.db import db_session
+from video_platform.services import orchestrator
+from video_platform.services.repository import create_job, get_job, log_job_event
+
+
+def test_fallback_renders_variants_without_holding_a_session(monkeypatch):
+    monkeypatch.setattr(orchestrator, "settings", replace(orchestrator.settings, plan_variants=2, max_iterations=1))
+    with db_session() as session:
+        job, _ = create_job(
+            session,
+            instruction="remove the cup",
+            input_uri="file://samples/1601_raw.mp4",
+            metadata={},
+            max_iterations=1,
+        )
+        job_id = job.id
+
+    seen = []
+
+    def execute_plan(job_id, iteration, input_uri, instruction, plan, variant=None):
+        # Runs while the other variant renders: the job row must be committed and writable.
+        with db_session() as session:
+            seen.append((variant, get_job(session, job_id).status))
+            log_job_event(session=session, job_id=job_id, stage="variant_render", message=f"variant {variant}")
+        output_uri = f"minio://output/{job_id}/iter_{iteration}_v{variant}/edited.mp4"
+        return {"output_uri": output_uri, "execution_log": {}}
+
+    monkeypatch.setattr(orchestrator.executor, "execute_plan", execute_plan)
+
+    result = asyncio.run(orchestrator.run_fallback(job_id))
+
+    assert sorted(seen) == [(0, JobStatus.editing.value), (1, JobStatus.editing.value)]
+    assert result["iterations"] == 1
+
+
+def _queued_jobs(count: int) -> list[str]:
+    job_ids = []
+    with db_session() as session:
+        for _ in range(count):
+            job, _ = create_job(
+                session,
+                instruction="remove the cup",
+                input_uri="file://samples/1601_raw.mp4",
+                metadata={},
+                max_iterations=1,
+            )
+            job_ids.append(job.id)
+    return job_ids
+
+
+def test_batch_without_temporal_or_fallback_fails_every_job(monkeypatch):
+    async def get_shared_client():
+        return None
+
+    monkeypatch.setattr(orchestrator, "get_shared_client", get_shared_client)
+    monkeypatch.setattr(orchestrator, "settings", replace(orchestrator.settings, enable_fallback_orchestrator=False))
+    job_ids = _queued_jobs(3)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(orchestrator.start_batch_orchestration("batch-unstartable", job_ids, parallelism=2))
+
+    with db_session() as session:
+        assert [get_job(session, job_id).status for job_id in job_ids] == [JobStatus.failed.value] * 3
+
+
+def test_batch_fallback_respects_parallelism_and_connects_once(monkeypatch):
+    connects = []
+
+    async def get_shared_client():
+        connects.append(1)
+        return None
+
+    running = []
+    peak = []
+
+    async def run_fallback(job_id):
+        running.append(job_id)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(job_id)
+
+    monkeypatch.setattr(orchestrator, "get_shared_client", get_shared_client)
+    monkeypatch.setattr(orchestrator, "run_fallback", run_fallback)
+    monkeypatch.setattr(orchestrator, "settings", replace(orchestrator.settings, enable_fallback_orchestrator=True))
+    job_ids = _queued_jobs(5)
+
+    async def main():
+        await orchestrator.start_batch_orchestration("batch-fallback", job_ids, parallelism=2)
+        while len(peak) < len(job_ids) or running:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(asyncio.wait_for(main(), 5))
+
+    assert max(peak) == 2
+    assert connects == [1]
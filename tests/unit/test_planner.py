@@ -1,5 +1,5 @@
 ﻿from video_platform.core.enums import Capability
-from video_platform.services.planner import detect_capability, generate_plan
+from video_platform.services.planner import detect_capability, generate_plan, generate_plan_variants
 
 
 def test_detect_capability_remove_object():
@@ -17,3 +17,50 @@ def test_generate_plan_has_expected_fields():
     assert plan.model_bundle == "balanced_12g_bundle"
     assert len(plan.tool_chain) >= 3
     assert len(plan.fix_map) == 1
+
+
+def test_generate_plan_tracking_short_side_follows_bundle_tier():
+    high = generate_plan(instruction="Remove the person", model_bundle="quality_24g_bundle")
+    lite = generate_plan(instruction="Remove the person", model_bundle="lite_cpu_bundle")
+    assert high.constraints["tracking_short_side"] == 0
+    assert lite.constraints["tracking_short_side"] == 480
+
+
+def test_generate_plan_variants_override_constraints_of_the_baseline():
+    plan = generate_plan(instruction="Remove the person", model_bundle="lite_cpu_bundle")
+    variants = generate_plan_variants(plan, 3)
+    assert len(variants) == 3
+    assert variants[0] is plan
+    assert variants[1].constraints["variant_strategy"] == "full_resolution_tracking"
+    assert variants[1].constraints["tracking_short_side"] == 0
+    assert plan.constraints["tracking_short_side"] == 480
+    assert generate_plan_variants(plan, 1) == [plan]
+
+
+def test_generate_plan_scopes_reedit_to_flagged_ranges():
+    video = {"width": 1280, "height": 720, "fps": 30.0, "duration": 20.0, "nb_frames": 600}
+    issues = [
+        {"code": "temporal_flicker", "timeline": "00:00:02-00:00:04"},
+        {"code": "tracking_dropout", "timeline": "00:00:05-00:00:06"},
+    ]
+    plan = generate_plan(
+        instruction="Remove the person",
+        model_bundle="lite_cpu_bundle",
+        prior_issues=issues,
+        video_metadata=video,
+        base_output_uri="minio://output/job/iter_1/edited.mp4",
+    )
+    reedit = plan.constraints["reedit"]
+    assert reedit["base_output_uri"] == "minio://output/job/iter_1/edited.mp4"
+    # One second of padding on each side makes the two ranges' context overlap.
+    assert reedit["ranges"] == [[2.0, 6.0]]
+
+    whole_clip = [{"code": "temporal_flicker", "timeline": "00:00:00-00:00:20"}]
+    plan = generate_plan(
+        instruction="Remove the person",
+        model_bundle="lite_cpu_bundle",
+        prior_issues=whole_clip,
+        video_metadata=video,
+        base_output_uri="minio://output/job/iter_1/edited.mp4",
+    )
+    assert "reedit" not in plan.constraints
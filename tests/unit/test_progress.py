@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from video_platform.runners.cancellation import Cancelled, cancel_scope
+from video_platform.runners.ffmpeg_utils import _popen
+from video_platform.services.planner import generate_plan
+from video_platform.services.progress import ProgressReporter
+from video_platform.services.toolchain import StepContext, StepRegistry, run_toolchain
+
+
+def test_progress_tracks_frames_and_eta():
+    progress = ProgressReporter()
+    consumed = list(progress.track("decode", range(5), total=10))
+
+    snap = progress.snapshot()
+    assert consumed == [0, 1, 2, 3, 4]
+    assert snap["step"] == "decode"
+    assert snap["frames_done"] == 5 and snap["frames_total"] == 10
+    assert snap["eta_seconds"] >= 0
+    assert snap["steps"]["decode"] == {"frames": 5, "total": 10}
+
+
+def test_progress_monitor_heartbeats_and_cancels():
+    beats = []
+    cancel_requested = threading.Event()
+    progress = ProgressReporter(
+        heartbeat=beats.append, is_cancelled=cancel_requested.is_set, heartbeat_seconds=0.01
+    )
+    with progress, cancel_scope(progress.token):
+        proc = _popen(["sleep", "30"])
+        progress.advance("encode")
+        time.sleep(0.05)
+        assert beats and beats[-1]["steps"]["encode"]["frames"] == 1
+
+        cancel_requested.set()
+        assert proc.wait(timeout=5) != 0
+        with pytest.raises(Cancelled):
+            progress.advance("encode")
+
+
+def test_progress_stops_heartbeating_when_stalled():
+    beats = []
+    with ProgressReporter(heartbeat=beats.append, heartbeat_seconds=0.01, stall_seconds=0.02):
+        time.sleep(0.1)
+        count = len(beats)
+        time.sleep(0.05)
+        assert len(beats) == count
+
+
+def test_progress_keeps_heartbeating_through_an_opaque_step():
+    beats = []
+    release = threading.Event()
+
+    def whole_clip():
+        # Infers everything before the first frame comes out.
+        assert release.wait(5)
+        yield from range(3)
+
+    with ProgressReporter(heartbeat=beats.append, heartbeat_seconds=0.01, stall_seconds=0.02) as progress:
+        frames = progress.track("propainter_inpaint", whole_clip(), 3, opaque=True)
+        consumer = threading.Thread(target=list, args=(frames,))
+        consumer.start()
+        time.sleep(0.1)
+        count = len(beats)
+        time.sleep(0.05)
+        assert len(beats) > count
+
+        release.set()
+        consumer.join(5)
+        time.sleep(0.1)
+        count = len(beats)
+        time.sleep(0.05)
+        assert len(beats) == count
+
+
+def test_cancellation_stops_toolchain_steps():
+    registry = StepRegistry()
+    plan = generate_plan(instruction="remove the cup", model_bundle="lite_cpu_bundle")
+    ctx = StepContext(input_path="in.mp4", output_path="out.mp4", workspace=".", plan=plan)
+
+    @registry.register("decode", outputs=("frames",), implicit=True)
+    def decode(ctx, inputs):
+        ctx.progress.token.cancel()
+        return {"frames": ctx.progress.track("decode", iter([1, 2, 3]))}
+
+    @registry.register("encode", inputs=("frames",), outputs=("video",), implicit=True)
+    def encode(ctx, inputs):
+        return {"video": list(inputs["frames"])}
+
+    with pytest.raises(Cancelled):
+        run_toolchain(["encode"], ctx, registry=registry)
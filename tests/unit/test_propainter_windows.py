@@ -0,0 +1,51 @@
+import numpy as np
+
+from video_platform.runners.propainter_runner import ProPainterRunner, plan_windows
+
+
+class _IdentityInpainter:
+    def __init__(self):
+        self.window_lengths = []
+
+    def forward(self, video, mask, b_size=10):
+        self.window_lengths.append(video.shape[0])
+        return video
+
+
+def test_plan_windows_covers_clip_with_overlap():
+    assert plan_windows(10, 20) == [(0, 10)]
+    assert plan_windows(100, 40, 10) == [(0, 40), (30, 70), (60, 100)]
+    windows = plan_windows(95, 40, 10)
+    assert windows[-1] == (55, 95)
+    assert all(b[0] < a[1] for a, b in zip(windows, windows[1:]))
+
+
+def test_windowed_predict_streams_every_frame_once():
+    runner = ProPainterRunner()
+    runner.model = _IdentityInpainter()
+    frames = [np.full((4, 4, 3), i, dtype=np.uint8) for i in range(25)]
+    masks = [np.zeros((4, 4), dtype=np.uint8) for _ in frames]
+
+    out = runner.predict(iter(frames), masks, window_size=10, window_overlap=3)
+
+    assert len(out) == 25
+    assert [int(f[0, 0, 0]) for f in out] == list(range(25))
+    assert max(runner.model.window_lengths) == 10
+
+
+class _BlackInpainter:
+    def forward(self, video, mask, b_size=10):
+        return video * 0
+
+
+def test_roi_predict_only_changes_the_crop():
+    runner = ProPainterRunner()
+    runner.model = _BlackInpainter()
+    frames = [np.full((16, 16, 3), 200, dtype=np.uint8) for _ in range(4)]
+    masks = [np.zeros((16, 16), dtype=np.uint8) for _ in frames]
+
+    out = runner.predict(frames, masks, roi=(4, 2, 12, 10))
+
+    assert out[0].shape == (16, 16, 3)
+    assert int(out[0][2:10, 4:12].max()) == 0
+    assert int(out[0][0, 0, 0]) == 200 and int(out[0][12, 14, 0]) == 200
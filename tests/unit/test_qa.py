@@ -1,4 +1,16 @@
-from video_platform.services.qa import QAContext, evaluate, should_pass, should_route_manual_review
+import numpy as np
+
+from video_platform.runners.masks import MaskSequence
+from video_platform.services.executor import _reedit_frames
+from video_platform.services.planner import build_reedit_ranges
+from video_platform.services.qa import (
+    QAContext,
+    compare_variants,
+    evaluate,
+    mask_signals,
+    should_pass,
+    should_route_manual_review,
+)
 
 
 def test_qa_threshold_logic():
@@ -15,3 +27,63 @@ def test_qa_routes_high_risk_tasks_to_manual_review():
     route, reasons = should_route_manual_review("job-a", report, risk_level="high")
     assert route
     assert "high_risk_task_requires_manual_review" in reasons
+
+
+def test_compare_variants_prefers_passing_then_score():
+    r1 = evaluate(QAContext(instruction="remove object", iteration=1, capability="remove_object", output_uri="a"))
+    r3 = evaluate(QAContext(instruction="remove object", iteration=3, capability="remove_object", output_uri="b"))
+
+    best, summary = compare_variants([r1, r3, r3], ["baseline", "strong_smoothing", "full_frame_inpaint"], ["a", "b", "c"])
+    assert best == 1
+    assert [row["selected"] for row in summary] == [False, True, False]
+    assert summary[1]["passed"] and summary[1]["output_uri"] == "b"
+
+
+def test_sub_second_dropout_reaches_reedit_as_its_frames(tmp_path):
+    mask = np.zeros((32, 32), np.uint8)
+    mask[4:12, 4:12] = 255
+    empty = np.zeros_like(mask)
+    # Frames 11-13 of a 30 fps clip lose the object: a tenth of a second.
+    masks = MaskSequence.from_masks([empty if 11 <= i < 14 else mask for i in range(60)])
+    mask_path = tmp_path / "masks.npz"
+    masks.save(str(mask_path))
+
+    report = evaluate(
+        QAContext(
+            instruction="remove object",
+            iteration=1,
+            capability="remove_object",
+            output_uri="x",
+            video_metadata={"fps": 30.0, "duration": 2.0},
+            mask_path=str(mask_path),
+        )
+    )
+    dropout = next(issue for issue in report.issues if issue["code"] == "tracking_dropout")
+    assert dropout["timeline"] == "00:00:00.367-00:00:00.467"
+
+    ranges = build_reedit_ranges([dropout], padding_seconds=0.0)
+    assert [_reedit_frames(start, end, 30.0, 60) for start, end in ranges] == [(11, 14)]
+
+
+def test_qa_uses_mask_signals_from_the_executor(tmp_path, caplog):
+    mask = np.zeros((32, 32), np.uint8)
+    mask[4:12, 4:12] = 255
+    masks = MaskSequence.from_masks([np.zeros_like(mask) if i == 2 else mask for i in range(6)])
+    # The control worker cannot read the executor's workspace.
+    elsewhere = str(tmp_path / "executor" / "masks.npz")
+
+    def report(**kwargs):
+        context = QAContext(
+            instruction="remove object",
+            iteration=1,
+            capability="remove_object",
+            output_uri="x",
+            video_metadata={"fps": 1.0, "duration": 6.0},
+            mask_path=elsewhere,
+            **kwargs,
+        )
+        return [issue["code"] for issue in evaluate(context).issues]
+
+    assert "tracking_dropout" in report(mask_signals=mask_signals(masks))
+    assert "tracking_dropout" not in report()
+    assert "not readable" in caplog.text
@@ -0,0 +1,25 @@
+import numpy as np
+
+from video_platform.runners.roi import stable_roi
+
+
+def _mask_with_box(x0, y0, x1, y1, width=320, height=240):
+    mask = np.zeros((height, width), dtype=np.uint8)
+    mask[y0:y1, x0:x1] = 255
+    return mask
+
+
+def test_stable_roi_is_padded_aligned_union_of_masks():
+    masks = [_mask_with_box(100, 80, 140, 120), _mask_with_box(120, 90, 160, 130), np.zeros((240, 320), np.uint8)]
+
+    x0, y0, x1, y1 = stable_roi(masks, 320, 240, pad_ratio=0.25, min_pad=16, align=8)
+
+    assert x0 <= 100 - 16 and y0 <= 80 - 16
+    assert x1 >= 160 + 16 and y1 >= 130 + 16
+    assert (x1 - x0) % 8 == 0 and (y1 - y0) % 8 == 0
+    assert 0 <= x0 and 0 <= y0 and x1 <= 320 and y1 <= 240
+
+
+def test_stable_roi_skips_empty_and_large_masks():
+    assert stable_roi([np.zeros((240, 320), np.uint8)], 320, 240) is None
+    assert stable_roi([_mask_with_box(10, 10, 310, 230)], 320, 240) is None
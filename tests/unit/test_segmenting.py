@@ -0,0 +1,118 @@
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import replace
+
+import pytest
+
+from video_platform.runners.cancellation import Cancelled, CancelToken, cancel_scope
+from video_platform.runners.ffmpeg_utils import FrameSink, FrameSource
+from video_platform.services import executor, segmenting
+from video_platform.services.model_registry import ModelRegistry
+from video_platform.services.segmenting import check_segment_cancelled, plan_segments, run_segmented
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+def test_plan_segments_cuts_on_keyframes_near_target_length():
+    keyframes = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0, 14.0]
+    segments = plan_segments(keyframes, duration=15.0, fps=30.0, target_seconds=5.0)
+
+    assert [(s.start, s.end) for s in segments] == [(0.0, 6.0), (6.0, 12.0), (12.0, 15.0)]
+    assert all(s.start in keyframes for s in segments)
+    assert sum(s.own_frames for s in segments) == 450
+
+
+def test_plan_segments_adds_keyframe_aligned_overlap():
+    keyframes = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+    segments = plan_segments(keyframes, duration=12.0, fps=25.0, target_seconds=4.0, overlap_seconds=1.0)
+
+    assert segments[0].clip_start == 0.0 and segments[0].lead_frames == 0
+    assert segments[1].start == 4.0
+    assert segments[1].clip_start == 2.0
+    assert segments[1].lead_frames == 50
+
+
+def _gray_ramp_clip(path):
+    # Frame i is a flat gray of level 2 * i; a keyframe every second.
+    frames = b"".join(bytes([2 * i]) * (64 * 48 * 3) for i in range(120))
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", "64x48", "-r", "30",
+         "-i", "-", "-c:v", "libx264", "-g", "30", "-sc_threshold", "0", "-pix_fmt", "yuv420p", str(path)],
+        input=frames,
+        check=True,
+    )
+    return {"width": 64, "height": 48, "fps": 30.0, "duration": 4.0, "nb_frames": 120}
+
+
+def _reencode_own_frames(task):
+    with FrameSource(task["clip_path"], width=task["width"], height=task["height"]) as source:
+        frames = source.read_all()
+    lead = task["lead_frames"]
+    with FrameSink(task["output_path"], width=task["width"], height=task["height"], fps=task["fps"]) as sink:
+        sink.write_batch(frames[lead:lead + task["own_frames"]])
+    return task["output_path"]
+
+
+def _run_until_cancelled(task):
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        check_segment_cancelled()
+        time.sleep(0.05)
+    return task["output_path"]
+
+
+@needs_ffmpeg
+def test_run_segmented_stitches_segments_back_in_order(monkeypatch, tmp_path):
+    clip = tmp_path / "clip.mp4"
+    info = _gray_ramp_clip(clip)
+    monkeypatch.setattr(segmenting, "list_keyframes", lambda path: [0.0, 1.0, 2.0, 3.0])
+    output = tmp_path / "stitched.mp4"
+
+    count = run_segmented(
+        str(clip), str(output), str(tmp_path), info, _reencode_own_frames,
+        target_seconds=1.0, overlap_seconds=1.0, workers=2,
+    )
+
+    frames = FrameSource(str(output), width=64, height=48).read_all()
+    assert count == 4 and len(frames) == 120
+    levels = [float(frame.mean()) for frame in frames]
+    assert all(abs(level - 2 * i) < 3 for i, level in enumerate(levels))
+
+
+@needs_ffmpeg
+def test_cancelling_the_parent_stops_running_segment_processes(monkeypatch, tmp_path):
+    clip = tmp_path / "clip.mp4"
+    info = _gray_ramp_clip(clip)
+    monkeypatch.setattr(segmenting, "list_keyframes", lambda path: [0.0, 2.0])
+    token = CancelToken()
+    threading.Timer(1.0, token.cancel).start()
+
+    started = time.monotonic()
+    with pytest.raises(Cancelled), cancel_scope(token):
+        run_segmented(
+            str(clip), str(tmp_path / "out.mp4"), str(tmp_path), info, _run_until_cancelled,
+            target_seconds=2.0, overlap_seconds=0.0, workers=2,
+        )
+    # The pool is shut down only after both segment processes stopped.
+    assert time.monotonic() - started < 30
+
+
+def test_segment_workers_are_capped_by_model_budget(monkeypatch):
+    monkeypatch.setattr(
+        executor, "settings", replace(executor.settings, segment_workers=8, segment_model_footprint_mb=0)
+    )
+    registry = ModelRegistry(budget_bytes=2000, device="cpu")
+    monkeypatch.setattr(executor, "model_registry", registry)
+    # Footprint not measured yet: one process at a time.
+    registry.register("sam2", object, "sam2")
+    registry.register("propainter", object, "propainter")
+    assert executor._segment_workers() == 1
+
+    registry.register("sam2", object, "sam2", footprint_bytes=400)
+    registry.register("propainter", object, "propainter", footprint_bytes=200)
+    assert executor._segment_workers() == 3
+
+    registry.budget_bytes = 0
+    assert executor._segment_workers() == 8
@@ -0,0 +1,78 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from video_platform.runners.ffmpeg_utils import FrameSink, FrameSource, count_frames, cut_clip, get_video_info
+from video_platform.services.smart_render import _frame_ranges, plan_render_spans, smart_render
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+needs_ffprobe = pytest.mark.skipif(shutil.which("ffprobe") is None, reason="ffprobe not installed")
+
+ENCODER = {"preset": "veryfast", "crf": 18, "keyframe_seconds": 1.0}
+
+
+def _encode_clip(path, count=120, fps=30.0):
+    # x264 with its default B-frames, keyframes every second.
+    with FrameSink(str(path), width=64, height=48, fps=fps, **ENCODER) as sink:
+        for i in range(count):
+            frame = np.zeros((48, 64, 3), np.uint8)
+            frame[:, : (i % 64) + 1] = (i * 2) % 256
+            sink.write(frame)
+
+
+def test_plan_render_spans_reencodes_only_gops_with_changes():
+    keyframes = [0.0, 2.0, 4.0, 6.0, 8.0]
+    spans = plan_render_spans(keyframes, duration=10.0, fps=30.0, changed=[(70, 80), (130, 190)])
+
+    assert [(s.start, s.end, s.reencode) for s in spans] == [
+        (0.0, 2.0, False),
+        (2.0, 8.0, True),
+        (8.0, 10.0, False),
+    ]
+    assert [s.frames for s in spans] == [60, 180, 60]
+    assert spans[1].first_frame == 60
+
+
+def test_plan_render_spans_without_changes_copies_everything():
+    spans = plan_render_spans([0.0, 2.0], duration=4.0, fps=25.0, changed=[])
+    assert len(spans) == 1 and not spans[0].reencode and spans[0].frames == 100
+
+
+def test_frame_ranges_groups_consecutive_indices():
+    assert _frame_ranges([5, 3, 4, 10]) == [(3, 6), (10, 11)]
+
+
+def test_plan_render_spans_reencodes_frames_before_first_keyframe():
+    spans = plan_render_spans([1.0, 2.0], duration=3.0, fps=30.0, changed=[])
+    assert [(s.start, s.end, s.reencode) for s in spans] == [(0.0, 1.0, True), (1.0, 3.0, False)]
+
+
+@needs_ffmpeg
+def test_cut_clip_by_frame_count_keeps_exactly_one_gop(tmp_path):
+    clip = tmp_path / "clip.mp4"
+    _encode_clip(clip)
+    gop = tmp_path / "gop.mp4"
+    cut_clip(str(clip), str(gop), 1.0, frames=30)
+    assert count_frames(str(gop)) == 30
+
+
+@needs_ffmpeg
+@needs_ffprobe
+def test_smart_render_preserves_frame_count_and_duration(tmp_path):
+    base = tmp_path / "base.mp4"
+    _encode_clip(base)
+    info = get_video_info(str(base))
+    white = np.full((48, 64, 3), 255, np.uint8)
+    output = tmp_path / "spliced.mp4"
+
+    stats = smart_render(
+        str(base), str(output), str(tmp_path), info, {i: white for i in range(40, 50)}, encoder=ENCODER
+    )
+
+    spliced = get_video_info(str(output))
+    assert stats["encoded_frames"] + stats["copied_frames"] == 120 and stats["copied_frames"] > 0
+    assert count_frames(str(output)) == 120
+    assert spliced["duration"] == pytest.approx(info["duration"], abs=1 / 30)
+    frames = FrameSource(str(output), width=64, height=48).read_all()
+    assert [i for i, f in enumerate(frames) if f.min() > 240] == list(range(40, 50))
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from video_platform.config import settings
+from video_platform.core.enums import JobStatus
+from video_platform.db import db_session
+from video_platform.services.repository import create_job, get_job, job_video_metadata
+from video_platform.worker import activities, run_worker
+from video_platform.worker.activities import _adopt_speculative_plan, plan_iteration, prefetch_input
+
+
+def _queued_job(input_uri: str = "file://samples/1601_raw.mp4") -> str:
+    with db_session() as session:
+        job, _ = create_job(
+            session,
+            instruction="remove the cup",
+            input_uri=input_uri,
+            metadata={},
+            max_iterations=3,
+        )
+        return job.id
+
+
+def test_speculative_plan_leaves_job_untouched_until_adopted():
+    job_id = _queued_job()
+    plan = plan_iteration(job_id, 1, [], True).edit_plan
+    assert plan["speculative"] is True
+
+    with db_session() as session:
+        job = get_job(session, job_id)
+        assert job.status == JobStatus.queued.value
+        assert job.capability is None
+
+        _adopt_speculative_plan(session, job_id, plan)
+        assert job.status == JobStatus.planning.value
+        assert job.capability == plan["capability"]
+
+        # A retried execution finds the plan already adopted.
+        _adopt_speculative_plan(session, job_id, plan)
+        assert job.status == JobStatus.planning.value
+
+
+def test_prefetch_input_records_video_metadata(monkeypatch, tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"clip")
+    probed = {"width": 640, "height": 360, "fps": 25.0, "duration": 2.0, "nb_frames": 50, "content_hash": "abc"}
+    monkeypatch.setattr(activities, "probe_video", lambda path: probed)
+    job_id = _queued_job(clip.as_uri())
+
+    prefetch_input(job_id)
+
+    with db_session() as session:
+        metadata = job_video_metadata(get_job(session, job_id))
+    assert metadata["width"] == 640 and metadata["height"] == 360
+
+
+def test_prefetch_does_not_share_the_execution_slots():
+    assert prefetch_input not in run_worker.EXECUTOR_ACTIVITIES
+    assert run_worker.PREFETCH_ACTIVITIES == [prefetch_input]
+    assert settings.temporal_prefetch_task_queue != settings.temporal_executor_task_queue
+
+
+def test_speculative_workflow_prefetches_on_its_own_queue_before_executing():
+    from temporalio import activity
+    from temporalio.testing import WorkflowEnvironment
+    from temporalio.worker import Worker
+
+    from video_platform.worker.contracts import (
+        ActivityExecutionResult,
+        ActivityPlanResult,
+        ActivityQAResult,
+        ActivitySafetyResult,
+        WorkflowInput,
+    )
+    from video_platform.worker.workflows import VideoEditWorkflow
+
+    started: list[tuple[str, str]] = []
+
+    def record() -> None:
+        info = activity.info()
+        started.append((info.activity_type, info.task_queue))
+
+    @activity.defn(name="safety_precheck")
+    async def safety(job_id: str) -> ActivitySafetyResult:
+        record()
+        return ActivitySafetyResult(allowed=True)
+
+    @activity.defn(name="plan_iteration")
+    async def plan(job_id, iteration, prior_issues, speculative=False, variants=1) -> ActivityPlanResult:
+        record()
+        return ActivityPlanResult(edit_plan={})
+
+    @activity.defn(name="prefetch_input")
+    async def prefetch(job_id: str) -> None:
+        record()
+
+    @activity.defn(name="execute_iteration")
+    async def execute(job_id, iteration, edit_plan, variant=None) -> ActivityExecutionResult:
+        record()
+        return ActivityExecutionResult(output_uri="minio://output/x/iter_1/edited.mp4", execution_log={})
+
+    @activity.defn(name="qa_iteration")
+    async def qa(job_id, iteration, output_uri) -> ActivityQAResult:
+        record()
+        return ActivityQAResult(report={}, passed=True)
+
+    @activity.defn(name="finalize_success")
+    async def finalize(job_id, iteration, report, output_uri) -> None:
+        record()
+
+    async def scenario():
+        try:
+            env = await WorkflowEnvironment.start_time_skipping()
+        except RuntimeError as exc:  # the test server is downloaded on first use
+            pytest.skip(f"Temporal test server unavailable: {exc}")
+        workers = [
+            Worker(
+                env.client,
+                task_queue="spec-control",
+                workflows=[VideoEditWorkflow],
+                activities=[safety, plan, qa, finalize],
+            ),
+            Worker(env.client, task_queue=settings.temporal_executor_task_queue, activities=[execute]),
+            Worker(env.client, task_queue=settings.temporal_prefetch_task_queue, activities=[prefetch]),
+        ]
+        try:
+            async with workers[0], workers[1], workers[2]:
+                return await env.client.execute_workflow(
+                    VideoEditWorkflow.run,
+                    WorkflowInput(job_id="spec-job", speculative_planning=True),
+                    id="video-edit-spec-job",
+                    task_queue="spec-control",
+                )
+        finally:
+            await env.shutdown()
+
+    result = asyncio.run(scenario())
+    assert result.final_status == JobStatus.succeeded.value
+    names = [name for name, _ in started]
+    assert ("prefetch_input", settings.temporal_prefetch_task_queue) in started
+    assert names.index("prefetch_input") < names.index("execute_iteration")
+    assert names.index("plan_iteration") < names.index("execute_iteration")
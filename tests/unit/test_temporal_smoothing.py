@@ -0,0 +1,58 @@
+from dataclasses import replace
+
+import numpy as np
+
+from video_platform.runners.masks import MaskSequence
+from video_platform.services import executor
+from video_platform.services.planner import generate_plan
+
+
+def _clip(region_values, moving=False):
+    frames, masks = [], []
+    for i, value in enumerate(region_values):
+        frame = np.full((32, 48, 3), 40, np.uint8)
+        frame[8:24, 8:40] = value
+        if moving:
+            frame[8:24, 8 + 4 * i : 16 + 4 * i] = 250
+        mask = np.zeros((32, 48), np.uint8)
+        mask[8:24, 8:40] = 255
+        frames.append(frame)
+        masks.append(mask)
+    return frames, MaskSequence.from_masks(masks)
+
+
+def test_smoothing_stabilizes_static_region():
+    # Inpainted background flickering by a few levels from frame to frame.
+    frames, masks = _clip([100, 108, 100, 108, 100, 108])
+    smoothed = [f.copy() for f in executor._smooth_masked_region([f.copy() for f in frames], masks, 0.5)]
+
+    before = max(abs(int(a[12, 30, 0]) - int(b[12, 30, 0])) for a, b in zip(frames, frames[1:]))
+    after = max(abs(int(a[12, 30, 0]) - int(b[12, 30, 0])) for a, b in zip(smoothed[1:], smoothed[2:]))
+    assert before == 8 and after < before
+
+
+def test_smoothing_does_not_smear_moving_region():
+    frames, masks = _clip([100] * 6, moving=True)
+    smoothed = [f.copy() for f in executor._smooth_masked_region([f.copy() for f in frames], masks, 0.5)]
+
+    for original, result in zip(frames, smoothed):
+        bright = original[..., 0] == 250
+        # The moving square keeps its pixels and leaves no ghost where it was.
+        assert np.array_equal(result[bright], original[bright])
+        assert np.array_equal(result[~bright], original[~bright])
+
+
+def test_smoothing_is_opt_in_or_driven_by_flicker_fix(monkeypatch):
+    monkeypatch.setattr(executor, "settings", replace(executor.settings, temporal_smoothing_strength=0.0))
+    plan = generate_plan(instruction="remove the cup", model_bundle="lite_cpu_bundle")
+    assert executor._smoothing_strength(plan) == 0.0
+
+    flicker = generate_plan(
+        instruction="remove the cup",
+        model_bundle="lite_cpu_bundle",
+        prior_issues=[{"code": "temporal_flicker", "description": "flicker"}],
+    )
+    assert executor._smoothing_strength(flicker) == executor.settings.temporal_smoothing_fix_strength
+
+    flicker.constraints["temporal_smoothing_strength"] = 0.45
+    assert executor._smoothing_strength(flicker) == 0.45
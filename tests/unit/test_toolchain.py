@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from video_platform.core.enums import Capability
+from video_platform.services import executor
+from video_platform.services.capabilities import CAPABILITY_TOOLCHAIN
+from video_platform.services.planner import generate_plan
+from video_platform.services.toolchain import STEP_REGISTRY, StepContext, StepRegistry, StepSkipped, prefetch, run_toolchain
+
+
+def _ctx():
+    plan = generate_plan(instruction="remove the cup", model_bundle="lite_cpu_bundle")
+    return StepContext(input_path="in.mp4", output_path="out.mp4", workspace=".", plan=plan)
+
+
+def test_remove_object_chain_resolves_implicit_steps():
+    assert executor.STEP_REGISTRY is STEP_REGISTRY
+    nodes = STEP_REGISTRY.plan(CAPABILITY_TOOLCHAIN[Capability.remove_object], goal="video")
+    names = [node.name for node in nodes]
+    assert names.index("center_point_prompt") < names.index("sam2_segment")
+    assert names.index("ffmpeg_decode") < names.index("propainter_inpaint")
+    assert names[-1] == "ffmpeg_encode"
+    encode = nodes[-1]
+    assert nodes[encode.deps["edited_frames"]].name == "temporal_smoothing"
+    assert next(node for node in nodes if node.name == "xmem_track").skip_reason == "no runner registered"
+
+
+def test_run_toolchain_overlaps_independent_steps_and_streams_frames():
+    registry = StepRegistry()
+    barrier = threading.Barrier(2, timeout=5)
+
+    @registry.register("decode", outputs=("frames",), implicit=True)
+    def decode(ctx, inputs):
+        barrier.wait()
+        return {"frames": [1, 2, 3]}
+
+    @registry.register("track", outputs=("masks",))
+    def track(ctx, inputs):
+        barrier.wait()
+        return {"masks": [10, 20, 30]}
+
+    @registry.register("inpaint", inputs=("frames", "masks"), outputs=("edited",))
+    def inpaint(ctx, inputs):
+        return {"edited": (f + m for f, m in zip(inputs["frames"], inputs["masks"]))}
+
+    @registry.register("check", outputs=("report",))
+    def check(ctx, inputs):
+        raise StepSkipped("nothing to check")
+
+    @registry.register("encode", inputs=("edited",), outputs=("video",), implicit=True)
+    def encode(ctx, inputs):
+        return {"video": list(inputs["edited"])}
+
+    artifacts, steps = run_toolchain(["track", "inpaint", "check", "missing"], _ctx(), goal="video", registry=registry)
+
+    assert artifacts["video"] == [11, 22, 33]
+    by_name = {step["step"]: step for step in steps}
+    assert by_name["decode"]["implicit"] is True
+    assert by_name["check"] == {"step": "check", "status": "skipped", "implicit": False, "reason": "nothing to check"}
+    assert by_name["missing"]["status"] == "skipped"
+    for name in ("decode", "track", "inpaint", "encode"):
+        assert by_name[name]["status"] == "ok"
+        assert by_name[name]["wall_seconds"] >= 0
+        assert by_name[name]["cpu_seconds"] >= 0
+        assert by_name[name]["peak_rss_bytes"] > 0
+
+
+def test_run_toolchain_propagates_step_errors():
+    registry = StepRegistry()
+
+    @registry.register("boom", outputs=("video",))
+    def boom(ctx, inputs):
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError, match="bad input"):
+        run_toolchain(["boom"], _ctx(), goal="video", registry=registry)
+
+
+def test_prefetch_keeps_order_bounds_queue_and_reraises():
+    produced = []
+
+    def frames():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    with prefetch(frames(), maxsize=2) as staged:
+        first = next(staged)
+        time.sleep(0.05)
+        # One item handed out, two queued and one blocked on the full queue.
+        assert len(produced) <= 4
+        assert [first, *staged] == list(range(10))
+
+    def failing():
+        yield 1
+        raise ValueError("decode failed")
+
+    with prefetch(failing(), maxsize=2) as staged:
+        assert next(staged) == 1
+        with pytest.raises(ValueError, match="decode failed"):
+            next(staged)
@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+from video_platform.services import video_metadata
+
+
+def test_probe_video_runs_ffprobe_once_per_content(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_get_video_info(path):
+        calls.append(path)
+        return {"width": 640, "height": 360, "fps": 25.0, "duration": 4.0, "nb_frames": 100}
+
+    monkeypatch.setattr(video_metadata, "settings", SimpleNamespace(probe_cache_dir=str(tmp_path / "cache")))
+    monkeypatch.setattr(video_metadata, "get_video_info", fake_get_video_info)
+    monkeypatch.setattr(video_metadata, "_hash_memo", {})
+    monkeypatch.setattr(video_metadata, "_probe_memo", {})
+
+    first = tmp_path / "a.mp4"
+    second = tmp_path / "b.mp4"
+    first.write_bytes(b"same-bytes")
+    second.write_bytes(b"same-bytes")
+
+    info = video_metadata.probe_video(str(first))
+    again = video_metadata.probe_video(str(second))
+
+    assert len(calls) == 1
+    assert info == again
+    assert info["width"] == 640
+    assert len(info["content_hash"]) == 64
+    assert video_metadata.local_path_from_uri(f"file://{first}") == str(first)
+    assert video_metadata.local_path_from_uri("minio://raw/a.mp4") is None
+
+
+def test_job_creation_probes_input_off_the_event_loop(monkeypatch, tmp_path):
+    import asyncio
+
+    from fastapi.testclient import TestClient
+
+    from video_platform.api.main import app
+    from video_platform.api.routes import jobs
+
+    loops = []
+
+    def fake_probe_video(path):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return {"width": 640, "height": 360, "fps": 25.0, "duration": 4.0, "nb_frames": 100}
+
+    monkeypatch.setattr(jobs, "probe_video", fake_probe_video)
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"bytes")
+
+    res = TestClient(app).post(
+        "/api/v1/jobs",
+        json={"instruction": "Do a celebrity face swap deepfake", "input_uri": f"file://{clip}"},
+        headers={"X-API-Token": "dev-token"},
+    )
+    assert res.status_code == 201
+    assert res.json()["video_metadata"]["width"] == 640
+    assert loops == [None]
+
+
+def test_concurrent_probes_of_one_file_do_not_race(monkeypatch, tmp_path):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Hold every probe until all of them are in flight, so they all write the
+    # same cache entry at once.
+    barrier = threading.Barrier(8)
+
+    def fake_get_video_info(path):
+        barrier.wait(timeout=5)
+        return {"width": 640, "height": 360, "fps": 25.0, "duration": 4.0, "nb_frames": 100}
+
+    monkeypatch.setattr(video_metadata, "settings", SimpleNamespace(probe_cache_dir=str(tmp_path / "cache")))
+    monkeypatch.setattr(video_metadata, "get_video_info", fake_get_video_info)
+    monkeypatch.setattr(video_metadata, "_hash_memo", {})
+    monkeypatch.setattr(video_metadata, "_probe_memo", {})
+
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"bytes")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: video_metadata.probe_video(str(clip)), range(8)))
+
+    assert all(info == results[0] for info in results)
+    assert not list((tmp_path / "cache").rglob("*.tmp"))
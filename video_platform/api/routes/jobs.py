@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import uuid
+
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
+from temporalio.service import RPCError, RPCStatusCode
 
 from video_platform.api.deps import get_db, require_token
 from video_platform.config import settings
 from video_platform.core.enums import Capability, JobStatus
 from video_platform.core.schemas import (
     ArtifactManifestResponse,
+    JobBatchCreateRequest,
+    JobBatchProgressResponse,
+    JobBatchResponse,
     JobCreateRequest,
     JobEventResponse,
     JobListResponse,
@@ -16,18 +23,25 @@ from video_platform.core.schemas import (
 )
 from video_platform.db import JobIteration
 from video_platform.services.model_manager import get_runtime_mode
-from video_platform.services.orchestrator import start_orchestration
+from video_platform.services.orchestrator import get_batch_progress, start_batch_orchestration, start_orchestration
 from video_platform.services.repository import (
     create_job,
     get_job,
+    job_video_metadata,
     latest_qa_report,
     list_job_events,
     list_jobs,
+    log_job_event,
+    set_job_video_metadata,
 )
 from video_platform.services.safety import classify_risk
+from video_platform.services.video_metadata import local_path_from_uri, probe_video
 
 router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"], dependencies=[Depends(require_token)])
 
+# Inputs of one batch probed at a time.
+BATCH_PROBE_CONCURRENCY = 8
+
 
 def _to_job_response(job) -> JobResponse:
     capability = Capability(job.capability) if job.capability else None
@@ -43,6 +57,7 @@ def _to_job_response(job) -> JobResponse:
         current_iteration=job.current_iteration,
         max_iterations=job.max_iterations,
         latest_qa_score=job.latest_qa_score,
+        video_metadata=job_video_metadata(job),
         created_at=job.created_at,
         updated_at=job.updated_at,
     )
@@ -52,6 +67,33 @@ def _default_bundle_name() -> str:
     return "api_remote_bundle" if get_runtime_mode() == "api" else "balanced_12g_bundle"
 
 
+def _probe_input(input_uri: str) -> dict | Exception | None:
+    # Hashes the whole file and may run ffprobe: call it off the event loop.
+    path = local_path_from_uri(input_uri)
+    if path is None:
+        return None
+    try:
+        return probe_video(path)
+    except (OSError, RuntimeError, ValueError) as exc:
+        return exc
+
+
+def _record_video_metadata(db: Session, job, probed: dict | Exception | None) -> None:
+    if probed is None:
+        return
+    if isinstance(probed, Exception):
+        log_job_event(
+            session=db,
+            job_id=job.id,
+            stage="video_probe_failed",
+            message="Input video metadata could not be probed",
+            payload={"error": str(probed)},
+            level="warning",
+        )
+        return
+    set_job_video_metadata(db, job, probed)
+
+
 def _apply_admin_override(
     payload: JobCreateRequest,
     metadata: dict,
@@ -78,16 +120,17 @@ def _apply_admin_override(
     metadata["override_reason"] = reason
 
 
-@router.post("", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
-async def create_job_endpoint(
+def _create_job_row(
+    db: Session,
     payload: JobCreateRequest,
-    db: Session = Depends(get_db),
-    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
-    x_admin_token: str | None = Header(default=None, alias="X-Admin-Token"),
+    idempotency_key: str | None,
+    x_admin_token: str | None,
+    extra_metadata: dict | None = None,
 ):
     metadata = dict(payload.metadata)
     if payload.callback_url:
         metadata["callback_url"] = payload.callback_url
+    metadata.update(extra_metadata or {})
     _apply_admin_override(payload, metadata, x_admin_token)
 
     job, created = create_job(
@@ -106,6 +149,19 @@ async def create_job_endpoint(
         job.model_bundle = _default_bundle_name()
     if not job.risk_level:
         job.risk_level = classify_risk(payload.instruction)
+    return job, created
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
+async def create_job_endpoint(
+    payload: JobCreateRequest,
+    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
+    x_admin_token: str | None = Header(default=None, alias="X-Admin-Token"),
+):
+    job, created = _create_job_row(db, payload, idempotency_key, x_admin_token)
+    if created:
+        _record_video_metadata(db, job, await asyncio.to_thread(_probe_input, job.input_uri))
 
     db.flush()
     db.commit()
@@ -120,6 +176,79 @@ async def create_job_endpoint(
     return _to_job_response(job)
 
 
+@router.post(":batch", response_model=JobBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_job_batch_endpoint(
+    payload: JobBatchCreateRequest,
+    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
+    x_admin_token: str | None = Header(default=None, alias="X-Admin-Token"),
+):
+    """
+    Creates every job in one transaction and starts them all through one batch
+    workflow. With an Idempotency-Key, the batch id and each job's key derive
+    from it, so a retried request returns the same batch and starts nothing twice.
+    """
+    if len(payload.jobs) > settings.batch_max_jobs:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"a batch may contain at most {settings.batch_max_jobs} jobs",
+        )
+    batch_id = str(uuid.uuid5(uuid.NAMESPACE_URL, idempotency_key)) if idempotency_key else str(uuid.uuid4())
+
+    rows = [
+        _create_job_row(
+            db,
+            item,
+            f"{idempotency_key}:{index}" if idempotency_key else None,
+            x_admin_token,
+            extra_metadata={"batch_id": batch_id},
+        )
+        for index, item in enumerate(payload.jobs)
+    ]
+    created_jobs = [job for job, created in rows if created]
+    slots = asyncio.Semaphore(BATCH_PROBE_CONCURRENCY)
+
+    async def probe(input_uri: str):
+        async with slots:
+            return await asyncio.to_thread(_probe_input, input_uri)
+
+    probed = await asyncio.gather(*(probe(job.input_uri) for job in created_jobs))
+    for job, result in zip(created_jobs, probed):
+        _record_video_metadata(db, job, result)
+
+    db.flush()
+    db.commit()
+    for job, _ in rows:
+        db.refresh(job)
+
+    if created_jobs:
+        try:
+            await start_batch_orchestration(
+                batch_id,
+                [job.id for job in created_jobs],
+                parallelism=payload.parallelism or settings.batch_parallelism,
+            )
+        except RuntimeError as exc:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc))
+
+    return JobBatchResponse(batch_id=batch_id, items=[_to_job_response(job) for job, _ in rows])
+
+
+@router.get(":batch/{batch_id}", response_model=JobBatchProgressResponse)
+async def get_job_batch_endpoint(batch_id: str):
+    try:
+        progress = await get_batch_progress(batch_id)
+    except RPCError as exc:
+        if exc.status == RPCStatusCode.NOT_FOUND:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="batch not found")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"temporal error: {exc}")
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"temporal error: {exc}")
+    if progress is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="temporal unavailable")
+    return JobBatchProgressResponse(**progress)
+
+
 @router.get("", response_model=JobListResponse)
 def list_jobs_endpoint(limit: int = 50, db: Session = Depends(get_db)):
     rows = list_jobs(db, limit=min(max(limit, 1), 100))
@@ -19,6 +19,48 @@ class Settings:
     temporal_address: str = os.getenv("TEMPORAL_ADDRESS", "localhost:7233")
     temporal_namespace: str = os.getenv("TEMPORAL_NAMESPACE", "default")
     temporal_task_queue: str = os.getenv("TEMPORAL_TASK_QUEUE", "video-edit-task-queue")
+    # execute_iteration runs on its own queue so workflow tasks and light activities on
+    # TEMPORAL_TASK_QUEUE never wait behind renders. WORKER_ROLE picks the queues a worker
+    # polls: control (workflows + light activities), executor (execute_iteration) or all.
+    temporal_executor_task_queue: str = os.getenv("TEMPORAL_EXECUTOR_TASK_QUEUE", "video-edit-executor-queue")
+    # Executor workers also poll TEMPORAL_PREFETCH_TASK_QUEUE for input prefetches, with
+    # WORKER_MAX_CONCURRENT_PREFETCHES slots of their own, so a prefetch never holds a render slot.
+    temporal_prefetch_task_queue: str = os.getenv("TEMPORAL_PREFETCH_TASK_QUEUE", "video-edit-prefetch-queue")
+    worker_role: str = os.getenv("WORKER_ROLE", "all").lower()
+    # Run safety_precheck, plan_iteration and qa_iteration as local activities in the workflow
+    # worker (see scripts/benchmark_local_activities.py). Applies to workflows started afterwards.
+    workflow_local_activities: bool = os.getenv("WORKFLOW_LOCAL_ACTIVITIES", "false").lower() == "true"
+    # Plan the first iteration and prefetch the input while safety_precheck runs; the
+    # plan is discarded if the job is blocked. Applies to workflows started afterwards.
+    workflow_speculative_planning: bool = os.getenv("WORKFLOW_SPECULATIVE_PLANNING", "false").lower() == "true"
+    # Plan variants executed side by side per iteration, keeping the best QA result
+    # (see planner.VARIANT_STRATEGIES). 1 runs the plan alone.
+    plan_variants: int = int(os.getenv("PLAN_VARIANTS", "1"))
+    # Threads for the control worker's (synchronous) activities, and how many edit
+    # pipeline runs an executor worker takes at once.
+    worker_max_concurrent_activities: int = int(os.getenv("WORKER_MAX_CONCURRENT_ACTIVITIES", "16"))
+    worker_max_concurrent_executions: int = int(os.getenv("WORKER_MAX_CONCURRENT_EXECUTIONS", "1"))
+    worker_max_concurrent_prefetches: int = int(os.getenv("WORKER_MAX_CONCURRENT_PREFETCHES", "2"))
+    # Executions heartbeat their frame progress every EXECUTION_HEARTBEAT_SECONDS and stop
+    # heartbeating after EXECUTION_STALL_SECONDS without a frame, so Temporal times out a hung
+    # run after EXECUTION_HEARTBEAT_TIMEOUT_SECONDS. Steps that report no frames while they work
+    # (whole-clip inpainting, parallel segments) keep heartbeating. Progress is also logged as a
+    # job event every PROGRESS_EVENT_SECONDS.
+    execution_heartbeat_seconds: float = float(os.getenv("EXECUTION_HEARTBEAT_SECONDS", "5"))
+    execution_heartbeat_timeout_seconds: float = float(os.getenv("EXECUTION_HEARTBEAT_TIMEOUT_SECONDS", "60"))
+    execution_stall_seconds: float = float(os.getenv("EXECUTION_STALL_SECONDS", "300"))
+    progress_event_seconds: float = float(os.getenv("PROGRESS_EVENT_SECONDS", "30"))
+    # Local renders are encoded in chunks of CHECKPOINT_CHUNK_FRAMES and recorded in a workspace
+    # manifest (mirrored to CHECKPOINT_MINIO_BUCKET when set), so a retried execution resumes
+    # after the last finished chunk. Only windowed (INPAINT_WINDOW_SIZE > 0) or segment-parallel
+    # runs are checkpointed: whole-clip inpainting has to start over on a retry anyway.
+    enable_checkpoints: bool = os.getenv("ENABLE_CHECKPOINTS", "true").lower() == "true"
+    checkpoint_chunk_frames: int = int(os.getenv("CHECKPOINT_CHUNK_FRAMES", "300"))
+    checkpoint_minio_bucket: str = os.getenv("CHECKPOINT_MINIO_BUCKET", "")
+    # POST /api/v1/jobs:batch accepts up to BATCH_MAX_JOBS jobs; the batch workflow runs
+    # BATCH_PARALLELISM of them at once unless the request asks for fewer or more.
+    batch_max_jobs: int = int(os.getenv("BATCH_MAX_JOBS", "500"))
+    batch_parallelism: int = int(os.getenv("BATCH_PARALLELISM", "8"))
 
     qdrant_url: str = os.getenv("QDRANT_URL", "http://localhost:6333")
     qdrant_collection: str = os.getenv("QDRANT_COLLECTION", "case_embeddings")
@@ -37,7 +79,63 @@ class Settings:
     max_iterations: int = int(os.getenv("MAX_ITERATIONS", "3"))
 
     models_dir: str = os.getenv("MODELS_DIR", "models")
+    # "auto" picks cuda when available.
+    device: str = os.getenv("DEVICE", "auto")
+    # RAM/VRAM budget for resident models; 0 keeps every loaded model resident.
+    model_memory_budget_mb: int = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "0"))
+    # Preload and warm the bundle's runners before a local-mode worker polls Temporal.
+    enable_model_warmup: bool = os.getenv("ENABLE_MODEL_WARMUP", "true").lower() == "true"
+    # Bundle to warm; empty uses the bundle recommended for the detected device.
+    worker_model_bundle: str = os.getenv("WORKER_MODEL_BUNDLE", "")
     artifacts_dir: str = os.getenv("ARTIFACTS_DIR", "runtime/artifacts")
+    probe_cache_dir: str = os.getenv("PROBE_CACHE_DIR", "runtime/probe_cache")
+    # Step outputs shared across jobs on the same footage; LRU-evicted past the size bound.
+    step_cache_dir: str = os.getenv("STEP_CACHE_DIR", "runtime/step_cache")
+    step_cache_max_gb: float = float(os.getenv("STEP_CACHE_MAX_GB", "20"))
+    # Optional MinIO bucket used as a second, cluster-wide tier of the step cache.
+    step_cache_minio_bucket: str = os.getenv("STEP_CACHE_MINIO_BUCKET", "")
+    output_video_preset: str = os.getenv("OUTPUT_VIDEO_PRESET", "medium")
+    output_video_crf: int = int(os.getenv("OUTPUT_VIDEO_CRF", "23"))
+    # Keyframe interval of encoded outputs; shorter GOPs let a later re-edit re-encode less
+    # (see services/smart_render.py). 0 leaves it to the encoder.
+    output_keyframe_seconds: float = float(os.getenv("OUTPUT_KEYFRAME_SECONDS", "2.0"))
+    # Re-edits re-encode only the GOPs they change and stream-copy the rest of the previous output.
+    enable_smart_render: bool = os.getenv("ENABLE_SMART_RENDER", "true").lower() == "true"
+    enable_segment_parallel: bool = os.getenv("ENABLE_SEGMENT_PARALLEL", "false").lower() == "true"
+    segment_target_seconds: float = float(os.getenv("SEGMENT_TARGET_SECONDS", "6"))
+    segment_overlap_seconds: float = float(os.getenv("SEGMENT_OVERLAP_SECONDS", "1.0"))
+    # Segment processes each load their own SAM2 and ProPainter, so with a MODEL_MEMORY_BUDGET_MB
+    # at most budget / (SAM2 + ProPainter footprint) of them run at once; SEGMENT_WORKERS (0: one
+    # per CPU) is the upper bound. The footprint is measured by the first load (e.g. the warmup)
+    # or taken from SEGMENT_MODEL_FOOTPRINT_MB; while it is unknown, segments run one at a time.
+    segment_workers: int = int(os.getenv("SEGMENT_WORKERS", "0"))
+    segment_model_footprint_mb: int = int(os.getenv("SEGMENT_MODEL_FOOTPRINT_MB", "0"))
+    # 0 inpaints the whole clip at once; otherwise frames per ProPainter window.
+    inpaint_window_size: int = int(os.getenv("INPAINT_WINDOW_SIZE", "0"))
+    inpaint_window_overlap: int = int(os.getenv("INPAINT_WINDOW_OVERLAP", "8"))
+    enable_roi_inpaint: bool = os.getenv("ENABLE_ROI_INPAINT", "true").lower() == "true"
+    roi_pad_ratio: float = float(os.getenv("ROI_PAD_RATIO", "0.25"))
+    # Short side of the downscaled copy SAM2 tracks on; 0 follows the model bundle tier.
+    tracking_proxy_short_side: int = int(os.getenv("TRACKING_PROXY_SHORT_SIDE", "0"))
+    # Weight of the previous frame when smoothing the inpainted region. 0 (the default) disables
+    # it unless QA flagged temporal_flicker, which applies TEMPORAL_SMOOTHING_FIX_STRENGTH. Pixels
+    # that changed by more than TEMPORAL_SMOOTHING_MOTION_THRESHOLD levels are moving and kept.
+    temporal_smoothing_strength: float = float(os.getenv("TEMPORAL_SMOOTHING_STRENGTH", "0"))
+    temporal_smoothing_fix_strength: float = float(os.getenv("TEMPORAL_SMOOTHING_FIX_STRENGTH", "0.2"))
+    temporal_smoothing_motion_threshold: int = int(os.getenv("TEMPORAL_SMOOTHING_MOTION_THRESHOLD", "12"))
+    # Later iterations re-edit only the timeline ranges QA flagged (plus padding on both
+    # sides as context) and splice them into the previous output, unless the ranges
+    # cover more than reedit_max_fraction of the clip.
+    enable_scoped_reedit: bool = os.getenv("ENABLE_SCOPED_REEDIT", "true").lower() == "true"
+    reedit_padding_seconds: float = float(os.getenv("REEDIT_PADDING_SECONDS", "1.0"))
+    reedit_max_fraction: float = float(os.getenv("REEDIT_MAX_FRACTION", "0.5"))
+    # Shared pool for per-frame image I/O and conversion in the runners; 0 uses the CPU count.
+    frame_io_threads: int = int(os.getenv("FRAME_IO_THREADS", "0"))
+    # Decode, inference and encode run as overlapping stages joined by bounded frame queues.
+    enable_stage_pipelining: bool = os.getenv("ENABLE_STAGE_PIPELINING", "true").lower() == "true"
+    pipeline_queue_frames: int = int(os.getenv("PIPELINE_QUEUE_FRAMES", "16"))
+    # Threads for running independent tool-chain steps concurrently.
+    toolchain_max_workers: int = int(os.getenv("TOOLCHAIN_MAX_WORKERS", "4"))
 
     # Model runtime strategy:
     # - "api": use remote inference APIs, do not download local model bundles by default.
@@ -18,6 +18,22 @@ class JobCreateRequest(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
+class JobBatchCreateRequest(BaseModel):
+    jobs: list[JobCreateRequest] = Field(min_length=1)
+    parallelism: int | None = Field(default=None, ge=1, le=256)
+
+
+class VideoMetadata(BaseModel):
+    width: int
+    height: int
+    fps: float
+    duration: float
+    nb_frames: int
+    video_codec: str | None = None
+    audio_codec: str | None = None
+    content_hash: str | None = None
+
+
 class JobResponse(BaseModel):
     job_id: str
     status: JobStatus
@@ -31,10 +47,25 @@ class JobResponse(BaseModel):
     current_iteration: int
     max_iterations: int
     latest_qa_score: float | None = None
+    video_metadata: VideoMetadata | None = None
     created_at: datetime
     updated_at: datetime
 
 
+class JobBatchResponse(BaseModel):
+    batch_id: str
+    items: list[JobResponse]
+
+
+class JobBatchProgressResponse(BaseModel):
+    batch_id: str
+    total: int
+    pending: int
+    running: int
+    completed: int
+    statuses: dict[str, int]
+
+
 class ArtifactManifestResponse(BaseModel):
     job_id: str
     raw: list[str]
@@ -0,0 +1,72 @@
+import subprocess
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+
+class Cancelled(Exception):
+    """Raised at the next cancellation point once an execution has been cancelled."""
+
+
+class CancelToken:
+    """
+    Cancellation flag for one execution. ffmpeg processes started while the
+    token is current (see cancel_scope) are attached to it and killed by
+    cancel(), so blocking reads, writes and waits on them return promptly.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._procs: List[subprocess.Popen] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+        with self._lock:
+            procs, self._procs = self._procs, []
+        for proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise Cancelled("execution cancelled")
+
+    def attach(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._procs = [p for p in self._procs if p.poll() is None]
+            self._procs.append(proc)
+        if self._event.is_set():
+            proc.kill()
+
+
+_current: ContextVar[Optional[CancelToken]] = ContextVar("cancel_token", default=None)
+
+
+def current_token() -> Optional[CancelToken]:
+    return _current.get()
+
+
+@contextmanager
+def cancel_scope(token: CancelToken) -> Iterator[CancelToken]:
+    """
+    Makes token current for this thread. Threads started from inside the scope
+    only see it if they run in a copy of the caller's context
+    (contextvars.copy_context()).
+    """
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+def check_cancelled() -> None:
+    token = _current.get()
+    if token is not None:
+        token.check()
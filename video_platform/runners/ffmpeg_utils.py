@@ -1,35 +1,73 @@
 import json
 import subprocess
 from pathlib import Path
+from typing import Iterator
 import logging
 
+import numpy as np
+
+from video_platform.runners.cancellation import check_cancelled, current_token
+
 logger = logging.getLogger(__name__)
 
+def _popen(cmd: list[str], **kwargs) -> subprocess.Popen:
+    # Attaches the process to the current cancel token so cancelling kills it.
+    check_cancelled()
+    proc = subprocess.Popen(cmd, **kwargs)
+    token = current_token()
+    if token is not None:
+        token.attach(proc)
+    return proc
+
+def _run(cmd: list[str]) -> subprocess.CompletedProcess:
+    proc = _popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    stdout, stderr = proc.communicate()
+    # A process killed by cancellation fails; report the cancellation instead.
+    check_cancelled()
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+def _probe_float(value, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
 def get_video_info(video_path: str) -> dict:
     cmd = [
-        "ffprobe", "-v", "error", "-select_streams", "v:0",
-        "-show_entries", "stream=width,height,r_frame_rate,duration,nb_frames",
+        "ffprobe", "-v", "error",
+        "-show_entries", "stream=codec_type,codec_name,width,height,r_frame_rate,duration,nb_frames:format=duration",
         "-of", "json", video_path
     ]
-    result = subprocess.run(cmd, capture_update=True, text=True)
+    result = _run(cmd)
     if result.returncode != 0:
         raise RuntimeError(f"FFprobe failed: {result.stderr}")
     
     data = json.loads(result.stdout)
-    if "streams" not in data or len(data["streams"]) == 0:
+    streams = data.get("streams") or []
+    stream = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if stream is None:
         raise ValueError("No video stream found")
-        
-    stream = data["streams"][0]
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
     # parse frame rate
     fps_parts = stream.get("r_frame_rate", "30/1").split("/")
-    fps = float(fps_parts[0]) / float(fps_parts[1]) if len(fps_parts) == 2 else float(fps_parts[0])
+    if len(fps_parts) == 2:
+        denominator = _probe_float(fps_parts[1])
+        fps = _probe_float(fps_parts[0]) / denominator if denominator else 0.0
+    else:
+        fps = _probe_float(fps_parts[0])
+
+    duration = _probe_float(stream.get("duration")) or _probe_float((data.get("format") or {}).get("duration"))
+    nb_frames = int(_probe_float(stream.get("nb_frames"))) or round(duration * fps)
     
     return {
         "width": int(stream.get("width", 0)),
         "height": int(stream.get("height", 0)),
         "fps": fps,
-        "duration": float(stream.get("duration", 0.0)),
-        "nb_frames": int(stream.get("nb_frames", 0))
+        "duration": duration,
+        "nb_frames": nb_frames,
+        "video_codec": stream.get("codec_name"),
+        "audio_codec": audio.get("codec_name") if audio else None,
     }
 
 def extract_frames(video_path: str, output_dir: str, fps: float = None) -> None:
@@ -42,23 +80,349 @@ def extract_frames(video_path: str, output_dir: str, fps: float = None) -> None:
         cmd.extend(["-r", str(fps)])
     cmd.append(f"{output_dir}/%06d.jpg")
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = _run(cmd)
     if result.returncode != 0:
         raise RuntimeError(f"FFmpeg extract failed: {result.stderr}")
     logger.info(f"Extracted frames from {video_path} to {output_dir}")
 
-def merge_frames(frames_dir: str, output_path: str, fps: float) -> None:
+class FrameSource:
+    """
+    Streams decoded RGB frames from ffmpeg stdout into reusable NumPy buffers.
+
+    Frames yielded by iteration and arrays returned by read_batch are views into
+    buffers that are overwritten by later reads; copy them if they must outlive
+    the next read.
+    """
+
+    def __init__(
+        self,
+        video_path: str,
+        width: int | None = None,
+        height: int | None = None,
+        fps: float | None = None,
+        num_buffers: int = 2,
+        start: float = 0.0,
+        max_frames: int | None = None,
+    ):
+        if width is None or height is None:
+            info = get_video_info(video_path)
+            width = width or info["width"]
+            height = height or info["height"]
+        self.video_path = video_path
+        self.width = int(width)
+        self.height = int(height)
+        self.fps = fps
+        self.start = start
+        self.max_frames = max_frames
+        self.frame_shape = (self.height, self.width, 3)
+        self.frame_bytes = self.height * self.width * 3
+        self._buffers = [np.empty(self.frame_shape, dtype=np.uint8) for _ in range(max(1, num_buffers))]
+        self._next_buffer = 0
+        self._batch_buffer: np.ndarray | None = None
+        self._proc: subprocess.Popen | None = None
+        self._eof = False
+        self.frames_read = 0
+
+    def _command(self) -> list[str]:
+        cmd = ["ffmpeg", "-v", "error", "-nostdin"]
+        if self.start:
+            # Input seeking while decoding is frame accurate: output starts at the
+            # first frame with a timestamp at or after start.
+            cmd.extend(["-ss", f"{self.start:.6f}"])
+        cmd.extend(["-i", self.video_path])
+        if self.fps:
+            cmd.extend(["-r", str(self.fps)])
+        if self.max_frames:
+            cmd.extend(["-frames:v", str(self.max_frames)])
+        cmd.extend([
+            "-vf", f"scale={self.width}:{self.height}",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-",
+        ])
+        return cmd
+
+    def open(self) -> "FrameSource":
+        if self._proc is None:
+            self._proc = _popen(
+                self._command(),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=self.frame_bytes,
+            )
+        return self
+
+    def close(self) -> None:
+        if self._proc is None:
+            return
+        proc, self._proc = self._proc, None
+        if not self._eof:
+            # Closed before EOF: the caller stopped consuming on purpose, whether
+            # or not ffmpeg has exited in the meantime.
+            if proc.poll() is None:
+                proc.kill()
+            proc.communicate()
+            return
+        _, stderr = proc.communicate()
+        if proc.returncode != 0:
+            check_cancelled()
+            raise RuntimeError(f"FFmpeg decode failed: {stderr.decode(errors='replace')}")
+
+    def __enter__(self) -> "FrameSource":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _read_into(self, out: np.ndarray) -> bool:
+        if self._eof:
+            return False
+        if self._proc is None:
+            self.open()
+        view = memoryview(out).cast("B")
+        filled = 0
+        while filled < self.frame_bytes:
+            n = self._proc.stdout.readinto(view[filled:])
+            if not n:
+                # A killed decoder looks like EOF; don't pass it off as a short clip.
+                check_cancelled()
+                self._eof = True
+                break
+            filled += n
+        if filled == 0:
+            return False
+        if filled < self.frame_bytes:
+            raise RuntimeError(f"Truncated frame from ffmpeg ({filled}/{self.frame_bytes} bytes)")
+        self.frames_read += 1
+        return True
+
+    def read(self) -> np.ndarray | None:
+        buf = self._buffers[self._next_buffer]
+        if not self._read_into(buf):
+            return None
+        self._next_buffer = (self._next_buffer + 1) % len(self._buffers)
+        return buf
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+    def read_batch(self, batch_size: int) -> np.ndarray | None:
+        if self._batch_buffer is None or len(self._batch_buffer) < batch_size:
+            self._batch_buffer = np.empty((batch_size, *self.frame_shape), dtype=np.uint8)
+        count = 0
+        while count < batch_size and self._read_into(self._batch_buffer[count]):
+            count += 1
+        if count == 0:
+            return None
+        return self._batch_buffer[:count]
+
+    def batches(self, batch_size: int) -> Iterator[np.ndarray]:
+        while True:
+            batch = self.read_batch(batch_size)
+            if batch is None:
+                return
+            yield batch
+
+    def read_all(self) -> list[np.ndarray]:
+        return [frame.copy() for frame in self]
+
+class FrameSink:
+    """
+    Encodes RGB frames written to ffmpeg stdin as they are produced. When
+    audio_source is given, its first audio track (if any) is stream-copied into
+    the output so no second mux pass is needed.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        width: int,
+        height: int,
+        fps: float,
+        audio_source: str | None = None,
+        codec: str = "libx264",
+        preset: str = "medium",
+        crf: int = 23,
+        pix_fmt: str = "yuv420p",
+        keyframe_seconds: float | None = None,
+    ):
+        self.output_path = output_path
+        self.width = int(width)
+        self.height = int(height)
+        self.fps = fps
+        self.audio_source = audio_source
+        self.codec = codec
+        self.preset = preset
+        self.crf = crf
+        self.pix_fmt = pix_fmt
+        self.keyframe_seconds = keyframe_seconds
+        self.frame_shape = (self.height, self.width, 3)
+        self._proc: subprocess.Popen | None = None
+        self.frames_written = 0
+
+    def _command(self) -> list[str]:
+        cmd = [
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24",
+            "-s", f"{self.width}x{self.height}", "-r", str(self.fps),
+            "-i", "-",
+        ]
+        if self.audio_source:
+            cmd.extend(["-i", self.audio_source, "-map", "0:v:0", "-map", "1:a:0?", "-c:a", "copy", "-shortest"])
+        cmd.extend(["-c:v", self.codec, "-preset", self.preset, "-crf", str(self.crf)])
+        if self.keyframe_seconds:
+            cmd.extend(["-g", str(max(1, round(self.fps * self.keyframe_seconds)))])
+        cmd.extend(["-pix_fmt", self.pix_fmt, self.output_path])
+        return cmd
+
+    def open(self) -> "FrameSink":
+        if self._proc is None:
+            Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+            self._proc = _popen(
+                self._command(),
+                stdin=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        return self
+
+    def write(self, frame: np.ndarray) -> None:
+        if frame.shape != self.frame_shape or frame.dtype != np.uint8:
+            raise ValueError(f"Expected uint8 frame of shape {self.frame_shape}, got {frame.dtype} {frame.shape}")
+        if self._proc is None:
+            self.open()
+        try:
+            self._proc.stdin.write(memoryview(np.ascontiguousarray(frame)).cast("B"))
+        except BrokenPipeError:
+            _, stderr = self._proc.communicate()
+            self._proc = None
+            check_cancelled()
+            raise RuntimeError(f"FFmpeg encode failed: {stderr.decode(errors='replace')}")
+        self.frames_written += 1
+
+    def write_batch(self, frames) -> None:
+        for frame in frames:
+            self.write(frame)
+
+    def close(self) -> None:
+        if self._proc is None:
+            return
+        proc, self._proc = self._proc, None
+        _, stderr = proc.communicate()
+        if proc.returncode != 0:
+            check_cancelled()
+            raise RuntimeError(f"FFmpeg encode failed: {stderr.decode(errors='replace')}")
+        logger.info(f"Encoded {self.frames_written} frames to {self.output_path}")
+
+    def abort(self) -> None:
+        if self._proc is None:
+            return
+        proc, self._proc = self._proc, None
+        proc.kill()
+        proc.communicate()
+
+    def __enter__(self) -> "FrameSink":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+def merge_frames(
+    frames_dir: str,
+    output_path: str,
+    fps: float,
+    audio_source: str | None = None,
+    preset: str = "medium",
+    crf: int = 23,
+) -> None:
     cmd = [
         "ffmpeg", "-y", "-framerate", str(fps),
         "-i", f"{frames_dir}/%06d.jpg",
-        "-c:v", "libx264", "-pix_fmt", "yuv420p",
-        output_path
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    if audio_source:
+        cmd.extend(["-i", audio_source, "-map", "0:v:0", "-map", "1:a:0?", "-c:a", "copy", "-shortest"])
+    cmd.extend([
+        "-c:v", "libx264", "-preset", preset, "-crf", str(crf), "-pix_fmt", "yuv420p",
+        output_path
+    ])
+    result = _run(cmd)
     if result.returncode != 0:
         raise RuntimeError(f"FFmpeg merge failed: {result.stderr}")
     logger.info(f"Merged frames from {frames_dir} to {output_path}")
 
+def make_proxy(video_path: str, output_path: str, width: int, height: int) -> None:
+    cmd = [
+        "ffmpeg", "-y", "-v", "error", "-i", video_path,
+        "-vf", f"scale={width}:{height}", "-an",
+        "-c:v", "libx264", "-preset", "ultrafast", "-crf", "18", "-pix_fmt", "yuv420p",
+        output_path
+    ]
+    result = _run(cmd)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg proxy failed: {result.stderr}")
+    logger.info(f"Created {width}x{height} proxy of {video_path}")
+
+def list_keyframes(video_path: str) -> list[float]:
+    cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags",
+        "-of", "csv=p=0", video_path
+    ]
+    result = _run(cmd)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFprobe keyframe scan failed: {result.stderr}")
+
+    times = []
+    for line in result.stdout.splitlines():
+        parts = line.strip().split(",")
+        if len(parts) >= 2 and "K" in parts[1] and parts[0] not in ("", "N/A"):
+            times.append(float(parts[0]))
+    return sorted(times)
+
+def cut_clip(
+    video_path: str, output_path: str, start: float, end: float | None = None, frames: int | None = None
+) -> None:
+    # Stream copy: start must be a keyframe timestamp for the cut to be exact. A -t
+    # cut of a stream with B-frames can carry a few packets past end, so pass
+    # frames (the clip's frame count) when it must not gain any.
+    cmd = ["ffmpeg", "-y", "-v", "error", "-ss", f"{start:.6f}", "-i", video_path]
+    if frames is not None:
+        cmd.extend(["-frames:v", str(frames)])
+    elif end is not None:
+        cmd.extend(["-t", f"{end - start:.6f}"])
+    cmd.extend(["-map", "0:v:0", "-c", "copy", "-avoid_negative_ts", "make_zero", output_path])
+    result = _run(cmd)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg cut failed: {result.stderr}")
+
+def count_frames(video_path: str) -> int:
+    """Number of video packets (one per frame), read without decoding."""
+    cmd = ["ffmpeg", "-nostdin", "-v", "error", "-i", video_path, "-map", "0:v:0", "-c", "copy", "-f", "framecrc", "-"]
+    result = _run(cmd)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg frame count failed: {result.stderr}")
+    return sum(1 for line in result.stdout.splitlines() if line and not line.startswith("#"))
+
+def concat_videos(video_paths: list[str], output_path: str, audio_source: str | None = None) -> None:
+    list_path = f"{output_path}.concat.txt"
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in video_paths:
+            escaped = str(Path(path).resolve()).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    cmd = ["ffmpeg", "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", list_path]
+    if audio_source:
+        cmd.extend(["-i", audio_source, "-map", "0:v:0", "-map", "1:a:0?", "-shortest"])
+    cmd.extend(["-c", "copy", output_path])
+    result = _run(cmd)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg concat failed: {result.stderr}")
+    logger.info(f"Concatenated {len(video_paths)} segments into {output_path}")
+
 def apply_color_lut(video_path: str, lut_path: str, output_path: str) -> None:
     # Use FFmpeg to apply 3D LUT
     cmd = [
@@ -67,7 +431,7 @@ def apply_color_lut(video_path: str, lut_path: str, output_path: str) -> None:
         "-c:v", "libx264", "-pix_fmt", "yuv420p",
         output_path
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = _run(cmd)
     if result.returncode != 0:
         raise RuntimeError(f"FFmpeg color grading failed: {result.stderr}")
     logger.info(f"Applied LUT {lut_path} to {video_path}")
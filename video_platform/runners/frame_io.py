@@ -0,0 +1,61 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+import cv2
+import numpy as np
+
+from video_platform.config import settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def frame_io_pool() -> ThreadPoolExecutor:
+    """
+    Process-wide pool for per-frame work that releases the GIL (OpenCV image
+    codecs and colour conversion, large NumPy casts). Sized by FRAME_IO_THREADS,
+    defaulting to the CPU count.
+    """
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None:
+            _pool_size = settings.frame_io_threads or min(32, os.cpu_count() or 1)
+            _pool = ThreadPoolExecutor(max_workers=_pool_size, thread_name_prefix="frame-io")
+        return _pool
+
+
+def ordered_map(fn: Callable[[T], R], items: Iterable[T], max_in_flight: Optional[int] = None) -> Iterator[R]:
+    """
+    Like map(fn, items) on the shared pool: results come back in input order,
+    and at most max_in_flight items (default twice the pool size) are queued
+    or held at once, so memory stays bounded on long clips. fn must not call
+    ordered_map itself.
+    """
+    pool = frame_io_pool()
+    limit = max(1, max_in_flight or 2 * _pool_size)
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= limit:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def read_rgb(path: str) -> np.ndarray:
+    img = cv2.imread(path)
+    if img is None:
+        raise RuntimeError(f"Could not read image {path}")
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+
+def write_rgb(path: str, frame: np.ndarray) -> None:
+    if not cv2.imwrite(path, cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)):
+        raise RuntimeError(f"Could not write image {path}")
@@ -0,0 +1,112 @@
+from typing import Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from video_platform.runners.roi import Box, mask_bbox, union_bbox
+
+_LEVELS = np.array([0, 255], dtype=np.uint8)
+
+
+def rle_encode(mask: np.ndarray) -> np.ndarray:
+    """
+    Row-major run lengths of mask > 0, alternating unset/set and starting with
+    an unset run (which is 0 when the first pixel is set), like COCO RLE.
+    """
+    flat = np.ravel(mask) > 0
+    if flat.size == 0:
+        return np.zeros(1, dtype=np.uint32)
+    bounds = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    counts = np.diff(np.concatenate(([0], bounds, [flat.size])))
+    if flat[0]:
+        counts = np.concatenate(([0], counts))
+    return counts.astype(np.uint32)
+
+
+def rle_decode(counts: np.ndarray, height: int, width: int) -> np.ndarray:
+    levels = np.resize(_LEVELS, len(counts))
+    return np.repeat(levels, counts).reshape(height, width)
+
+
+class MaskSequence:
+    """
+    Per-frame binary masks stored as run lengths with their bounding boxes.
+    Frames decode lazily to uint8 0/255 arrays on indexing or iteration, and
+    slicing returns a MaskSequence sharing the same runs, so it can stand in
+    for a list of masks at a fraction of the memory.
+    """
+
+    def __init__(self, height: int, width: int):
+        self.height = height
+        self.width = width
+        self._runs: List[np.ndarray] = []
+        self._bboxes: List[Optional[Box]] = []
+
+    @classmethod
+    def from_masks(cls, masks: Iterable[np.ndarray]) -> "MaskSequence":
+        seq = None
+        for mask in masks:
+            if seq is None:
+                seq = cls(*mask.shape[:2])
+            seq.append(mask)
+        return seq if seq is not None else cls(0, 0)
+
+    def append(self, mask: np.ndarray) -> None:
+        if mask.shape[:2] != (self.height, self.width):
+            raise ValueError(f"Mask shape {mask.shape[:2]} does not match {(self.height, self.width)}")
+        self._runs.append(rle_encode(mask))
+        self._bboxes.append(mask_bbox(mask > 0))
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[np.ndarray, "MaskSequence"]:
+        if isinstance(index, slice):
+            seq = MaskSequence(self.height, self.width)
+            seq._runs = self._runs[index]
+            seq._bboxes = self._bboxes[index]
+            return seq
+        return rle_decode(self._runs[index], self.height, self.width)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for counts in self._runs:
+            yield rle_decode(counts, self.height, self.width)
+
+    def bbox(self, index: int) -> Optional[Box]:
+        return self._bboxes[index]
+
+    def union_bbox(self) -> Optional[Box]:
+        return union_bbox(self._bboxes)
+
+    def area(self, index: int) -> int:
+        return int(self._runs[index][1::2].sum())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(counts.nbytes for counts in self._runs)
+
+    def save(self, path: str) -> None:
+        """
+        Writes every frame into one compressed .npz file. np.savez_compressed
+        appends .npz to paths without that suffix.
+        """
+        offsets = np.zeros(len(self._runs) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(counts) for counts in self._runs])
+        counts = np.concatenate(self._runs) if self._runs else np.zeros(0, dtype=np.uint32)
+        bboxes = np.array([box if box is not None else (-1, -1, -1, -1) for box in self._bboxes], dtype=np.int32)
+        np.savez_compressed(
+            path,
+            shape=np.array([self.height, self.width], dtype=np.int64),
+            counts=counts,
+            offsets=offsets,
+            bboxes=bboxes.reshape(-1, 4),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "MaskSequence":
+        with np.load(path) as data:
+            height, width = (int(v) for v in data["shape"])
+            counts, offsets, bboxes = data["counts"], data["offsets"], data["bboxes"]
+        seq = cls(height, width)
+        seq._runs = [counts[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+        seq._bboxes = [tuple(int(v) for v in box) if box[0] >= 0 else None for box in bboxes]
+        return seq
@@ -1,13 +1,34 @@
 import os
 import torch
 import numpy as np
-import cv2
 import logging
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from video_platform.runners.base import BaseRunner, ModelNotInstalledError
+from video_platform.runners.ffmpeg_utils import FrameSink
+from video_platform.runners.frame_io import ordered_map, read_rgb, write_rgb
+from video_platform.runners.masks import MaskSequence
+from video_platform.runners.roi import Box
 
 logger = logging.getLogger(__name__)
 
+def plan_windows(total: int, window_size: int, overlap: int = 0) -> List[Tuple[int, int]]:
+    """[start, end) frame windows of window_size covering total frames, consecutive windows sharing overlap frames."""
+    if total <= 0:
+        return []
+    window_size = max(1, window_size)
+    if window_size >= total:
+        return [(0, total)]
+    overlap = min(max(0, overlap), window_size - 1)
+    stride = window_size - overlap
+    windows = []
+    start = 0
+    while start + window_size < total:
+        windows.append((start, start + window_size))
+        start += stride
+    # Align the last window to the end so it is full size; its overlap may grow.
+    windows.append((max(0, total - window_size), total))
+    return windows
+
 class ProPainterRunner(BaseRunner):
     def __init__(self):
         self.model = None
@@ -35,45 +56,124 @@ class ProPainterRunner(BaseRunner):
         self.model = Inpainter(model_dir=model_dir, device=device)
         self.device = device
             
-    def predict(self, frames_dir: str, masks: List[np.ndarray], output_dir: str) -> str:
-        if not self.model:
-            raise RuntimeError("Model not loaded")
-            
-        import torchvision.transforms.functional as TF
-        
-        os.makedirs(output_dir, exist_ok=True)
+    def _iter_frames_dir(self, frames_dir: str) -> Iterator[np.ndarray]:
         frame_files = sorted([f for f in os.listdir(frames_dir) if f.endswith(('.jpg', '.png'))])
-        
-        if len(frame_files) != len(masks):
-            raise ValueError(f"Number of frames ({len(frame_files)}) does not match masks ({len(masks)})")
+        return ordered_map(read_rgb, [os.path.join(frames_dir, f) for f in frame_files])
+
+    def _inpaint_window(self, frames: List[np.ndarray], masks: Iterable[np.ndarray]) -> np.ndarray:
+        video = torch.from_numpy(np.stack(frames)).permute(0, 3, 1, 2).float().div_(255.0).to(self.device)
+        mask = torch.from_numpy(np.stack(list(masks))).unsqueeze(1).float().div_(255.0).to(self.device)
 
-        video_tensors = []
-        mask_tensors = []
-        
-        for f, m in zip(frame_files, masks):
-            img = cv2.imread(os.path.join(frames_dir, f))
-            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            img_tensor = TF.to_tensor(img).unsqueeze(0)  
-            video_tensors.append(img_tensor)
-            
-            m_tensor = torch.from_numpy(m).float().unsqueeze(0).unsqueeze(0) / 255.0  
-            mask_tensors.append(m_tensor)
-            
-        video = torch.cat(video_tensors, dim=0).to(self.device) 
-        mask = torch.cat(mask_tensors, dim=0).to(self.device)   
-        
         batch_size = 10
         with torch.no_grad():
             inpainted_video = self.model.forward(video, mask, b_size=batch_size)
-            
-        inpainted_np = inpainted_video.cpu().numpy() 
-        inpainted_np = (inpainted_np * 255).astype(np.uint8)
-        
-        for i, f in enumerate(frame_files):
-            out_img = inpainted_np[i].transpose(1, 2, 0)
-            out_img = cv2.cvtColor(out_img, cv2.COLOR_RGB2BGR)
-            cv2.imwrite(os.path.join(output_dir, f), out_img)
-            
+        del video, mask
+
+        # (T, H, W, C) float in [0, 1]
+        return inpainted_video.permute(0, 2, 3, 1).float().cpu().numpy()
+
+    def iter_predict(
+        self,
+        frames: Union[str, Iterable[np.ndarray]],
+        masks: Union[MaskSequence, Sequence[np.ndarray]],
+        window_size: Optional[int] = None,
+        window_overlap: int = 0,
+        roi: Optional[Box] = None,
+    ) -> Iterator[np.ndarray]:
+        """
+        Yields inpainted RGB uint8 frames in order. With a window_size, frames
+        are pulled from the input and inpainted window by window, so only one
+        window (plus the overlap tail) is held in memory; overlapping frames are
+        cross-faded between consecutive windows. With an roi (x0, y0, x1, y1)
+        only that crop is inpainted and pasted back into the original frames.
+        """
+        if not self.model:
+            raise RuntimeError("Model not loaded")
+
+        if isinstance(frames, str):
+            frames = self._iter_frames_dir(frames)
+        frames_it = iter(frames)
+
+        total = len(masks)
+        windows = plan_windows(total, window_size or total, window_overlap)
+        buffer: List[np.ndarray] = []
+        buffer_start = 0
+        pending: Optional[np.ndarray] = None
+
+        for i, (start, end) in enumerate(windows):
+            del buffer[:start - buffer_start]
+            buffer_start = start
+            while buffer_start + len(buffer) < end:
+                frame = next(frames_it, None)
+                if frame is None:
+                    raise ValueError(f"Number of frames ({buffer_start + len(buffer)}) does not match masks ({total})")
+                # Sources such as FrameSource reuse their buffers.
+                buffer.append(np.array(frame, copy=True))
+
+            if roi is None:
+                out = self._inpaint_window(buffer, masks[start:end])
+            else:
+                x0, y0, x1, y1 = roi
+                out = self._inpaint_window(
+                    [f[y0:y1, x0:x1] for f in buffer],
+                    [m[y0:y1, x0:x1] for m in masks[start:end]],
+                )
+            if pending is not None:
+                blend = len(pending)
+                ramp = (np.arange(1, blend + 1, dtype=np.float32) / (blend + 1)).reshape(-1, 1, 1, 1)
+                out[:blend] = pending * (1.0 - ramp) + out[:blend] * ramp
+
+            emit_until = windows[i + 1][0] if i + 1 < len(windows) else end
+
+            def finish(j: int, out: np.ndarray = out) -> np.ndarray:
+                frame = (out[j] * 255).astype(np.uint8)
+                if roi is None:
+                    return frame
+                composite = buffer[j].copy()
+                composite[roi[1]:roi[3], roi[0]:roi[2]] = frame
+                return composite
+
+            # Fully consumed before the next window touches buffer.
+            yield from ordered_map(finish, range(emit_until - start))
+            pending = out[emit_until - start:] if emit_until < end else None
+
+        if next(frames_it, None) is not None:
+            raise ValueError(f"More frames than masks ({total})")
+
+    def predict(
+        self,
+        frames: Union[str, Iterable[np.ndarray]],
+        masks: Union[MaskSequence, Sequence[np.ndarray]],
+        output_dir: Optional[str] = None,
+        sink: Optional[FrameSink] = None,
+        window_size: Optional[int] = None,
+        window_overlap: int = 0,
+        roi: Optional[Box] = None,
+    ) -> Union[str, List[np.ndarray]]:
+        """
+        Inpaints RGB uint8 frames (a sequence, a FrameSource or a legacy JPEG
+        directory). Returns the inpainted RGB frames; when a sink is given the
+        frames are streamed into it and its output path is returned, when
+        output_dir is given they are written as JPEGs and output_dir is returned.
+        See iter_predict for window_size/window_overlap/roi.
+        """
+        results = self.iter_predict(frames, masks, window_size=window_size, window_overlap=window_overlap, roi=roi)
+
+        if sink is not None:
+            for out_img in results:
+                sink.write(out_img)
+            return sink.output_path
+
+        if output_dir is None:
+            return list(results)
+
+        os.makedirs(output_dir, exist_ok=True)
+        for _ in ordered_map(
+            lambda item: write_rgb(os.path.join(output_dir, f"{item[0] + 1:06d}.jpg"), item[1]),
+            enumerate(results),
+        ):
+            pass
+
         return output_dir
 
     def unload(self):
@@ -0,0 +1,68 @@
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+Box = Tuple[int, int, int, int]
+
+
+def mask_bbox(mask: np.ndarray) -> Optional[Box]:
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+def union_bbox(boxes: Iterable[Optional[Box]]) -> Optional[Box]:
+    union = None
+    for box in boxes:
+        if box is None:
+            continue
+        if union is None:
+            union = box
+        else:
+            union = (min(union[0], box[0]), min(union[1], box[1]), max(union[2], box[2]), max(union[3], box[3]))
+    return union
+
+
+def _padded_span(lo: int, hi: int, pad: int, align: int, limit: int) -> Tuple[int, int]:
+    lo, hi = max(0, lo - pad), min(limit, hi + pad)
+    # Grow to a multiple of align, preferring to extend past hi, then before lo.
+    size = min(limit, -(-(hi - lo) // align) * align)
+    hi = min(limit, lo + size)
+    lo = max(0, hi - size)
+    return lo, hi
+
+
+def stable_roi(
+    masks: Iterable[np.ndarray],
+    width: int,
+    height: int,
+    pad_ratio: float = 0.25,
+    min_pad: int = 16,
+    align: int = 8,
+    max_area_ratio: float = 0.6,
+) -> Optional[Box]:
+    """
+    One crop box (x0, y0, x1, y1) for the whole clip: the union of every mask's
+    bounding box, padded for inpainting context and aligned to `align` pixels.
+    Using a single box keeps the crop temporally stable. Returns None when no
+    mask pixel is set or the crop would not save enough to be worth it.
+    MaskSequence inputs use their stored boxes instead of decoding every frame.
+    """
+    if hasattr(masks, "union_bbox"):
+        union = masks.union_bbox()
+    else:
+        union = union_bbox(mask_bbox(mask) for mask in masks)
+    if union is None:
+        return None
+
+    x0, y0, x1, y1 = union
+    pad_x = max(min_pad, int((x1 - x0) * pad_ratio))
+    pad_y = max(min_pad, int((y1 - y0) * pad_ratio))
+    x0, x1 = _padded_span(x0, x1, pad_x, align, width)
+    y0, y1 = _padded_span(y0, y1, pad_y, align, height)
+
+    if (x1 - x0) * (y1 - y0) > max_area_ratio * width * height:
+        return None
+    return x0, y0, x1, y1
@@ -1,9 +1,14 @@
 import os
+import tempfile
 import torch
+import torch.nn.functional as F
 import numpy as np
 from PIL import Image
 import logging
+from typing import Callable, Optional, Tuple
 from video_platform.runners.base import BaseRunner, ModelNotInstalledError
+from video_platform.runners.ffmpeg_utils import get_video_info, make_proxy
+from video_platform.runners.masks import MaskSequence
 
 logger = logging.getLogger(__name__)
 
@@ -39,34 +44,87 @@ class SAM2Runner(BaseRunner):
         self.predictor = build_sam2_video_predictor(model_cfg, sam2_checkpoint, device=self.device)
         self.model = True
 
-    def predict(self, video_dir: str, initial_mask: np.ndarray = None, points: list = None, labels: list = None) -> list[np.ndarray]:
+    def predict(
+        self,
+        video_path: str,
+        initial_mask: np.ndarray = None,
+        points: list = None,
+        labels: list = None,
+        proxy_short_side: Optional[int] = None,
+        source_size: Optional[Tuple[int, int]] = None,
+        workdir: Optional[str] = None,
+        on_frame: Optional[Callable[[int], None]] = None,
+    ) -> MaskSequence:
+        # video_path may be a JPEG frame directory or a video file; SAM2 decodes
+        # video files itself, so callers don't need to materialize frames.
+        # With proxy_short_side, a video file is tracked on a downscaled proxy and
+        # the mask logits are bilinearly upsampled back to source resolution
+        # before thresholding, which keeps mask edges smooth.
+        # on_frame is called with each tracked frame index; raising from it
+        # stops propagation.
         if not self.model:
             raise RuntimeError("Model not loaded")
-            
-        inference_state = self.predictor.init_state(video_path=video_dir)
-        
-        if points is not None and labels is not None:
-            self.predictor.add_new_points_or_box(
-                inference_state=inference_state,
-                frame_idx=0,
-                obj_id=1,
-                points=np.array(points, dtype=np.float32),
-                labels=np.array(labels, dtype=np.int32),
-            )
-        elif initial_mask is not None:
-            self.predictor.add_new_mask(
-                inference_state=inference_state,
-                frame_idx=0,
-                obj_id=1,
-                mask=initial_mask
-            )
-        
-        masks = []
-        for out_frame_idx, out_obj_ids, out_mask_logits in self.predictor.propagate_in_video(inference_state):
-            mask = (out_mask_logits[0, 0] > 0.0).cpu().numpy().astype(np.uint8) * 255
-            masks.append(mask)
-            
-        return masks
+
+        track_path = video_path
+        proxy_path = None
+        scale_x = scale_y = 1.0
+        width = height = None
+        if proxy_short_side and os.path.isfile(video_path):
+            if source_size is None:
+                info = get_video_info(video_path)
+                source_size = (info["width"], info["height"])
+            width, height = source_size
+            scale = proxy_short_side / min(width, height)
+            if scale < 1.0:
+                proxy_w = max(2, int(round(width * scale / 2)) * 2)
+                proxy_h = max(2, int(round(height * scale / 2)) * 2)
+                fd, proxy_path = tempfile.mkstemp(suffix=".mp4", prefix="sam2_proxy_", dir=workdir)
+                os.close(fd)
+                make_proxy(video_path, proxy_path, proxy_w, proxy_h)
+                track_path = proxy_path
+                scale_x, scale_y = proxy_w / width, proxy_h / height
+
+        try:
+            inference_state = self.predictor.init_state(video_path=track_path)
+
+            if points is not None and labels is not None:
+                self.predictor.add_new_points_or_box(
+                    inference_state=inference_state,
+                    frame_idx=0,
+                    obj_id=1,
+                    points=np.array(points, dtype=np.float32) * np.array([scale_x, scale_y], dtype=np.float32),
+                    labels=np.array(labels, dtype=np.int32),
+                )
+            elif initial_mask is not None:
+                if proxy_path is not None:
+                    initial_mask = np.array(
+                        Image.fromarray(initial_mask.astype(np.uint8)).resize((proxy_w, proxy_h), Image.NEAREST)
+                    )
+                self.predictor.add_new_mask(
+                    inference_state=inference_state,
+                    frame_idx=0,
+                    obj_id=1,
+                    mask=initial_mask
+                )
+
+            masks = None
+            for out_frame_idx, out_obj_ids, out_mask_logits in self.predictor.propagate_in_video(inference_state):
+                logits = out_mask_logits[0, 0]
+                if proxy_path is not None:
+                    logits = F.interpolate(
+                        logits[None, None].float(), size=(height, width), mode="bilinear", align_corners=False
+                    )[0, 0]
+                mask = (logits > 0.0).cpu().numpy()
+                if masks is None:
+                    masks = MaskSequence(*mask.shape)
+                masks.append(mask)
+                if on_frame is not None:
+                    on_frame(out_frame_idx)
+        finally:
+            if proxy_path is not None:
+                os.remove(proxy_path)
+
+        return masks if masks is not None else MaskSequence(0, 0)
 
     def unload(self):
         if self.predictor is not None:
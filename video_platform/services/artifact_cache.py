@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+from video_platform.config import settings
+from video_platform.runners.masks import MaskSequence
+
+logger = logging.getLogger(__name__)
+
+
+def artifact_key(input_hash: str, step: str, params: dict[str, Any], version: int = 1) -> str:
+    """Content address of a step output: input hash, step name and version, and normalized params."""
+    payload = json.dumps(
+        {"input": input_hash, "step": step, "version": version, "params": params}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MinioTier:
+    """Second cache tier in a MinIO bucket, shared by every worker."""
+
+    def __init__(self, bucket: str, prefix: str = "step-cache"):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=f"http://{settings.minio_endpoint}",
+            aws_access_key_id=settings.minio_access_key,
+            aws_secret_access_key=settings.minio_secret_key,
+            region_name="us-east-1",
+            use_ssl=settings.minio_secure,
+        )
+
+    def fetch(self, name: str, path: Path) -> bool:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.part")
+        try:
+            self.client.download_file(self.bucket, f"{self.prefix}/{name}", str(tmp))
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            return False
+        os.replace(tmp, path)
+        return True
+
+    def upload(self, path: Path) -> None:
+        try:
+            self.client.upload_file(str(path), self.bucket, f"{self.prefix}/{path.name}")
+        except Exception as exc:
+            logger.warning("step cache upload of %s failed: %s", path.name, exc)
+
+
+class ArtifactCache:
+    """
+    Step outputs keyed by artifact_key(), shared by every job on this machine
+    so jobs and iterations on the same footage reuse decoded frames and masks.
+    Entries are evicted least recently used first once the directory grows
+    past max_bytes (0 is unbounded). With a remote tier, local misses are
+    fetched from it and new entries are uploaded to it.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 0, remote: MinioTier | None = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.remote = remote
+        self.stats: dict[str, str] = {}
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.root / f"{key}{suffix}"
+
+    def _record(self, step: str, outcome: str) -> None:
+        self.stats[step] = outcome
+        logger.info("artifact cache %s for step=%s", outcome, step)
+
+    def _lookup(self, step: str, paths: list[Path]) -> bool:
+        """
+        True when every file of an entry is present locally, fetching them from
+        the remote tier if needed. Hits are touched so eviction sees them as recent.
+        """
+        if all(path.exists() for path in paths):
+            for path in paths:
+                os.utime(path)
+            self._record(step, "hit")
+            return True
+        if self.remote is not None and all(self.remote.fetch(path.name, path) for path in paths):
+            self._record(step, "remote_hit")
+            return True
+        self._record(step, "miss")
+        return False
+
+    def _stored(self, paths: list[Path]) -> None:
+        if self.remote is not None:
+            for path in paths:
+                self.remote.upload(path)
+        self.evict(keep={path.name.split(".")[0] for path in paths})
+
+    def evict(self, keep: set[str] | None = None) -> int:
+        """Deletes least recently used entries until the cache fits max_bytes; returns bytes freed."""
+        if self.max_bytes <= 0:
+            return 0
+        entries: dict[str, tuple[float, int, list[Path]]] = {}
+        total = 0
+        for path in self.root.iterdir():
+            if not path.is_file() or path.name.endswith((".tmp", ".tmp.npz", ".part")):
+                continue
+            st = path.stat()
+            total += st.st_size
+            key = path.name.split(".")[0]
+            last_used, size, paths = entries.get(key, (0.0, 0, []))
+            entries[key] = (max(last_used, st.st_mtime), size + st.st_size, paths + [path])
+
+        freed = 0
+        for key, (_, size, paths) in sorted(entries.items(), key=lambda item: item[1][0]):
+            if total - freed <= self.max_bytes:
+                break
+            if key in (keep or set()):
+                continue
+            for path in paths:
+                path.unlink(missing_ok=True)
+            freed += size
+            logger.info("step cache evicted %s (%s bytes)", key, size)
+        return freed
+
+    def load_frames(self, step: str, key: str) -> np.ndarray | None:
+        meta_path = self._path(key, ".frames.json")
+        data_path = self._path(key, ".frames")
+        # The metadata file marks a complete entry, so it is fetched last.
+        if not self._lookup(step, [data_path, meta_path]):
+            return None
+        shape = tuple(json.loads(meta_path.read_text(encoding="utf-8"))["shape"])
+        return np.memmap(data_path, dtype=np.uint8, mode="r", shape=shape)
+
+    def stream_frames(self, key: str, frames: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """
+        Writes frames to disk one at a time and yields each one on, so a
+        consumer can work on them while they are being cached. The entry is
+        committed only once the input is exhausted; an abandoned stream leaves
+        nothing behind.
+        """
+        data_path = self._path(key, ".frames")
+        tmp = data_path.with_name(f"{data_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        count = 0
+        frame_shape: tuple[int, ...] = ()
+        try:
+            with open(tmp, "wb") as f:
+                for frame in frames:
+                    frame_shape = frame.shape
+                    f.write(np.ascontiguousarray(frame, dtype=np.uint8).data)
+                    count += 1
+                    yield frame
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        if count == 0:
+            tmp.unlink(missing_ok=True)
+            return
+        os.replace(tmp, data_path)
+        # The metadata file is written last and marks the entry as complete.
+        meta_path = self._path(key, ".frames.json")
+        meta_path.write_text(json.dumps({"shape": (count, *frame_shape)}), encoding="utf-8")
+        self._stored([data_path, meta_path])
+
+    def store_frames(self, key: str, frames: Iterable[np.ndarray]) -> np.ndarray | None:
+        """
+        Streams frames to disk one at a time (so a FrameSource can be consumed
+        directly) and returns them as a read-only memmap.
+        """
+        for _ in self.stream_frames(key, frames):
+            pass
+        meta_path = self._path(key, ".frames.json")
+        if not meta_path.exists():
+            return None
+        shape = tuple(json.loads(meta_path.read_text(encoding="utf-8"))["shape"])
+        return np.memmap(self._path(key, ".frames"), dtype=np.uint8, mode="r", shape=shape)
+
+    def load_masks(self, step: str, key: str) -> MaskSequence | None:
+        path = self._path(key, ".masks.npz")
+        if not self._lookup(step, [path]):
+            return None
+        return MaskSequence.load(str(path))
+
+    def store_masks(self, key: str, masks: MaskSequence) -> None:
+        if not len(masks):
+            return
+        path = self._path(key, ".masks.npz")
+        tmp = path.with_name(f"{key}.{os.getpid()}.tmp.npz")
+        masks.save(str(tmp))
+        os.replace(tmp, path)
+        self._stored([path])
@@ -42,6 +42,15 @@ CAPABILITY_TOOLCHAIN: dict[Capability, list[str]] = {
 }
 
 
+# Local pipeline steps whose output a QA fix point invalidates. Steps not
+# listed for a fix point are reused from earlier iterations of the same job.
+FIX_POINT_STEPS: dict[str, tuple[str, ...]] = {
+    "temporal_flicker": ("inpaint",),
+    "instruction_partial_match": ("track", "inpaint"),
+    "tracking_dropout": ("track", "inpaint"),
+}
+
+
 CAPABILITY_HINTS: dict[Capability, tuple[str, ...]] = {
     Capability.remove_object: ("remove", "erase", "delete", "去除", "移除"),
     Capability.replace_object: ("replace", "swap", "change object", "替换"),
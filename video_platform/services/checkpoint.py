@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from video_platform.services.artifact_cache import MinioTier
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "checkpoint.json"
+
+
+class ChunkCheckpoint:
+    """
+    Finished output chunks of one execution, recorded in a manifest in the
+    workspace and mirrored to an optional MinIO tier, so a retried attempt (on
+    this node or another) can resume after the last finished chunk. The
+    manifest carries a fingerprint of the input and plan; restoring with a
+    different fingerprint starts over. Chunk files need unique base names, as
+    the remote tier stores them flat.
+    """
+
+    def __init__(self, workspace: str, remote: MinioTier | None = None):
+        self.root = Path(workspace)
+        self.remote = remote
+        self.fingerprint: str | None = None
+        self.chunks: list[dict[str, Any]] = []
+        self.resumed_frames = 0
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_FILENAME
+
+    def restore(self, fingerprint: str) -> int:
+        """Loads the chunks finished by an earlier attempt; returns how many frames they cover."""
+        self.fingerprint = fingerprint
+        self.chunks = []
+        path = self.manifest_path
+        if not path.exists() and self.remote is not None:
+            self.remote.fetch(MANIFEST_FILENAME, path)
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("fingerprint") == fingerprint:
+                for chunk in sorted(data.get("chunks", []), key=lambda c: c["index"]):
+                    file = self.root / chunk["path"]
+                    if not file.exists() and (self.remote is None or not self.remote.fetch(file.name, file)):
+                        break
+                    self.chunks.append(chunk)
+            else:
+                logger.info("Ignoring checkpoint for a different input or plan in %s", self.root)
+        self.resumed_frames = self.frames_done
+        if self.chunks:
+            logger.info("Resuming from checkpoint: %s chunks, %s frames", len(self.chunks), self.resumed_frames)
+        return self.resumed_frames
+
+    @property
+    def frames_done(self) -> int:
+        return sum(chunk["frames"] for chunk in self.chunks)
+
+    def done(self, index: int) -> bool:
+        return any(chunk["index"] == index for chunk in self.chunks)
+
+    def paths(self) -> list[str]:
+        return [str(self.root / chunk["path"]) for chunk in self.chunks]
+
+    def commit(self, index: int, path: str, frames: int) -> None:
+        chunk = {"index": index, "path": os.path.relpath(path, self.root), "frames": frames}
+        with self._lock:
+            self.chunks = sorted([c for c in self.chunks if c["index"] != index] + [chunk], key=lambda c: c["index"])
+            manifest = {"fingerprint": self.fingerprint, "chunks": self.chunks}
+            tmp = self.manifest_path.with_name(f"{MANIFEST_FILENAME}.tmp")
+            tmp.write_text(json.dumps(manifest), encoding="utf-8")
+            os.replace(tmp, self.manifest_path)
+            if self.remote is not None:
+                # Chunk before manifest, so the remote manifest never lists a missing chunk.
+                self.remote.upload(Path(path))
+                self.remote.upload(self.manifest_path)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "chunks": len(self.chunks),
+            "frames": self.frames_done,
+            "resumed_frames": self.resumed_frames,
+            "manifest": str(self.manifest_path),
+        }
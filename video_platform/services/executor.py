@@ -1,50 +1,166 @@
 from __future__ import annotations
 
+import math
 import os
 import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import islice
 import uuid
 from typing import Any
 import logging
 
+import numpy as np
+from PIL import Image
+
 from video_platform.config import settings
 from video_platform.core.schemas import EditPlan
-from video_platform.services.model_manager import get_runtime_mode
+from video_platform.services.artifact_cache import ArtifactCache, MinioTier, artifact_key
+from video_platform.services.capabilities import FIX_POINT_STEPS
+from video_platform.services.checkpoint import ChunkCheckpoint
+from video_platform.services.model_manager import bundle_runners, get_runtime_mode
+from video_platform.services.model_registry import ModelRegistry, default_device
+from video_platform.services.progress import ProgressReporter
+from video_platform.services.qa import mask_signals
 from video_platform.services.remote_inference import call_remote_video_edit
+from video_platform.services.segmenting import check_segment_cancelled, run_segmented, segment_cancellable
+from video_platform.services.smart_render import smart_render
+from video_platform.services.toolchain import STEP_REGISTRY, StepContext, StepSkipped, prefetch, run_toolchain
+from video_platform.services.video_metadata import file_content_hash, local_path_from_uri, probe_video
 from video_platform.utils.time import now_utc
-from video_platform.runners.ffmpeg_utils import get_video_info, extract_frames, merge_frames
+from video_platform.runners.ffmpeg_utils import FrameSink, FrameSource, apply_color_lut, concat_videos
 from video_platform.runners.sam2_runner import SAM2Runner
 from video_platform.runners.propainter_runner import ProPainterRunner
+from video_platform.runners.roi import stable_roi
+from video_platform.runners.masks import MaskSequence
 from video_platform.runners.base import ModelNotInstalledError
+from video_platform.runners.cancellation import Cancelled
 
 logger = logging.getLogger(__name__)
 
-def _stub_output(job_id: str, iteration: int) -> str:
-    return f"minio://output/{job_id}/iter_{iteration}/edited.mp4"
-
-# Maintain instances of models in memory if needed or reload them dynamically
-_sam2_runner = None
-_propainter_runner = None
-
-def _get_or_load_sam2() -> SAM2Runner:
-    global _sam2_runner
-    if _sam2_runner is None:
-        _sam2_runner = SAM2Runner()
-        model_dir = os.path.join(settings.models_dir, "sam2") if hasattr(settings, "models_dir") else "./models/sam2"
-        _sam2_runner.load(model_dir, device="cuda" if settings.device != "cpu" else "cpu")
-    return _sam2_runner
-
-def _get_or_load_propainter() -> ProPainterRunner:
-    global _propainter_runner
-    if _propainter_runner is None:
-        _propainter_runner = ProPainterRunner()
-        model_dir = os.path.join(settings.models_dir, "propainter") if hasattr(settings, "models_dir") else "./models/propainter"
-        _propainter_runner.load(model_dir, device="cuda" if settings.device != "cpu" else "cpu")
-    return _propainter_runner
-
-def execute_plan(job_id: str, iteration: int, input_uri: str, instruction: str, plan: EditPlan) -> dict:
+# Tracking masks of the last run, kept in the iteration workspace for QA.
+MASKS_FILENAME = "masks.npz"
+
+# Bump a step's version when its output changes for the same params, so cached
+# outputs from older code are not reused.
+STEP_VERSIONS = {"decode": 1, "track": 1}
+
+# Bump when checkpointed chunks from older code must not be resumed.
+CHECKPOINT_VERSION = 1
+
+@lru_cache(maxsize=1)
+def _step_cache_remote() -> MinioTier | None:
+    if not settings.step_cache_minio_bucket:
+        return None
+    try:
+        return MinioTier(settings.step_cache_minio_bucket)
+    except Exception as e:
+        logger.warning(f"MinIO step cache tier unavailable: {e}")
+        return None
+
+def _job_root(job_id: str) -> str:
+    return f"/tmp/video_platform/jobs/{job_id}"
+
+def _local_output(output_uri: str) -> str | None:
+    # Local runs write <job root>/<iteration dir>/output.mp4 and report it as
+    # minio://output/<job id>/<iteration dir>/edited.mp4.
+    prefix = "minio://output/"
+    if not output_uri.startswith(prefix):
+        return None
+    job_id, _, rest = output_uri[len(prefix):].partition("/")
+    path = os.path.join(_job_root(job_id), os.path.dirname(rest), "output.mp4")
+    return path if os.path.exists(path) else None
+
+def _iteration_dir(iteration: int, variant: int | None = None) -> str:
+    # Variants of one iteration run side by side, so each gets its own directory.
+    return f"iter_{iteration}" if variant is None else f"iter_{iteration}_v{variant}"
+
+def _checkpoint_remote(job_id: str, iteration: int, variant: int | None = None) -> MinioTier | None:
+    if not settings.checkpoint_minio_bucket:
+        return None
+    try:
+        return MinioTier(
+            settings.checkpoint_minio_bucket, prefix=f"checkpoints/{job_id}/{_iteration_dir(iteration, variant)}"
+        )
+    except Exception as e:
+        logger.warning(f"MinIO checkpoint tier unavailable: {e}")
+        return None
+
+def _stub_output(job_id: str, iteration: int, variant: int | None = None) -> str:
+    return f"minio://output/{job_id}/{_iteration_dir(iteration, variant)}/edited.mp4"
+
+# Loaded runners stay resident across jobs until the memory budget forces an eviction
+model_registry = ModelRegistry(
+    budget_bytes=settings.model_memory_budget_mb * 1024 * 1024,
+    device=default_device(settings.device),
+)
+
+def _synthetic_clip(size: int = 64, count: int = 8) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    """A small square drifting across a gradient, for warming up runners."""
+    ramp = np.linspace(0, 255, size, dtype=np.uint8)
+    background = np.stack(
+        [np.tile(ramp, (size, 1)), np.tile(ramp[:, None], (1, size)), np.full((size, size), 96, np.uint8)],
+        axis=-1,
+    )
+    frames, masks = [], []
+    for i in range(count):
+        frame = background.copy()
+        mask = np.zeros((size, size), dtype=np.uint8)
+        x = size // 4 + i
+        frame[size // 4:size // 2, x:x + size // 4] = 230
+        mask[size // 4:size // 2, x:x + size // 4] = 255
+        frames.append(frame)
+        masks.append(mask)
+    return frames, masks
+
+def _warm_sam2(runner: SAM2Runner) -> None:
+    frames, _ = _synthetic_clip()
+    with tempfile.TemporaryDirectory(prefix="sam2_warmup_") as frames_dir:
+        for i, frame in enumerate(frames):
+            Image.fromarray(frame).save(os.path.join(frames_dir, f"{i:05d}.jpg"))
+        runner.predict(frames_dir, points=[(24, 24)], labels=[1])
+
+def _warm_propainter(runner: ProPainterRunner) -> None:
+    frames, masks = _synthetic_clip()
+    for _ in runner.iter_predict(frames, masks):
+        pass
+
+model_registry.register("sam2", SAM2Runner, os.path.join(settings.models_dir, "sam2"), warmup=_warm_sam2)
+model_registry.register(
+    "propainter", ProPainterRunner, os.path.join(settings.models_dir, "propainter"), warmup=_warm_propainter
+)
+
+def warmup_models(bundle_name: str) -> dict:
+    """Preloads and warms the runners of bundle_name; returns per-model load/warmup seconds."""
+    return model_registry.warmup(bundle_runners(bundle_name))
+
+def execute_plan(
+    job_id: str,
+    iteration: int,
+    input_uri: str,
+    instruction: str,
+    plan: EditPlan,
+    progress: ProgressReporter | None = None,
+    variant: int | None = None,
+) -> dict:
+    """
+    progress receives frame counts from the local pipeline; run the call inside
+    cancel_scope(progress.token) so cancelling it also kills ffmpeg processes.
+    Local remove_object runs with windowed or segmented inpainting checkpoint
+    finished chunks in the workspace, so calling again for the same job and
+    iteration resumes after the last one.
+    Variants of one iteration may run concurrently; each writes its own output.
+    """
     mode = get_runtime_mode()
-    output_uri = _stub_output(job_id, iteration)
+    output_uri = _stub_output(job_id, iteration, variant)
     notes = ""
+    cache_stats: dict[str, str] = {}
+    mask_path = None
+    masks_summary = None
+    step_records: list[dict] = []
+    checkpoint = None
 
     if mode == "api":
         ok, data, error = call_remote_video_edit(
@@ -66,28 +182,43 @@ def execute_plan(job_id: str, iteration: int, input_uri: str, instruction: str,
         logger.info(f"Executing plan locally for capability: {plan.capability.value}")
         
         # Determine paths for local processing
-        workspace = f"/tmp/video_platform/jobs/{job_id}/iter_{iteration}"
+        job_root = _job_root(job_id)
+        workspace = os.path.join(job_root, _iteration_dir(iteration, variant))
         os.makedirs(workspace, exist_ok=True)
-        local_input = os.path.join(workspace, "input.mp4")
+        local_input = local_path_from_uri(input_uri) or os.path.join(workspace, "input.mp4")
         local_output = os.path.join(workspace, "output.mp4")
+        cache = ArtifactCache(
+            settings.step_cache_dir,
+            max_bytes=int(settings.step_cache_max_gb * 1024**3),
+            remote=_step_cache_remote(),
+        )
         
+        if settings.enable_checkpoints:
+            checkpoint = ChunkCheckpoint(workspace, remote=_checkpoint_remote(job_id, iteration, variant))
+
         # If no input file is found (e.g. running dummy tests), create a dummy so it fails gracefully later
         if not os.path.exists(local_input):
              with open(local_input, "w") as f:
                  f.write("dummy")
 
         try:
-            if plan.capability.value == "remove_object":
-                notes = _run_remove_object_pipeline(local_input, local_output, workspace, plan)
-            else:
-                notes = f"Capability {plan.capability.value} executed via local model runner"
-                shutil.copy2(local_input, local_output)
+            notes = _run_toolchain(
+                local_input, local_output, workspace, plan, cache, step_records, progress, checkpoint
+            )
+            cache_stats = cache.stats
+            if os.path.exists(os.path.join(workspace, MASKS_FILENAME)):
+                mask_path = os.path.join(workspace, MASKS_FILENAME)
+                # QA runs on the control worker, which cannot read this workspace.
+                masks_summary = mask_signals(MaskSequence.load(mask_path))
             
-            output_uri = f"minio://output/{job_id}/iter_{iteration}/edited.mp4"
+            output_uri = _stub_output(job_id, iteration, variant)
         except ModelNotInstalledError as e:
             # THIS IS THE CRITICAL CHANGE: We explicitly catch ModelNotInstalledError and throw it upwards
             # so the API / UI can catch it and prompt the user to install models!
             raise RuntimeError(f"MODEL_NOT_INSTALLED: {str(e)}") from e
+        except Cancelled:
+            logger.info(f"Local execution of job {job_id} iteration {iteration} cancelled")
+            raise
         except Exception as e:
             logger.error(f"Local execution failed: {e}")
             raise RuntimeError(f"Local pipeline failed: {e}")
@@ -104,43 +235,593 @@ def execute_plan(job_id: str, iteration: int, input_uri: str, instruction: str,
         "constraints": plan.constraints,
         "notes": notes,
     }
+    if cache_stats:
+        execution_log["artifact_cache"] = cache_stats
+    if mask_path:
+        execution_log["mask_path"] = mask_path
+        execution_log["mask_signals"] = masks_summary
+    if step_records:
+        execution_log["steps"] = step_records
+    if checkpoint is not None and checkpoint.chunks:
+        execution_log["checkpoint"] = checkpoint.summary()
+    if mode != "api":
+        execution_log["model_residency"] = model_registry.stats()
     return {
         "output_uri": output_uri,
         "execution_log": execution_log,
     }
 
-def _run_remove_object_pipeline(input_path: str, output_path: str, workspace: str, plan: EditPlan) -> str:
+def _encoder_options(plan: EditPlan) -> dict:
+    return {
+        "preset": str(plan.constraints.get("encoder_preset", settings.output_video_preset)),
+        "crf": int(plan.constraints.get("encoder_crf", settings.output_video_crf)),
+        "keyframe_seconds": float(plan.constraints.get("keyframe_seconds", settings.output_keyframe_seconds)),
+    }
+
+def _inpaint_options(plan: EditPlan) -> dict:
+    return {
+        "window_size": int(plan.constraints.get("inpaint_window_size", settings.inpaint_window_size)) or None,
+        "window_overlap": int(plan.constraints.get("inpaint_window_overlap", settings.inpaint_window_overlap)),
+    }
+
+def _tracking_options(plan: EditPlan) -> dict:
+    short_side = plan.constraints.get("tracking_short_side", settings.tracking_proxy_short_side)
+    return {"proxy_short_side": int(short_side or 0) or None}
+
+def _inpaint_roi(plan: EditPlan, masks, width: int, height: int):
+    if not bool(plan.constraints.get("roi_inpaint", settings.enable_roi_inpaint)):
+        return None
+    return stable_roi(masks, width, height, pad_ratio=settings.roi_pad_ratio)
+
+def _pipeline_queue_frames(plan: EditPlan) -> int:
+    if not bool(plan.constraints.get("stage_pipelining", settings.enable_stage_pipelining)):
+        return 0
+    return max(1, settings.pipeline_queue_frames)
+
+def _stage(frames, plan: EditPlan):
+    """
+    Runs the stages producing a lazy frame stream on their own thread, behind a
+    bounded queue, so they overlap with the consuming stage. Arrays are already
+    materialized and pass through unchanged.
+    """
+    queue_frames = _pipeline_queue_frames(plan)
+    if queue_frames and isinstance(frames, Iterator):
+        return prefetch(frames, queue_frames)
+    return nullcontext(frames)
+
+def _segment_workers() -> int:
+    # Pool processes load their own SAM2 and ProPainter outside this process's
+    # registry, so the model budget has to bound how many run at once.
+    workers = settings.segment_workers or os.cpu_count() or 1
+    if model_registry.budget_bytes <= 0:
+        return workers
+    footprint = settings.segment_model_footprint_mb * 1024 * 1024 or model_registry.footprint_bytes(
+        ["sam2", "propainter"]
+    )
+    if footprint <= 0:
+        logger.info("Segment model footprint unknown; processing segments one at a time")
+        return 1
+    return max(1, min(workers, model_registry.budget_bytes // footprint))
+
+def _use_segment_parallel(plan: EditPlan, video_info: dict) -> bool:
+    enabled = bool(plan.constraints.get("segment_parallel", settings.enable_segment_parallel))
+    return enabled and video_info["duration"] >= 2 * settings.segment_target_seconds
+
+def _step_fixes(plan: EditPlan, step: str) -> list[str]:
+    # Fix points without a known mapping conservatively invalidate every step.
+    fixes = set()
+    for fix in plan.fix_map:
+        point = fix.get("fix_point", "")
+        if step in FIX_POINT_STEPS.get(point, (step,)):
+            fixes.add(point)
+    return sorted(fixes)
+
+def _run_toolchain(
+    input_path: str,
+    output_path: str,
+    workspace: str,
+    plan: EditPlan,
+    cache: ArtifactCache | None = None,
+    step_records: list[dict] | None = None,
+    progress: ProgressReporter | None = None,
+    checkpoint: ChunkCheckpoint | None = None,
+) -> str:
+    """
+    Runs plan.tool_chain through the step registry. Capabilities whose steps
+    have no local runner yet pass the input through unchanged.
+    """
+    if plan.capability.value == "remove_object":
+        return _run_remove_object_pipeline(
+            input_path, output_path, workspace, plan, cache, step_records, progress, checkpoint
+        )
+
+    ctx = StepContext(
+        input_path=input_path,
+        output_path=output_path,
+        workspace=workspace,
+        plan=plan,
+        cache=cache,
+        progress=progress or ProgressReporter(),
+    )
+    artifacts, steps = run_toolchain(plan.tool_chain, ctx, goal="video", max_workers=settings.toolchain_max_workers)
+    if step_records is not None:
+        step_records.extend(steps)
+    if "video" in artifacts:
+        return f"Capability {plan.capability.value} executed via local tool chain"
+    shutil.copy2(input_path, output_path)
+    return f"Capability {plan.capability.value} executed via local model runner"
+
+def _run_remove_object_pipeline(
+    input_path: str,
+    output_path: str,
+    workspace: str,
+    plan: EditPlan,
+    cache: ArtifactCache | None = None,
+    step_records: list[dict] | None = None,
+    progress: ProgressReporter | None = None,
+    checkpoint: ChunkCheckpoint | None = None,
+) -> str:
     """
     Executes the real 'remove_object' toolchain: 
-    ffmpeg extract -> SAM2 track -> ProPainter inpaint -> ffmpeg merge
-    """
-    frames_dir = os.path.join(workspace, "frames")
-    masks_dir = os.path.join(workspace, "masks")
-    inpaint_dir = os.path.join(workspace, "inpainted")
-    
-    # 1. Extract Frames
-    logger.info("Step 1: Extracting frames")
+    ffmpeg decode (streamed) -> SAM2 track -> ProPainter inpaint -> ffmpeg encode (streamed)
+
+    Decoding runs concurrently with tracking. With a cache, decoded frames and
+    tracking masks are reused from earlier iterations unless the plan's fix_map
+    targets that step. With a checkpoint, the output is encoded in chunks (or
+    per segment) and a retry skips the chunks an earlier attempt finished. That
+    only saves work when inpainting is windowed or segmented, so whole-clip
+    inpainting runs without one.
+    """
     try:
-        video_info = get_video_info(input_path)
-        extract_frames(input_path, frames_dir, fps=video_info["fps"])
-    except RuntimeError:
+        video_info = plan.constraints.get("source_video") or probe_video(input_path)
+    except (RuntimeError, OSError, ValueError):
         # FFMPEG might fail on dummy files during unit tests
         return "Local mock executed because input file is dummy/ffmpeg failed."
-    
-    # 2. Track Object (SAM2)
-    logger.info("Step 2: Tracking object with SAM2")
-    sam2 = _get_or_load_sam2()
-    points = [(video_info["width"] // 2, video_info["height"] // 2)]
-    labels = [1]
-    masks = sam2.predict(frames_dir, points=points, labels=labels)
-    
-    # 3. Inpaint (ProPainter)
-    logger.info("Step 3: Inpainting with ProPainter")
-    propainter = _get_or_load_propainter()
-    propainter.predict(frames_dir, masks, inpaint_dir)
-    
-    # 4. Merge Frames
-    logger.info("Step 4: Merging frames")
-    merge_frames(inpaint_dir, output_path, fps=video_info["fps"])
-    
+
+    progress = progress or ProgressReporter()
+    if plan.constraints.get("reedit"):
+        notes = _run_reedit(input_path, output_path, workspace, plan, video_info, progress)
+        if notes:
+            return notes
+
+    segmented = _use_segment_parallel(plan, video_info)
+    if checkpoint is not None and not segmented and not _inpaint_options(plan)["window_size"]:
+        # A retry re-infers the whole clip anyway; chunked encoding would only add a concat.
+        checkpoint = None
+    if checkpoint is not None:
+        checkpoint.restore(_checkpoint_fingerprint(input_path, plan, video_info))
+        progress.set_checkpoint(checkpoint.summary())
+
+    if segmented:
+        # Segments report their frames only once each one is finished.
+        progress.start_step("segments", video_info.get("nb_frames"), opaque=True)
+
+        def segment_done(task: dict) -> None:
+            if checkpoint is not None:
+                checkpoint.commit(task["index"], task["output_path"], task["own_frames"])
+                progress.set_checkpoint(checkpoint.summary())
+            progress.advance("segments", task["own_frames"])
+
+        count = run_segmented(
+            input_path,
+            output_path,
+            workspace,
+            video_info,
+            _process_remove_object_segment,
+            target_seconds=settings.segment_target_seconds,
+            overlap_seconds=settings.segment_overlap_seconds,
+            workers=_segment_workers(),
+            task_extra={
+                **_encoder_options(plan),
+                **_inpaint_options(plan),
+                **_tracking_options(plan),
+                "roi_inpaint": bool(plan.constraints.get("roi_inpaint", settings.enable_roi_inpaint)),
+            },
+            on_segment_done=segment_done,
+            is_done=(lambda task: checkpoint.done(task["index"])) if checkpoint is not None else None,
+        )
+        progress.finish_step("segments")
+        return f"Successfully ran remove_object pipeline locally over {count} parallel segments using SAM2 and ProPainter"
+
+    ctx = StepContext(
+        input_path=input_path,
+        output_path=output_path,
+        workspace=workspace,
+        plan=plan,
+        video_info=video_info,
+        cache=cache,
+        progress=progress,
+        checkpoint=checkpoint,
+    )
+    _, steps = run_toolchain(plan.tool_chain, ctx, goal="video", max_workers=settings.toolchain_max_workers)
+    if step_records is not None:
+        step_records.extend(steps)
     return "Successfully ran remove_object pipeline locally using SAM2 and ProPainter"
+
+def _run_reedit(
+    input_path: str,
+    output_path: str,
+    workspace: str,
+    plan: EditPlan,
+    video_info: dict,
+    progress: ProgressReporter,
+) -> str | None:
+    """
+    Re-processes only the ranges in plan.constraints["reedit"] and splices them
+    into the previous iteration's output; the other frames are taken from that
+    output unchanged. Each range is tracked (or, when the plan does not fix
+    tracking, takes the previous masks) and inpainted with padding_seconds of
+    context on both sides, which is not spliced. Returns None when the previous
+    output is not on this node, so the caller renders the whole clip instead.
+    """
+    reedit = plan.constraints["reedit"]
+    base_path = _local_output(reedit["base_output_uri"])
+    if base_path is None:
+        logger.info(f"Previous output {reedit['base_output_uri']} not available here; re-rendering the whole clip")
+        return None
+
+    width, height, fps = video_info["width"], video_info["height"], video_info["fps"]
+    total = int(video_info.get("nb_frames") or round(video_info["duration"] * fps))
+    pad = round(float(reedit["padding_seconds"]) * fps)
+    base_masks_path = os.path.join(os.path.dirname(base_path), MASKS_FILENAME)
+    base_masks = MaskSequence.load(base_masks_path) if os.path.exists(base_masks_path) else None
+    retrack = base_masks is None or bool(_step_fixes(plan, "track"))
+    strength = _smoothing_strength(plan)
+
+    edited: dict[int, np.ndarray] = {}
+    retracked: dict[int, np.ndarray] = {}
+    for start_s, end_s in reedit["ranges"]:
+        start, end = _reedit_frames(start_s, end_s, fps, total)
+        if end <= start:
+            continue
+        first, last = max(0, start - pad), min(total, end + pad)
+        frames = _decode_range(input_path, width, height, fps, first, last - first)
+        if retrack:
+            masks = _track_range(frames, plan, workspace, f"reedit_{start:06d}", video_info, progress)
+            retracked.update((first + i, masks[i]) for i in range(start - first, min(len(masks), end - first)))
+        else:
+            masks = base_masks[first:last]
+        count = min(len(frames), len(masks))
+        masks = masks[:count]
+        roi = _inpaint_roi(plan, masks, width, height)
+        with model_registry.acquire("propainter") as propainter:
+            inpainted = propainter.iter_predict(frames[:count], masks, roi=roi, **_inpaint_options(plan))
+            if strength > 0:
+                inpainted = _smooth_masked_region(inpainted, masks, strength)
+            inpainted = progress.track(
+                "propainter_inpaint", inpainted, count, opaque=not _inpaint_options(plan)["window_size"]
+            )
+            for index, frame in enumerate(islice(inpainted, start - first, end - first), start):
+                edited[index] = frame.copy()
+
+    progress.start_step("ffmpeg_encode", total)
+    rendered = None
+    if settings.enable_smart_render:
+        # The previous output came from this pipeline with the same encoder options,
+        # so its untouched GOPs can be stream-copied next to re-encoded ones.
+        try:
+            rendered = smart_render(
+                base_path,
+                output_path,
+                workspace,
+                video_info,
+                edited,
+                encoder=_encoder_options(plan),
+                audio_source=input_path,
+                on_frames=lambda n: progress.advance("ffmpeg_encode", n),
+            )
+        except (RuntimeError, OSError) as e:
+            logger.warning(f"Smart render failed, re-encoding the whole clip: {e}")
+    if rendered is None:
+        with FrameSource(base_path, width=width, height=height) as base, FrameSink(
+            output_path,
+            width=width,
+            height=height,
+            fps=fps,
+            audio_source=input_path,
+            **_encoder_options(plan),
+        ) as sink:
+            spliced = (edited.get(index, frame) for index, frame in enumerate(base))
+            sink.write_batch(progress.track("ffmpeg_encode", spliced, total))
+
+    if base_masks is not None:
+        masks = MaskSequence.from_masks(retracked.get(i, base_masks[i]) for i in range(len(base_masks)))
+        masks.save(os.path.join(workspace, MASKS_FILENAME))
+    seconds = len(edited) / fps if fps else 0.0
+    notes = f"Re-edited {len(edited)} frames ({seconds:.1f}s) in {len(reedit['ranges'])} ranges of the previous output"
+    if rendered is not None:
+        notes += f"; {rendered['encoded_frames']} frames re-encoded, {rendered['copied_frames']} stream-copied"
+    return notes
+
+def _reedit_frames(start_s: float, end_s: float, fps: float, total: int) -> tuple[int, int]:
+    # [start, end) frames covering the range: round outwards so a sub-second range
+    # keeps its frames, with a tenth of a frame of slack for millisecond timecodes.
+    start = max(0, math.floor(start_s * fps + 0.1))
+    end = min(total, math.ceil(end_s * fps - 0.1))
+    if end_s > start_s:
+        end = max(end, min(total, start + 1))
+    return start, end
+
+def _decode_range(path: str, width: int, height: int, fps: float, first: int, count: int) -> list[np.ndarray]:
+    # Seeks half a frame early so timestamp rounding never skips frame `first`.
+    start = max(0.0, (first - 0.5) / fps)
+    with FrameSource(path, width=width, height=height, start=start, max_frames=count) as source:
+        return source.read_all()
+
+def _track_range(
+    frames: list[np.ndarray], plan: EditPlan, workspace: str, name: str, video_info: dict, progress: ProgressReporter
+) -> MaskSequence:
+    width, height = video_info["width"], video_info["height"]
+    clip_path = os.path.join(workspace, f"{name}.mp4")
+    with FrameSink(clip_path, width=width, height=height, fps=video_info["fps"], **_encoder_options(plan)) as sink:
+        sink.write_batch(frames)
+    progress.start_step("sam2_segment", len(frames))
+    with model_registry.acquire("sam2") as sam2:
+        return sam2.predict(
+            clip_path,
+            points=[(width // 2, height // 2)],
+            labels=[1],
+            source_size=(width, height),
+            workdir=workspace,
+            on_frame=lambda _: progress.advance("sam2_segment"),
+            **_tracking_options(plan),
+        )
+
+def _input_hash(ctx: StepContext) -> str:
+    return ctx.video_info.get("content_hash") or file_content_hash(ctx.input_path)
+
+def _checkpoint_fingerprint(input_path: str, plan: EditPlan, video_info: dict) -> str:
+    # Everything that changes the encoded frames; chunks of another run must not be reused.
+    params = {
+        "tool_chain": plan.tool_chain,
+        "model_bundle": plan.model_bundle,
+        "constraints": plan.constraints,
+        "chunk_frames": settings.checkpoint_chunk_frames,
+        "segment_parallel": _use_segment_parallel(plan, video_info),
+        **_encoder_options(plan),
+        **_inpaint_options(plan),
+        **_tracking_options(plan),
+    }
+    input_hash = video_info.get("content_hash") or file_content_hash(input_path)
+    return artifact_key(input_hash, "execute", params, version=CHECKPOINT_VERSION)
+
+def _resume_start(ctx: StepContext) -> int:
+    """
+    First frame the inpaint stage produces when resuming after a checkpoint:
+    the window overlap before the resume point, so the first new window still
+    has temporal context. Unwindowed inpainting sees the whole clip at once and
+    always starts at 0.
+    """
+    resume = ctx.checkpoint.frames_done if ctx.checkpoint is not None else 0
+    options = _inpaint_options(ctx.plan)
+    if not resume or not options["window_size"]:
+        return 0
+    return max(0, resume - options["window_overlap"])
+
+@STEP_REGISTRY.register("ffmpeg_decode", outputs=("frames",), implicit=True)
+def _decode_step(ctx: StepContext, inputs: dict) -> dict:
+    width, height = ctx.video_info["width"], ctx.video_info["height"]
+    decode_key = artifact_key(
+        _input_hash(ctx), "decode", {"width": width, "height": height}, version=STEP_VERSIONS["decode"]
+    )
+    frames = ctx.cache.load_frames("decode", decode_key) if ctx.cache else None
+    if frames is None and _pipeline_queue_frames(ctx.plan) and _inpaint_options(ctx.plan)["window_size"]:
+        # Windowed inpainting only needs one window at a time, so decode lazily
+        # and let the inpaint stage pull frames as they come out of ffmpeg.
+        return {"frames": _stream_decoded_frames(ctx, decode_key)}
+    if frames is None:
+        with FrameSource(ctx.input_path, width=width, height=height) as source:
+            decoded = ctx.progress.track("ffmpeg_decode", source, ctx.video_info.get("nb_frames"))
+            frames = ctx.cache.store_frames(decode_key, decoded) if ctx.cache else [f.copy() for f in decoded]
+    if frames is None or len(frames) == 0:
+        raise RuntimeError(f"No frames decoded from {ctx.input_path}")
+    return {"frames": frames}
+
+def _stream_decoded_frames(ctx: StepContext, decode_key: str):
+    width, height = ctx.video_info["width"], ctx.video_info["height"]
+    with FrameSource(ctx.input_path, width=width, height=height) as source:
+        # FrameSource reuses its buffers; frames queued between stages need their own.
+        decoded = ctx.progress.track("ffmpeg_decode", source, ctx.video_info.get("nb_frames"))
+        frames = (frame.copy() for frame in decoded)
+        yield from ctx.cache.stream_frames(decode_key, frames) if ctx.cache else frames
+
+@STEP_REGISTRY.register("center_point_prompt", outputs=("prompt",), implicit=True)
+def _center_point_prompt_step(ctx: StepContext, inputs: dict) -> dict:
+    # Seeds tracking at the frame centre until a detector step provides prompts.
+    width, height = ctx.video_info["width"], ctx.video_info["height"]
+    return {"prompt": {"points": [(width // 2, height // 2)], "labels": [1]}}
+
+@STEP_REGISTRY.register("sam2_segment", inputs=("prompt",), outputs=("masks",))
+def _sam2_segment_step(ctx: StepContext, inputs: dict) -> dict:
+    points, labels = inputs["prompt"]["points"], inputs["prompt"]["labels"]
+    track_key = artifact_key(
+        _input_hash(ctx),
+        "track",
+        {"points": points, "labels": labels, "fixes": _step_fixes(ctx.plan, "track"), **_tracking_options(ctx.plan)},
+        version=STEP_VERSIONS["track"],
+    )
+    masks = ctx.cache.load_masks("track", track_key) if ctx.cache else None
+    if masks is None:
+        ctx.progress.start_step("sam2_segment", ctx.video_info.get("nb_frames"))
+        with model_registry.acquire("sam2") as sam2:
+            masks = sam2.predict(
+                ctx.input_path,
+                points=points,
+                labels=labels,
+                source_size=(ctx.video_info["width"], ctx.video_info["height"]),
+                workdir=ctx.workspace,
+                on_frame=lambda _: ctx.progress.advance("sam2_segment"),
+                **_tracking_options(ctx.plan),
+            )
+        if ctx.cache:
+            ctx.cache.store_masks(track_key, masks)
+    masks.save(os.path.join(ctx.workspace, MASKS_FILENAME))
+    return {"masks": masks}
+
+@STEP_REGISTRY.register("propainter_inpaint", inputs=("frames", "masks"), outputs=("edited_frames",))
+def _propainter_inpaint_step(ctx: StepContext, inputs: dict) -> dict:
+    frames, masks = inputs["frames"], inputs["masks"]
+    roi = _inpaint_roi(ctx.plan, masks, ctx.video_info["width"], ctx.video_info["height"])
+    if roi is not None:
+        logger.info("Inpainting region of interest %s", roi)
+    start = _resume_start(ctx)
+    if start:
+        frames = islice(frames, start, None) if isinstance(frames, Iterator) else frames[start:]
+        masks = masks[start:]
+
+    def inpaint():
+        with _stage(frames, ctx.plan) as staged, model_registry.acquire("propainter") as propainter:
+            inpainted = propainter.iter_predict(staged, masks, roi=roi, **_inpaint_options(ctx.plan))
+            # Unwindowed inpainting infers the whole clip before its first frame.
+            yield from ctx.progress.track(
+                "propainter_inpaint", inpainted, len(masks), opaque=not _inpaint_options(ctx.plan)["window_size"]
+            )
+
+    return {"edited_frames": inpaint()}
+
+def _smoothing_strength(plan: EditPlan) -> float:
+    # Opt-in: a plan constraint or the setting, else only when QA flagged flicker.
+    if "temporal_smoothing_strength" in plan.constraints:
+        return float(plan.constraints["temporal_smoothing_strength"])
+    if settings.temporal_smoothing_strength > 0:
+        return settings.temporal_smoothing_strength
+    if any(fix.get("fix_point") == "temporal_flicker" for fix in plan.fix_map):
+        return settings.temporal_smoothing_fix_strength
+    return 0.0
+
+def _smooth_masked_region(frames, masks, strength: float, motion_threshold: int | None = None):
+    # Blends each frame's masked pixels with the same pixels of the previous
+    # inpainted frame where they barely changed, which damps flicker in the
+    # inpainted area. Moving pixels are left alone; blending with the previous
+    # output instead would drag a ghost of them along.
+    if motion_threshold is None:
+        motion_threshold = settings.temporal_smoothing_motion_threshold
+    prev = None
+    for i, frame in enumerate(frames):
+        box = masks.bbox(i)
+        current = frame.copy()
+        if prev is not None and box is not None:
+            x0, y0, x1, y1 = box
+            region = frame[y0:y1, x0:x1]
+            before = prev[y0:y1, x0:x1]
+            still = np.abs(region.astype(np.int16) - before).max(axis=-1) <= motion_threshold
+            blend = (masks[i][y0:y1, x0:x1] > 0) & still
+            region[blend] = np.rint(region[blend] * (1.0 - strength) + before[blend] * strength).astype(np.uint8)
+        prev = current
+        yield frame
+
+@STEP_REGISTRY.register("temporal_smoothing", inputs=("edited_frames", "masks"), outputs=("edited_frames",))
+def _temporal_smoothing_step(ctx: StepContext, inputs: dict) -> dict:
+    strength = _smoothing_strength(ctx.plan)
+    if strength <= 0:
+        return {"edited_frames": inputs["edited_frames"]}
+    masks = inputs["masks"][_resume_start(ctx):]
+    return {"edited_frames": _smooth_masked_region(inputs["edited_frames"], masks, strength)}
+
+@STEP_REGISTRY.register("ffmpeg_encode", inputs=("edited_frames",), outputs=("video",), implicit=True)
+def _encode_step(ctx: StepContext, inputs: dict) -> dict:
+    # Copies the source audio into the output.
+    if ctx.checkpoint is not None:
+        return _encode_chunks(ctx, inputs["edited_frames"])
+    with FrameSink(
+        ctx.output_path,
+        width=ctx.video_info["width"],
+        height=ctx.video_info["height"],
+        fps=ctx.video_info["fps"],
+        audio_source=ctx.input_path,
+        **_encoder_options(ctx.plan),
+    ) as sink, _stage(inputs["edited_frames"], ctx.plan) as frames:
+        sink.write_batch(ctx.progress.track("ffmpeg_encode", frames, ctx.video_info.get("nb_frames")))
+    return {"video": ctx.output_path}
+
+def _encode_chunks(ctx: StepContext, edited_frames) -> dict:
+    """
+    Encodes checkpoint_chunk_frames frames per chunk file, committing each to
+    the checkpoint as it closes, then concatenates the chunks with the source
+    audio. Frames before the resume point (inpaint context) are dropped.
+    """
+    checkpoint = ctx.checkpoint
+    resume = checkpoint.frames_done
+    chunk_frames = max(1, settings.checkpoint_chunk_frames)
+    chunks_dir = os.path.join(ctx.workspace, "chunks")
+    os.makedirs(chunks_dir, exist_ok=True)
+    ctx.progress.start_step("ffmpeg_encode", ctx.video_info.get("nb_frames"))
+    if resume:
+        ctx.progress.advance("ffmpeg_encode", resume)
+
+    index = len(checkpoint.chunks)
+    with _stage(edited_frames, ctx.plan) as frames:
+        frames = ctx.progress.track("ffmpeg_encode", islice(frames, resume - _resume_start(ctx), None))
+        while True:
+            chunk = islice(frames, chunk_frames)
+            first = next(chunk, None)
+            if first is None:
+                break
+            path = os.path.join(chunks_dir, f"chunk_{index:05d}.mp4")
+            with FrameSink(
+                path,
+                width=ctx.video_info["width"],
+                height=ctx.video_info["height"],
+                fps=ctx.video_info["fps"],
+                **_encoder_options(ctx.plan),
+            ) as sink:
+                sink.write(first)
+                sink.write_batch(chunk)
+            checkpoint.commit(index, path, sink.frames_written)
+            ctx.progress.set_checkpoint(checkpoint.summary())
+            index += 1
+
+    concat_videos(checkpoint.paths(), ctx.output_path, audio_source=ctx.input_path)
+    return {"video": ctx.output_path}
+
+@STEP_REGISTRY.register("ffmpeg_color_grading", outputs=("video",))
+def _color_grading_step(ctx: StepContext, inputs: dict) -> dict:
+    lut_path = ctx.plan.constraints.get("lut_path")
+    if not lut_path:
+        raise StepSkipped("no lut_path constraint")
+    apply_color_lut(ctx.input_path, lut_path, ctx.output_path)
+    return {"video": ctx.output_path}
+
+def _process_remove_object_segment(task: dict) -> str:
+    """
+    Runs decode -> track -> inpaint -> encode for one keyframe-aligned segment in
+    a pool process. The leading overlap frames only give ProPainter temporal
+    context and are not encoded.
+    """
+    width, height = task["width"], task["height"]
+    with FrameSource(task["clip_path"], width=width, height=height) as source:
+        frames = source.read_all()
+
+    with model_registry.acquire("sam2") as sam2:
+        masks = sam2.predict(
+            task["clip_path"],
+            points=[(width // 2, height // 2)],
+            labels=[1],
+            proxy_short_side=task["proxy_short_side"],
+            source_size=(width, height),
+            workdir=os.path.dirname(task["output_path"]),
+            on_frame=lambda _: check_segment_cancelled(),
+        )
+    count = min(len(frames), len(masks))
+    roi = None
+    if task["roi_inpaint"]:
+        roi = stable_roi(masks[:count], width, height, pad_ratio=settings.roi_pad_ratio)
+    lead = task["lead_frames"]
+    with model_registry.acquire("propainter") as propainter, FrameSink(
+        task["output_path"],
+        width=width,
+        height=height,
+        fps=task["fps"],
+        preset=task["preset"],
+        crf=task["crf"],
+        keyframe_seconds=task["keyframe_seconds"],
+    ) as sink:
+        inpainted = propainter.iter_predict(
+            frames[:count],
+            masks[:count],
+            window_size=task["window_size"],
+            window_overlap=task["window_overlap"],
+            roi=roi,
+        )
+        sink.write_batch(islice(segment_cancellable(inpainted), lead, lead + task["own_frames"]))
+    return task["output_path"]
@@ -19,6 +19,8 @@ BUNDLES = [
         "estimated_time_minutes": 10,
         "download_size_gb": 18.0,
         "quality_tier": "high",
+        "tracking_short_side": 0,
+        "runners": ["sam2", "propainter"],
         "enabled_modules": [
             "full_qa",
             "temporal_constraints",
@@ -31,6 +33,8 @@ BUNDLES = [
         "estimated_time_minutes": 14,
         "download_size_gb": 9.5,
         "quality_tier": "balanced",
+        "tracking_short_side": 720,
+        "runners": ["sam2", "propainter"],
         "enabled_modules": [
             "core_qa",
             "reduced_batch_generation",
@@ -42,11 +46,29 @@ BUNDLES = [
         "estimated_time_minutes": 25,
         "download_size_gb": 1.2,
         "quality_tier": "lite",
+        "tracking_short_side": 480,
+        "runners": [],
         "enabled_modules": ["workflow_debug", "basic_tools_only"],
     },
 ]
 
 
+def tracking_short_side_for_bundle(bundle_name: str) -> int:
+    """Proxy short side for SAM2 tracking with this bundle; 0 tracks at full resolution."""
+    for bundle in BUNDLES:
+        if bundle["name"] == bundle_name:
+            return int(bundle["tracking_short_side"])
+    return 0
+
+
+def bundle_runners(bundle_name: str) -> list[str]:
+    """Local runners (ModelRegistry names) a bundle provides."""
+    for bundle in BUNDLES:
+        if bundle["name"] == bundle_name:
+            return list(bundle["runners"])
+    return []
+
+
 def get_runtime_mode() -> str:
     mode = (settings.model_runtime_mode or "").strip().lower()
     return "local" if mode == "local" else "api"
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import psutil
+
+from video_platform.runners.base import BaseRunner
+
+logger = logging.getLogger(__name__)
+
+
+def _memory_in_use(device: str) -> int:
+    if device.startswith("cuda"):
+        import torch
+
+        if torch.cuda.is_available():
+            return int(torch.cuda.memory_allocated())
+    return int(psutil.Process().memory_info().rss)
+
+
+@dataclass
+class _ModelSpec:
+    factory: Callable[[], BaseRunner]
+    model_dir: str
+    footprint_bytes: int = 0
+    warmup: Callable[[BaseRunner], None] | None = None
+    load_seconds: float | None = None
+    warmup_seconds: float | None = None
+    loads: int = 0
+    hits: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class _Resident:
+    runner: BaseRunner
+    footprint_bytes: int
+    refs: int = 0
+    last_used: float = 0.0
+
+
+class ModelRegistry:
+    """
+    Keeps loaded runners resident across calls within a memory budget. Runners
+    are checked out with acquire(); while any caller holds one it cannot be
+    evicted. When a load would exceed the budget, idle runners are unloaded in
+    least-recently-used order. A budget of 0 never evicts. Loads run outside
+    the registry lock, so a slow load only holds up callers of that model.
+    Runners are not thread-safe: acquire() lends a runner to one caller at a
+    time, and other callers wait with it pinned resident.
+    """
+
+    def __init__(self, budget_bytes: int = 0, device: str = "cuda"):
+        self.budget_bytes = budget_bytes
+        self.device = device
+        self._specs: dict[str, _ModelSpec] = {}
+        self._resident: dict[str, _Resident] = {}
+        # Set when the load in progress for a name finishes, successfully or not.
+        self._loading: dict[str, threading.Event] = {}
+        # A semaphore rather than a lock: a runner lent to a lazy stage may be
+        # handed back from whichever thread ends up closing that stage.
+        self._in_use: dict[str, threading.Semaphore] = {}
+        self._lock = threading.RLock()
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[[], BaseRunner],
+        model_dir: str,
+        footprint_bytes: int = 0,
+        warmup: Callable[[BaseRunner], None] | None = None,
+    ) -> None:
+        """
+        footprint_bytes is an estimate used before the first load measures the
+        real footprint. warmup runs a small synthetic input through a loaded runner.
+        """
+        self._specs[name] = _ModelSpec(
+            factory=factory, model_dir=model_dir, footprint_bytes=footprint_bytes, warmup=warmup
+        )
+        self._in_use.setdefault(name, threading.Semaphore(1))
+
+    def footprint_bytes(self, names: list[str]) -> int:
+        """Measured (or else estimated) footprint of the named models; 0 where unknown."""
+        with self._lock:
+            return sum(self._specs[name].footprint_bytes for name in names if name in self._specs)
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.footprint_bytes for entry in self._resident.values())
+
+    def _evict_for(self, needed_bytes: int, keep: str) -> None:
+        if self.budget_bytes <= 0:
+            return
+        idle = sorted(
+            (entry.last_used, name) for name, entry in self._resident.items() if entry.refs == 0 and name != keep
+        )
+        for _, name in idle:
+            if self.resident_bytes() + needed_bytes <= self.budget_bytes:
+                return
+            self.evict(name)
+        if self.resident_bytes() + needed_bytes > self.budget_bytes:
+            logger.warning(
+                "Model memory budget exceeded: %s resident + %s needed > %s (in-use models cannot be evicted)",
+                self.resident_bytes(),
+                needed_bytes,
+                self.budget_bytes,
+            )
+
+    def _load(self, name: str) -> BaseRunner:
+        # Called without the lock by the one caller that claimed the name's load.
+        spec = self._specs[name]
+        with self._lock:
+            self._evict_for(spec.footprint_bytes, keep=name)
+        # Another load running at the same time can inflate the measured footprint.
+        before = _memory_in_use(self.device)
+        started = time.perf_counter()
+        runner = spec.factory()
+        runner.load(spec.model_dir, device=self.device)
+        load_seconds = round(time.perf_counter() - started, 3)
+        measured = max(0, _memory_in_use(self.device) - before)
+        with self._lock:
+            spec.load_seconds = load_seconds
+            spec.footprint_bytes = measured or spec.footprint_bytes
+            spec.loads += 1
+            self._resident[name] = _Resident(
+                runner=runner, footprint_bytes=spec.footprint_bytes, refs=1, last_used=time.monotonic()
+            )
+            logger.info(
+                "Loaded model %s on %s in %.2fs (%s bytes)", name, self.device, load_seconds, spec.footprint_bytes
+            )
+            # The measured footprint may be larger than the estimate we made room for.
+            self._evict_for(0, keep=name)
+        return runner
+
+    def checkout(self, name: str) -> BaseRunner:
+        if name not in self._specs:
+            raise KeyError(f"unknown model: {name}")
+        while True:
+            with self._lock:
+                entry = self._resident.get(name)
+                if entry is not None:
+                    self._specs[name].hits += 1
+                    entry.refs += 1
+                    entry.last_used = time.monotonic()
+                    return entry.runner
+                loading = self._loading.get(name)
+                if loading is None:
+                    loading = self._loading[name] = threading.Event()
+                    break
+            # Another caller is loading this model; take its runner when it is done.
+            loading.wait()
+        try:
+            return self._load(name)
+        finally:
+            with self._lock:
+                del self._loading[name]
+            loading.set()
+
+    def release(self, name: str) -> None:
+        with self._lock:
+            entry = self._resident.get(name)
+            if entry is not None and entry.refs > 0:
+                entry.refs -= 1
+                entry.last_used = time.monotonic()
+
+    @contextmanager
+    def acquire(self, name: str) -> Iterator[BaseRunner]:
+        runner = self.checkout(name)
+        try:
+            with self._in_use[name]:
+                yield runner
+        finally:
+            self.release(name)
+
+    def warmup(self, names: list[str]) -> dict[str, dict[str, float | None]]:
+        """Loads each runner and runs its warmup input once; returns load/warmup seconds per model."""
+        timings: dict[str, dict[str, float | None]] = {}
+        for name in names:
+            spec = self._specs[name]
+            with self.acquire(name) as runner:
+                if spec.warmup is not None:
+                    started = time.perf_counter()
+                    spec.warmup(runner)
+                    spec.warmup_seconds = round(time.perf_counter() - started, 3)
+            timings[name] = {"load_seconds": spec.load_seconds, "warmup_seconds": spec.warmup_seconds}
+            logger.info("Warmed up model %s: %s", name, timings[name])
+        return timings
+
+    def evict(self, name: str) -> bool:
+        with self._lock:
+            entry = self._resident.get(name)
+            if entry is None or entry.refs > 0:
+                return False
+            del self._resident[name]
+            self._specs[name].evictions += 1
+        entry.runner.unload()
+        logger.info("Evicted model %s (%s bytes)", name, entry.footprint_bytes)
+        return True
+
+    def clear(self) -> None:
+        for name in list(self._resident):
+            self.evict(name)
+
+    def stats(self) -> dict:
+        with self._lock:
+            models = {}
+            for name, spec in self._specs.items():
+                entry = self._resident.get(name)
+                models[name] = {
+                    "resident": entry is not None,
+                    "refs": entry.refs if entry else 0,
+                    "footprint_bytes": spec.footprint_bytes,
+                    "loads": spec.loads,
+                    "hits": spec.hits,
+                    "evictions": spec.evictions,
+                    "load_seconds": spec.load_seconds,
+                    "warmup_seconds": spec.warmup_seconds,
+                }
+            return {
+                "device": self.device,
+                "budget_bytes": self.budget_bytes,
+                "resident_bytes": self.resident_bytes(),
+                "models": models,
+            }
+
+
+def default_device(configured: str) -> str:
+    if configured != "auto":
+        return configured
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
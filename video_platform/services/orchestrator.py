@@ -13,12 +13,13 @@ from video_platform.services.repository import (
     create_case_record,
     create_qa_report,
     get_job,
+    job_video_metadata,
     log_job_event,
     log_safety_event,
     set_job_status,
     update_job_iteration,
 )
-from video_platform.worker.temporal_client import get_client
+from video_platform.worker.temporal_client import get_shared_client
 
 
 def _notify_callback(job, final_status: str, qa_report: dict | None = None):
@@ -48,52 +49,63 @@ def _notify_callback(job, final_status: str, qa_report: dict | None = None):
         )
 
 
-async def start_orchestration(job_id: str) -> None:
-    client = await get_client()
-    if client is not None:
-        try:
-            from video_platform.worker.contracts import WorkflowInput
-            from video_platform.worker.workflows import VideoEditWorkflow
+async def _start_workflow(client, job_id: str) -> bool:
+    """Starts the job's VideoEditWorkflow; False (with the error logged) if Temporal refused it."""
+    try:
+        from video_platform.worker.contracts import WorkflowInput
+        from video_platform.worker.workflows import VideoEditWorkflow
 
-            await client.start_workflow(
-                VideoEditWorkflow.run,
-                WorkflowInput(job_id=job_id),
-                id=f"video-edit-{job_id}",
-                task_queue=settings.temporal_task_queue,
+        await client.start_workflow(
+            VideoEditWorkflow.run,
+            WorkflowInput(
+                job_id=job_id,
+                local_activities=settings.workflow_local_activities,
+                speculative_planning=settings.workflow_speculative_planning,
+                plan_variants=settings.plan_variants,
+            ),
+            id=f"video-edit-{job_id}",
+            task_queue=settings.temporal_task_queue,
+        )
+        with db_session() as session:
+            log_job_event(
+                session=session,
+                job_id=job_id,
+                stage="workflow_started",
+                message="Temporal workflow started",
+                payload={
+                    "task_queue": settings.temporal_task_queue,
+                    "local_activities": settings.workflow_local_activities,
+                    "speculative_planning": settings.workflow_speculative_planning,
+                    "plan_variants": settings.plan_variants,
+                },
             )
-            with db_session() as session:
-                log_job_event(
-                    session=session,
-                    job_id=job_id,
-                    stage="workflow_started",
-                    message="Temporal workflow started",
-                    payload={"task_queue": settings.temporal_task_queue},
-                )
-            return
-        except Exception as exc:
-            with db_session() as session:
-                log_job_event(
-                    session=session,
-                    job_id=job_id,
-                    stage="workflow_start_error",
-                    message="Failed to start Temporal workflow",
-                    payload={"error": str(exc)},
-                    level="error",
-                )
-
-    if settings.enable_fallback_orchestrator:
-        asyncio.create_task(run_fallback(job_id))
+        return True
+    except Exception as exc:
         with db_session() as session:
             log_job_event(
                 session=session,
                 job_id=job_id,
-                stage="fallback_started",
-                message="Temporal unavailable, fallback orchestrator started",
-                payload={},
-                level="warning",
+                stage="workflow_start_error",
+                message="Failed to start Temporal workflow",
+                payload={"error": str(exc)},
+                level="error",
             )
-        return
+        return False
+
 
+def _log_fallback_started(job_id: str) -> None:
+    with db_session() as session:
+        log_job_event(
+            session=session,
+            job_id=job_id,
+            stage="fallback_started",
+            message="Temporal unavailable, fallback orchestrator started",
+            payload={},
+            level="warning",
+        )
+
+
+def _fail_unstarted(job_id: str) -> None:
     with db_session() as session:
         set_job_status(session, job_id, JobStatus.failed, enforce=False)
         log_job_event(
@@ -104,9 +116,119 @@ async def start_orchestration(job_id: str) -> None:
             payload={},
             level="error",
         )
+
+
+async def start_orchestration(job_id: str) -> None:
+    client = await get_shared_client()
+    if client is not None and await _start_workflow(client, job_id):
+        return
+
+    if settings.enable_fallback_orchestrator:
+        asyncio.create_task(run_fallback(job_id))
+        _log_fallback_started(job_id)
+        return
+
+    _fail_unstarted(job_id)
     raise RuntimeError("unable to start workflow")
 
 
+def batch_workflow_id(batch_id: str) -> str:
+    return f"video-edit-batch-{batch_id}"
+
+
+async def _run_fallback_batch(job_ids: list[str], parallelism: int) -> None:
+    slots = asyncio.Semaphore(max(1, parallelism))
+
+    async def run(job_id: str) -> None:
+        async with slots:
+            await run_fallback(job_id)
+
+    # One job's failure does not stop the others.
+    await asyncio.gather(*(run(job_id) for job_id in job_ids), return_exceptions=True)
+
+
+async def start_batch_orchestration(batch_id: str, job_ids: list[str], parallelism: int) -> None:
+    """
+    Starts one BatchVideoEditWorkflow for all job_ids. If that fails, each job
+    gets its own workflow, and jobs Temporal cannot take run through the
+    fallback orchestrator, at most parallelism at a time. With the fallback
+    disabled those jobs are failed and RuntimeError is raised once all of the
+    batch has been handled.
+    """
+    client = await get_shared_client()
+    if client is not None:
+        try:
+            from video_platform.worker.contracts import BatchWorkflowInput
+            from video_platform.worker.workflows import BatchVideoEditWorkflow
+
+            await client.start_workflow(
+                BatchVideoEditWorkflow.run,
+                BatchWorkflowInput(
+                    batch_id=batch_id,
+                    job_ids=job_ids,
+                    parallelism=parallelism,
+                    local_activities=settings.workflow_local_activities,
+                    speculative_planning=settings.workflow_speculative_planning,
+                    plan_variants=settings.plan_variants,
+                ),
+                id=batch_workflow_id(batch_id),
+                task_queue=settings.temporal_task_queue,
+            )
+            with db_session() as session:
+                for job_id in job_ids:
+                    log_job_event(
+                        session=session,
+                        job_id=job_id,
+                        stage="workflow_started",
+                        message="Temporal workflow started as part of a batch",
+                        payload={
+                            "task_queue": settings.temporal_task_queue,
+                            "batch_id": batch_id,
+                            "parallelism": parallelism,
+                        },
+                    )
+            return
+        except Exception as exc:
+            with db_session() as session:
+                for job_id in job_ids:
+                    log_job_event(
+                        session=session,
+                        job_id=job_id,
+                        stage="workflow_start_error",
+                        message="Failed to start Temporal batch workflow",
+                        payload={"error": str(exc), "batch_id": batch_id},
+                        level="error",
+                    )
+
+    unstarted = [job_id for job_id in job_ids if client is None or not await _start_workflow(client, job_id)]
+    if not unstarted:
+        return
+
+    if settings.enable_fallback_orchestrator:
+        asyncio.create_task(_run_fallback_batch(unstarted, parallelism))
+        for job_id in unstarted:
+            _log_fallback_started(job_id)
+        return
+
+    for job_id in unstarted:
+        _fail_unstarted(job_id)
+    raise RuntimeError(f"unable to start workflows for {len(unstarted)} of {len(job_ids)} jobs")
+
+
+async def get_batch_progress(batch_id: str) -> dict | None:
+    """Progress reported by the batch workflow's query, or None without Temporal."""
+    client = await get_shared_client()
+    if client is None:
+        return None
+    from dataclasses import asdict
+
+    from video_platform.worker.workflows import BatchVideoEditWorkflow
+
+    handle = client.get_workflow_handle(batch_workflow_id(batch_id))
+    progress = await handle.query(BatchVideoEditWorkflow.progress)
+    return asdict(progress)
+
+
 async def run_fallback(job_id: str) -> dict:
     with db_session() as session:
         job = get_job(session, job_id)
@@ -182,34 +304,69 @@ async def run_fallback(job_id: str) -> dict:
                 model_bundle=model_bundle,
                 prior_issues=prior_issues,
                 forced=forced,
+                video_metadata=job_video_metadata(job),
+                base_output_uri=latest_output_uri,
             )
 
             set_job_status(session, job_id, JobStatus.editing)
-            run = executor.execute_plan(
-                job_id=job_id,
-                iteration=iteration,
-                input_uri=job.input_uri,
-                instruction=job.instruction,
-                plan=EditPlan.model_validate(plan.model_dump()),
+            input_uri, instruction = job.input_uri, job.instruction
+
+        # No session is held while the variants render. They may run side by side;
+        # the model registry hands each runner to one of them at a time.
+        variants = planner.generate_plan_variants(plan, settings.plan_variants)
+        runs = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    executor.execute_plan,
+                    job_id=job_id,
+                    iteration=iteration,
+                    input_uri=input_uri,
+                    instruction=instruction,
+                    plan=EditPlan.model_validate(variant.model_dump()),
+                    variant=index if len(variants) > 1 else None,
+                )
+                for index, variant in enumerate(variants)
             )
+        )
+
+        with db_session() as session:
+            job = get_job(session, job_id)
+            if job is None:
+                raise ValueError(f"job {job_id} not found")
+            reports = [
+                qa.evaluate(
+                    qa.QAContext(
+                        instruction=job.instruction,
+                        iteration=iteration,
+                        capability=variant.capability.value,
+                        output_uri=run["output_uri"],
+                        video_metadata=job_video_metadata(job),
+                        mask_signals=run["execution_log"].get("mask_signals"),
+                        mask_path=run["execution_log"].get("mask_path"),
+                    )
+                )
+                for variant, run in zip(variants, runs)
+            ]
+            best, summary = qa.compare_variants(
+                reports,
+                [variant.constraints.get("variant_strategy", "baseline") for variant in variants],
+                [run["output_uri"] for run in runs],
+            )
+            plan, run, report = variants[best], runs[best], reports[best]
+            execution_log = dict(run["execution_log"])
+            if len(variants) > 1:
+                execution_log["variants"] = summary
+
             update_job_iteration(
                 session=session,
                 job_id=job_id,
                 iteration=iteration,
                 edit_plan=plan.model_dump(),
-                execution_log=run["execution_log"],
+                execution_log=execution_log,
                 output_uri=run["output_uri"],
             )
             set_job_status(session, job_id, JobStatus.qa)
 
-            report = qa.evaluate(
-                qa.QAContext(
-                    instruction=job.instruction,
-                    iteration=iteration,
-                    capability=plan.capability.value,
-                    output_uri=run["output_uri"],
-                )
-            )
             report_payload = report.model_dump()
             create_qa_report(session, job_id=job_id, iteration=iteration, report=report_payload)
 
@@ -6,6 +6,17 @@ from video_platform.config import settings
 from video_platform.core.enums import Capability
 from video_platform.core.schemas import EditPlan
 from video_platform.services.capabilities import CAPABILITY_HINTS, CAPABILITY_TOOLCHAIN
+from video_platform.services.model_manager import tracking_short_side_for_bundle
+from video_platform.utils.time import parse_timeline
+
+# Alternatives tried next to the baseline plan when an iteration runs several
+# variants. Each overrides plan constraints the executor reads.
+VARIANT_STRATEGIES: list[tuple[str, dict]] = [
+    ("full_resolution_tracking", {"tracking_short_side": 0}),
+    ("strong_smoothing", {"temporal_smoothing_strength": 0.45}),
+    ("wide_inpaint_window", {"inpaint_window_size": 120, "inpaint_window_overlap": 16}),
+    ("full_frame_inpaint", {"roi_inpaint": False}),
+]
 
 
 def detect_capability(instruction: str, forced: Capability | None = None) -> Capability:
@@ -49,12 +60,62 @@ def build_fix_map(prior_issues: list[dict]) -> list[dict[str, str]]:
     return fix_map
 
 
+def build_reedit_ranges(prior_issues: list[dict], padding_seconds: float) -> list[list[float]] | None:
+    """
+    Sorted [start, end] seconds of the issues' timelines, merged where their
+    padded context would overlap. None if any issue has no timeline.
+    """
+    ranges = []
+    for issue in prior_issues:
+        timeline = issue.get("timeline")
+        if not timeline:
+            return None
+        start, end = parse_timeline(timeline)
+        ranges.append([start, max(start, end)])
+
+    merged: list[list[float]] = []
+    for start, end in sorted(ranges):
+        if merged and start - merged[-1][1] <= 2 * padding_seconds:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _reedit_constraint(
+    capability: Capability,
+    prior_issues: list[dict],
+    base_output_uri: str | None,
+    video_metadata: dict | None,
+) -> dict | None:
+    # Only the remove_object pipeline can splice re-edited ranges so far.
+    duration = (video_metadata or {}).get("duration")
+    if not settings.enable_scoped_reedit or capability != Capability.remove_object:
+        return None
+    if not prior_issues or not base_output_uri or not duration:
+        return None
+    padding = settings.reedit_padding_seconds
+    ranges = build_reedit_ranges(prior_issues, padding)
+    if not ranges:
+        return None
+    covered = sum(min(duration, end + padding) - max(0.0, start - padding) for start, end in ranges)
+    if covered > settings.reedit_max_fraction * duration:
+        return None
+    return {"base_output_uri": base_output_uri, "ranges": ranges, "padding_seconds": padding}
+
+
 def generate_plan(
     instruction: str,
     model_bundle: str,
     prior_issues: list[dict] | None = None,
     forced: Capability | None = None,
+    video_metadata: dict | None = None,
+    base_output_uri: str | None = None,
 ) -> EditPlan:
+    """
+    With prior_issues that flag timeline ranges and the previous iteration's
+    base_output_uri, the plan re-edits only those ranges (constraints["reedit"]).
+    """
     capability = detect_capability(instruction=instruction, forced=forced)
     fix_map = build_fix_map(prior_issues or [])
 
@@ -63,7 +124,14 @@ def generate_plan(
         "max_duration_seconds": 30,
         "quality_priority": True,
         "strict_safety": True,
+        # Lower tracks faster on a downscaled proxy at some cost in mask accuracy.
+        "tracking_short_side": settings.tracking_proxy_short_side or tracking_short_side_for_bundle(model_bundle),
     }
+    if video_metadata:
+        constraints["source_video"] = dict(video_metadata)
+    reedit = _reedit_constraint(capability, prior_issues or [], base_output_uri, video_metadata)
+    if reedit:
+        constraints["reedit"] = reedit
 
     return EditPlan(
         capability=capability,
@@ -75,5 +143,14 @@ def generate_plan(
     )
 
 
+def generate_plan_variants(plan: EditPlan, count: int) -> list[EditPlan]:
+    """The plan itself followed by up to count - 1 alternatives from VARIANT_STRATEGIES."""
+    variants = [plan]
+    for name, overrides in VARIANT_STRATEGIES[: max(0, count - 1)]:
+        constraints = {**plan.constraints, **overrides, "variant_strategy": name}
+        variants.append(plan.model_copy(update={"constraints": constraints}, deep=True))
+    return variants
+
+
 def plan_as_dict(plan: EditPlan) -> dict:
     return asdict(plan) if hasattr(plan, "__dataclass_fields__") else plan.model_dump()
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any, Callable
+
+from video_platform.runners.cancellation import CancelToken
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """
+    Frame-level progress of one execution. Steps report frames as they go;
+    while used as a context manager, a monitor thread periodically passes a
+    snapshot to heartbeat and (less often) to on_event, and polls is_cancelled
+    to cancel the token, which kills attached ffmpeg processes and makes the
+    next advance() raise Cancelled.
+
+    Heartbeats stop once no frame has been reported for stall_seconds, so a hung
+    execution misses its heartbeat timeout instead of running to the activity's
+    start-to-close timeout. Steps started as opaque report no frames while they
+    work (e.g. whole-clip inference); heartbeats continue while one is running.
+    """
+
+    def __init__(
+        self,
+        heartbeat: Callable[[dict], None] | None = None,
+        on_event: Callable[[dict], None] | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+        *,
+        heartbeat_seconds: float = 5.0,
+        event_seconds: float = 30.0,
+        stall_seconds: float = 300.0,
+    ):
+        self.token = CancelToken()
+        self._heartbeat = heartbeat
+        self._on_event = on_event
+        self._is_cancelled = is_cancelled
+        self.heartbeat_seconds = heartbeat_seconds
+        self.event_seconds = event_seconds
+        self.stall_seconds = stall_seconds
+        self._lock = threading.Lock()
+        self._steps: dict[str, dict[str, Any]] = {}
+        self._current: str | None = None
+        self._checkpoint: dict[str, Any] | None = None
+        self._started = time.monotonic()
+        self._last_progress = self._started
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start_step(self, step: str, total: int | None = None, *, opaque: bool = False) -> None:
+        with self._lock:
+            entry = self._steps.setdefault(step, {"frames": 0, "total": None, "started": time.monotonic()})
+            if total:
+                entry["total"] = int(total)
+            entry["opaque"] = opaque
+            self._current = step
+            self._last_progress = time.monotonic()
+
+    def finish_step(self, step: str) -> None:
+        with self._lock:
+            entry = self._steps.get(step)
+            if entry is not None:
+                entry["opaque"] = False
+            self._last_progress = time.monotonic()
+
+    def advance(self, step: str, frames: int = 1) -> None:
+        self.token.check()
+        with self._lock:
+            entry = self._steps.get(step)
+            if entry is None:
+                entry = self._steps[step] = {"frames": 0, "total": None, "started": time.monotonic()}
+            entry["frames"] += frames
+            self._last_progress = time.monotonic()
+
+    def track(self, step: str, items: Iterable, total: int | None = None, *, opaque: bool = False) -> Iterator:
+        """Yields items, counting one frame of step for each."""
+        self.start_step(step, total, opaque=opaque)
+        try:
+            for item in items:
+                self.advance(step)
+                yield item
+        finally:
+            self.finish_step(step)
+
+    def set_checkpoint(self, summary: dict[str, Any]) -> None:
+        """Included in snapshots (and so in heartbeat details) from now on."""
+        with self._lock:
+            self._checkpoint = dict(summary)
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            steps = {name: {"frames": e["frames"], "total": e["total"]} for name, e in self._steps.items()}
+            snap: dict[str, Any] = {
+                "step": self._current,
+                "elapsed_seconds": round(now - self._started, 1),
+                "steps": steps,
+            }
+            if self._checkpoint is not None:
+                snap["checkpoint"] = self._checkpoint
+            entry = self._steps.get(self._current) if self._current else None
+            if entry is not None:
+                snap["frames_done"] = entry["frames"]
+                snap["frames_total"] = entry["total"]
+                if entry["total"] and entry["frames"]:
+                    rate = entry["frames"] / max(now - entry["started"], 1e-6)
+                    snap["eta_seconds"] = round(max(entry["total"] - entry["frames"], 0) / rate, 1)
+        return snap
+
+    def _stalled(self, now: float) -> bool:
+        with self._lock:
+            if any(entry.get("opaque") for entry in self._steps.values()):
+                return False
+            return now - self._last_progress >= self.stall_seconds
+
+    def _monitor(self) -> None:
+        last_event = time.monotonic()
+        while not self._stop.wait(self.heartbeat_seconds):
+            if self._is_cancelled is not None and not self.token.cancelled and self._is_cancelled():
+                logger.info("Cancellation requested; stopping execution")
+                self.token.cancel()
+            snap = self.snapshot()
+            now = time.monotonic()
+            if self._heartbeat is not None and not self._stalled(now):
+                self._heartbeat(snap)
+            if self._on_event is not None and now - last_event >= self.event_seconds:
+                last_event = now
+                try:
+                    self._on_event(snap)
+                except Exception as exc:
+                    logger.warning("Could not record progress: %s", exc)
+
+    def __enter__(self) -> "ProgressReporter":
+        # The monitor runs in a copy of this context so activity helpers
+        # (heartbeat, is_cancelled) resolve the caller's activity.
+        ctx = contextvars.copy_context()
+        self._thread = threading.Thread(target=ctx.run, args=(self._monitor,), name="progress", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
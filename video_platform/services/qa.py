@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from hashlib import sha256
 
 from video_platform.config import settings
 from video_platform.core.schemas import QAReport
+from video_platform.runners.masks import MaskSequence
+from video_platform.utils.time import format_timecode, parse_timeline
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -13,6 +18,12 @@ class QAContext:
     iteration: int
     capability: str
     output_uri: str
+    video_metadata: dict | None = None
+    # From the execution log. QA may run on another host than the executor, so
+    # mask_signals (computed where the masks were written) are preferred; the
+    # mask file is only read when they are missing.
+    mask_signals: dict | None = None
+    mask_path: str | None = None
 
 
 def _base_scores(iteration: int) -> dict[str, float]:
@@ -27,6 +38,48 @@ def _base_scores(iteration: int) -> dict[str, float]:
     }
 
 
+def _clamp_timeline(timeline: str, duration: float | None) -> str:
+    if not duration:
+        return timeline
+    start, end = parse_timeline(timeline)
+    end = min(end, duration)
+    start = min(start, end)
+    precision = 3 if "." in timeline else 0
+    return f"{format_timecode(start, precision)}-{format_timecode(end, precision)}"
+
+
+def _tracking_dropouts(masks: MaskSequence) -> list[tuple[int, int]]:
+    """[start, end) frame ranges with an empty mask between the first and last tracked frames."""
+    tracked = [i for i in range(len(masks)) if masks.bbox(i) is not None]
+    if not tracked:
+        return []
+    ranges: list[tuple[int, int]] = []
+    start = None
+    for i in range(tracked[0], tracked[-1] + 1):
+        if masks.bbox(i) is None:
+            if start is None:
+                start = i
+        elif start is not None:
+            ranges.append((start, i))
+            start = None
+    return ranges
+
+
+def mask_signals(masks: MaskSequence) -> dict:
+    """What evaluate() needs from an execution's masks, small enough for the execution log."""
+    return {"frames": len(masks), "dropouts": [list(r) for r in _tracking_dropouts(masks)]}
+
+
+def _local_mask_signals(mask_path: str | None) -> dict | None:
+    if not mask_path:
+        return None
+    try:
+        return mask_signals(MaskSequence.load(mask_path))
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Masks at %s are not readable here; skipping mask QA: %s", mask_path, exc)
+        return None
+
+
 def evaluate(context: QAContext) -> QAReport:
     scores = _base_scores(context.iteration)
 
@@ -56,6 +109,30 @@ def evaluate(context: QAContext) -> QAReport:
         )
         recommendations.append("Tighten edit mask scope and object consistency constraints")
 
+    signals = context.mask_signals or _local_mask_signals(context.mask_path)
+    if signals and signals["frames"]:
+        dropouts = signals["dropouts"]
+        if dropouts:
+            fps = (context.video_metadata or {}).get("fps") or 30.0
+            frames = signals["frames"]
+            dropped = sum(end - start for start, end in dropouts)
+            scores["edit_region_accuracy"] = round(scores["edit_region_accuracy"] - 0.2 * dropped / frames, 4)
+            start, end = dropouts[0][0], dropouts[-1][1]
+            issues.append(
+                {
+                    "code": "tracking_dropout",
+                    "severity": "medium",
+                    "description": f"Tracked object lost in {dropped} of {frames} frames",
+                    # Dropouts are often a few frames long; whole seconds would round them away.
+                    "timeline": f"{format_timecode(start / fps, 3)}-{format_timecode(end / fps, 3)}",
+                }
+            )
+            recommendations.append("Re-seed tracking where the object mask drops out")
+
+    duration = (context.video_metadata or {}).get("duration")
+    for issue in issues:
+        issue["timeline"] = _clamp_timeline(issue["timeline"], duration)
+
     overall = round(sum(scores.values()) / len(scores), 4)
 
     if scores["safety_compliance"] < 0.9:
@@ -76,6 +153,28 @@ def should_pass(report: QAReport) -> bool:
     return report.overall_score >= settings.qa_threshold and len(report.hard_fail_flags) == 0
 
 
+def compare_variants(
+    reports: list[QAReport], strategies: list[str], output_uris: list[str]
+) -> tuple[int, list[dict]]:
+    """
+    Index of the variant to keep (passing first, then highest overall score;
+    ties go to the earlier variant) and a per-variant summary for the log.
+    """
+    best = max(range(len(reports)), key=lambda i: (should_pass(reports[i]), reports[i].overall_score, -i))
+    summary = [
+        {
+            "variant": index,
+            "strategy": strategy,
+            "output_uri": output_uri,
+            "overall_score": report.overall_score,
+            "passed": should_pass(report),
+            "selected": index == best,
+        }
+        for index, (report, strategy, output_uri) in enumerate(zip(reports, strategies, output_uris))
+    ]
+    return best, summary
+
+
 def _stable_sample(job_id: str, ratio: float) -> bool:
     bounded = max(0.0, min(1.0, ratio))
     if bounded <= 0:
@@ -80,6 +80,34 @@ def list_jobs(session, limit: int = 50) -> list[Job]:
     return session.execute(select(Job).order_by(Job.created_at.desc()).limit(limit)).scalars().all()
 
 
+def set_job_video_metadata(session, job: Job, metadata: dict) -> Job:
+    job.input_content_hash = metadata.get("content_hash")
+    job.video_width = metadata.get("width")
+    job.video_height = metadata.get("height")
+    job.video_fps = metadata.get("fps")
+    job.video_duration = metadata.get("duration")
+    job.video_frame_count = metadata.get("nb_frames")
+    job.video_codec = metadata.get("video_codec")
+    job.audio_codec = metadata.get("audio_codec")
+    session.flush()
+    return job
+
+
+def job_video_metadata(job: Job) -> dict | None:
+    if job.video_width is None or job.video_height is None:
+        return None
+    return {
+        "width": job.video_width,
+        "height": job.video_height,
+        "fps": job.video_fps or 0.0,
+        "duration": job.video_duration or 0.0,
+        "nb_frames": job.video_frame_count or 0,
+        "video_codec": job.video_codec,
+        "audio_codec": job.audio_codec,
+        "content_hash": job.input_content_hash,
+    }
+
+
 def set_job_status(session, job_id: str, status: JobStatus, *, enforce: bool = True) -> Job:
     job = session.get(Job, job_id)
     if job is None:
@@ -162,6 +190,19 @@ def create_qa_report(session, job_id: str, iteration: int, report: dict) -> QARe
     return qa
 
 
+def get_job_iteration(session, job_id: str, iteration: int) -> JobIteration | None:
+    return (
+        session.execute(
+            select(JobIteration)
+            .where(JobIteration.job_id == job_id, JobIteration.iteration == iteration)
+            .order_by(JobIteration.created_at.desc())
+            .limit(1)
+        )
+        .scalars()
+        .first()
+    )
+
+
 def latest_qa_report(session, job_id: str) -> QAReport | None:
     return (
         session.execute(
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+from bisect import bisect_right
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+from video_platform.runners.cancellation import Cancelled, check_cancelled
+from video_platform.runners.ffmpeg_utils import concat_videos, cut_clip, list_keyframes
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the parent's cancel token while segments run.
+CANCEL_POLL_SECONDS = 0.5
+
+# Set in pool processes by run_segmented; the parent sets it when the execution is cancelled.
+_cancel_event = None
+
+
+def _init_pool_process(cancel_event) -> None:
+    global _cancel_event
+    _cancel_event = cancel_event
+
+
+def check_segment_cancelled() -> None:
+    """Raises Cancelled in a segment pool process once the parent execution was cancelled."""
+    if _cancel_event is not None and _cancel_event.is_set():
+        raise Cancelled("segment cancelled")
+
+
+def segment_cancellable(items: Iterable) -> Iterator:
+    """Yields items, calling check_segment_cancelled() before each."""
+    for item in items:
+        check_segment_cancelled()
+        yield item
+
+
+@dataclass(frozen=True)
+class Segment:
+    index: int
+    start: float
+    end: float
+    clip_start: float
+    lead_frames: int
+    own_frames: int
+
+
+def plan_segments(
+    keyframes: list[float],
+    duration: float,
+    fps: float,
+    target_seconds: float,
+    overlap_seconds: float = 0.0,
+) -> list[Segment]:
+    """
+    Groups GOPs into segments of roughly target_seconds. Every segment starts on
+    a keyframe so it can be cut with stream copy; clip_start reaches back to an
+    earlier keyframe so the segment is processed with overlap_seconds of context
+    from its predecessor (lead_frames are dropped again before encoding).
+    """
+    candidates = sorted({k for k in keyframes if 0.0 <= k < duration})
+    if not candidates or candidates[0] > 0.0:
+        candidates.insert(0, 0.0)
+
+    min_tail = target_seconds / 2
+    boundaries = [candidates[0]]
+    for k in candidates[1:]:
+        if k - boundaries[-1] >= target_seconds and duration - k >= min_tail:
+            boundaries.append(k)
+
+    segments: list[Segment] = []
+    for i, start in enumerate(boundaries):
+        end = boundaries[i + 1] if i + 1 < len(boundaries) else duration
+        clip_start = start
+        if i > 0 and overlap_seconds > 0:
+            pos = bisect_right(candidates, start - overlap_seconds) - 1
+            clip_start = candidates[max(pos, 0)]
+        segments.append(
+            Segment(
+                index=i,
+                start=start,
+                end=end,
+                clip_start=clip_start,
+                lead_frames=round(start * fps) - round(clip_start * fps),
+                own_frames=round(end * fps) - round(start * fps),
+            )
+        )
+    return segments
+
+
+def run_segmented(
+    input_path: str,
+    output_path: str,
+    workspace: str,
+    video_info: dict,
+    process_segment: Callable[[dict], str],
+    *,
+    target_seconds: float,
+    overlap_seconds: float,
+    workers: int = 0,
+    task_extra: dict | None = None,
+    on_segment_done: Callable[[dict], None] | None = None,
+    is_done: Callable[[dict], bool] | None = None,
+) -> int:
+    """
+    Splits input_path at keyframes, runs process_segment for every segment in a
+    process pool and concatenates the encoded segments (with the source audio)
+    into output_path. process_segment must be a picklable module-level function
+    that encodes task["output_path"] and returns it.
+
+    on_segment_done is called with each finished task; if it raises (e.g. on
+    cancellation), segments that have not started yet are dropped. Tasks for
+    which is_done returns True already have their output (e.g. from an earlier
+    attempt) and are not processed again. When the current cancel token is
+    cancelled, running segments are told to stop: process_segment should call
+    check_segment_cancelled() as it makes progress.
+    """
+    keyframes = list_keyframes(input_path)
+    segments = plan_segments(
+        keyframes,
+        duration=video_info["duration"],
+        fps=video_info["fps"],
+        target_seconds=target_seconds,
+        overlap_seconds=overlap_seconds,
+    )
+
+    segments_dir = os.path.join(workspace, "segments")
+    os.makedirs(segments_dir, exist_ok=True)
+
+    tasks = []
+    for seg in segments:
+        clip_path = os.path.join(segments_dir, f"clip_{seg.index:03d}.mp4")
+        cut_clip(input_path, clip_path, seg.clip_start, seg.end)
+        tasks.append(
+            {
+                **(task_extra or {}),
+                "index": seg.index,
+                "clip_path": clip_path,
+                "output_path": os.path.join(segments_dir, f"out_{seg.index:03d}.mp4"),
+                "width": video_info["width"],
+                "height": video_info["height"],
+                "fps": video_info["fps"],
+                "lead_frames": seg.lead_frames,
+                "own_frames": seg.own_frames,
+            }
+        )
+
+    outputs = [task["output_path"] for task in tasks]
+    todo = [task for task in tasks if not (is_done and is_done(task))]
+    if len(todo) < len(tasks):
+        logger.info("Reusing %s finished segments", len(tasks) - len(todo))
+    max_workers = min(len(todo), workers or os.cpu_count() or 1)
+    logger.info("Processing %s segments with %s workers", len(todo), max_workers)
+    if max_workers <= 1:
+        for task in todo:
+            process_segment(task)
+            if on_segment_done is not None:
+                on_segment_done(task)
+    else:
+        # spawn keeps CUDA/torch state out of forked children
+        ctx = multiprocessing.get_context("spawn")
+        cancel_event = ctx.Event()
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=ctx, initializer=_init_pool_process, initargs=(cancel_event,)
+        ) as pool:
+            futures = {pool.submit(process_segment, task): task for task in todo}
+            pending = set(futures)
+            try:
+                while pending:
+                    check_cancelled()
+                    done, pending = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                        if on_segment_done is not None:
+                            on_segment_done(futures[future])
+            except BaseException:
+                # Stop the running segments too, not only the queued ones.
+                cancel_event.set()
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+
+    concat_videos(outputs, output_path, audio_source=input_path)
+    return len(segments)
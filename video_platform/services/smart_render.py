@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from video_platform.runners.ffmpeg_utils import (
+    FrameSink,
+    FrameSource,
+    concat_videos,
+    count_frames,
+    cut_clip,
+    list_keyframes,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RenderSpan:
+    start: float
+    end: float
+    first_frame: int
+    frames: int
+    reencode: bool
+
+
+def plan_render_spans(
+    keyframes: list[float],
+    duration: float,
+    fps: float,
+    changed: list[tuple[int, int]],
+) -> list[RenderSpan]:
+    """
+    Covers the clip with keyframe-aligned spans: runs of GOPs overlapping a
+    changed [start, end) frame range are re-encoded, the others stream-copied.
+    Leading frames before the first keyframe cannot be cut out by stream copy
+    and are always re-encoded.
+    """
+    keyframe_set = {k for k in keyframes if 0.0 <= k < duration}
+    candidates = sorted(keyframe_set)
+    if not candidates or candidates[0] > 0.0:
+        candidates.insert(0, 0.0)
+    bounds = candidates + [duration]
+
+    spans: list[RenderSpan] = []
+    for start, end in zip(bounds, bounds[1:]):
+        first, last = round(start * fps), round(end * fps)
+        reencode = start not in keyframe_set or any(a < last and b > first for a, b in changed)
+        if spans and spans[-1].reencode == reencode:
+            prev = spans[-1]
+            spans[-1] = RenderSpan(prev.start, end, prev.first_frame, last - prev.first_frame, reencode)
+        else:
+            spans.append(RenderSpan(start, end, first, last - first, reencode))
+    return spans
+
+
+def _frame_ranges(indices: list[int]) -> list[tuple[int, int]]:
+    ranges: list[tuple[int, int]] = []
+    for index in sorted(indices):
+        if ranges and ranges[-1][1] == index:
+            ranges[-1] = (ranges[-1][0], index + 1)
+        else:
+            ranges.append((index, index + 1))
+    return ranges
+
+
+def _encode_span(
+    base_path: str,
+    path: str,
+    video_info: dict,
+    span: RenderSpan,
+    replacements: Mapping[int, np.ndarray],
+    encoder: dict,
+) -> int:
+    width, height, fps = video_info["width"], video_info["height"], video_info["fps"]
+    # Seek half a frame early so the span starts exactly on its first frame.
+    start = max(0.0, span.start - 0.5 / fps)
+    with FrameSource(base_path, width=width, height=height, start=start, max_frames=span.frames) as source, FrameSink(
+        path, width=width, height=height, fps=fps, **encoder
+    ) as sink:
+        for offset, frame in enumerate(source):
+            sink.write(replacements.get(span.first_frame + offset, frame))
+    return sink.frames_written
+
+
+def smart_render(
+    base_path: str,
+    output_path: str,
+    workspace: str,
+    video_info: dict,
+    replacements: Mapping[int, np.ndarray],
+    *,
+    encoder: dict,
+    audio_source: str | None = None,
+    on_frames: Callable[[int], None] | None = None,
+) -> dict:
+    """
+    Writes base_path with the frames in replacements (by frame index) swapped
+    in, re-encoding only the GOPs that contain a replaced frame and
+    stream-copying the rest. The re-encoded GOPs must be able to sit next to
+    the copied ones, so encoder has to match the options base_path was encoded
+    with; use it for outputs this platform encoded, not arbitrary inputs.
+    Returns how many frames were copied and encoded.
+    """
+    fps = video_info["fps"]
+    spans = plan_render_spans(
+        list_keyframes(base_path), video_info["duration"], fps, _frame_ranges(list(replacements))
+    )
+
+    render_dir = os.path.join(workspace, "render")
+    os.makedirs(render_dir, exist_ok=True)
+    paths: list[str] = []
+    stats = {"copied_frames": 0, "encoded_frames": 0, "reencoded_spans": 0}
+    for i, span in enumerate(spans):
+        path = os.path.join(render_dir, f"span_{i:03d}.mp4")
+        reencode = span.reencode
+        if not reencode and i == len(spans) - 1:
+            # The tail is copied to the end of the file, whatever its frame count.
+            cut_clip(base_path, path, span.start)
+            stats["copied_frames"] += span.frames
+        elif not reencode:
+            cut_clip(base_path, path, span.start, frames=span.frames)
+            copied = count_frames(path)
+            if copied == span.frames:
+                stats["copied_frames"] += span.frames
+            else:
+                # The cut did not land on a clean GOP boundary; splicing it would
+                # shift every later frame, so encode this span instead.
+                logger.warning(
+                    "Stream copy of %.3fs-%.3fs in %s gave %s frames instead of %s; re-encoding it",
+                    span.start,
+                    span.end,
+                    base_path,
+                    copied,
+                    span.frames,
+                )
+                reencode = True
+        if reencode:
+            stats["encoded_frames"] += _encode_span(base_path, path, video_info, span, replacements, encoder)
+            stats["reencoded_spans"] += 1
+        if on_frames is not None:
+            on_frames(span.frames)
+        paths.append(path)
+
+    concat_videos(paths, output_path, audio_source=audio_source)
+    logger.info(
+        "Smart render of %s: %s frames copied, %s re-encoded in %s spans",
+        output_path,
+        stats["copied_frames"],
+        stats["encoded_frames"],
+        stats["reencoded_spans"],
+    )
+    return stats
@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import psutil
+
+from video_platform.core.schemas import EditPlan
+from video_platform.runners.cancellation import Cancelled
+from video_platform.services.artifact_cache import ArtifactCache
+from video_platform.services.checkpoint import ChunkCheckpoint
+from video_platform.services.progress import ProgressReporter
+
+logger = logging.getLogger(__name__)
+
+
+class StepSkipped(Exception):
+    """Raised by a step that has nothing to do for this plan."""
+
+
+@dataclass
+class StepContext:
+    input_path: str
+    output_path: str
+    workspace: str
+    plan: EditPlan
+    video_info: dict | None = None
+    cache: ArtifactCache | None = None
+    progress: ProgressReporter = field(default_factory=ProgressReporter)
+    checkpoint: ChunkCheckpoint | None = None
+
+
+StepFn = Callable[[StepContext, dict[str, Any]], dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class StepSpec:
+    name: str
+    fn: StepFn
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+
+
+@dataclass
+class PlannedStep:
+    name: str
+    spec: StepSpec | None
+    deps: dict[str, int]
+    implicit: bool = False
+    skip_reason: str | None = None
+
+
+class StepRegistry:
+    """
+    Maps tool-chain step names to functions that take named input artifacts
+    and return named output artifacts. Implicit steps are the default
+    providers of their outputs: they are added to a chain when a step needs an
+    artifact that no earlier step in the chain produces.
+    """
+
+    def __init__(self):
+        self._steps: dict[str, StepSpec] = {}
+        self._providers: dict[str, str] = {}
+
+    def register(
+        self,
+        name: str,
+        inputs: tuple[str, ...] = (),
+        outputs: tuple[str, ...] = (),
+        implicit: bool = False,
+    ) -> Callable[[StepFn], StepFn]:
+        def decorator(fn: StepFn) -> StepFn:
+            self._steps[name] = StepSpec(name=name, fn=fn, inputs=tuple(inputs), outputs=tuple(outputs))
+            if implicit:
+                for artifact in outputs:
+                    self._providers[artifact] = name
+            return fn
+
+        return decorator
+
+    def get(self, name: str) -> StepSpec | None:
+        return self._steps.get(name)
+
+    def plan(self, tool_chain: list[str], goal: str | None = None) -> list[PlannedStep]:
+        """
+        Resolves tool_chain into a DAG. Each input is wired to the latest earlier
+        step producing it, so a step may also transform an artifact in place
+        (consume and re-produce the same name).
+        """
+        nodes: list[PlannedStep] = []
+        producers: dict[str, int] = {}
+
+        def ensure(artifact: str, stack: tuple[str, ...]) -> int | None:
+            if artifact in producers:
+                return producers[artifact]
+            provider = self._providers.get(artifact)
+            if provider is None or provider in stack:
+                return None
+            return add(provider, True, stack)
+
+        def add(name: str, implicit: bool, stack: tuple[str, ...] = ()) -> int | None:
+            spec = self._steps.get(name)
+            if spec is None:
+                nodes.append(PlannedStep(name, None, {}, implicit, "no runner registered"))
+                return None
+            deps = {}
+            for artifact in spec.inputs:
+                idx = ensure(artifact, stack + (name,))
+                if idx is None:
+                    nodes.append(PlannedStep(name, spec, {}, implicit, f"no step provides {artifact}"))
+                    return None
+                deps[artifact] = idx
+            nodes.append(PlannedStep(name, spec, deps, implicit))
+            idx = len(nodes) - 1
+            for artifact in spec.outputs:
+                producers[artifact] = idx
+            return idx
+
+        for name in tool_chain:
+            add(name, False)
+        if goal is not None:
+            ensure(goal, ())
+        return nodes
+
+
+STEP_REGISTRY = StepRegistry()
+
+
+class _MemorySampler:
+    """Samples process RSS in the background so each step can report the peak over its run."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self._process = psutil.Process()
+        self._samples: list[tuple[float, int]] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="toolchain-memory", daemon=True)
+
+    def _sample(self) -> None:
+        self._samples.append((time.perf_counter(), self._process.memory_info().rss))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "_MemorySampler":
+        self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def peak(self, start: float, end: float) -> int:
+        window = [rss for t, rss in self._samples if start <= t <= end]
+        if not window:
+            # Shorter than one interval: use the closest sample before it.
+            window = [rss for t, rss in self._samples if t <= end][-1:] or [self._samples[0][1]]
+        return max(window)
+
+
+@dataclass
+class _StepRun:
+    start: float = 0.0
+    end: float = 0.0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, start: float, end: float, wall: float, cpu: float) -> None:
+        with self.lock:
+            self.start = self.start or start
+            self.end = max(self.end, end)
+            self.wall_seconds += wall
+            self.cpu_seconds += cpu
+
+
+# Per-thread [wall, cpu] totals of the timed call currently running, so time a
+# step spends pulling items from an upstream step is charged to that step only.
+_timing = threading.local()
+
+
+def _timed(run: _StepRun, fn: Callable[[], Any]) -> Any:
+    outer = getattr(_timing, "totals", None)
+    nested = _timing.totals = [0.0, 0.0]
+    start, cpu = time.perf_counter(), time.thread_time()
+    try:
+        return fn()
+    finally:
+        wall, cpu = time.perf_counter() - start, time.thread_time() - cpu
+        _timing.totals = outer
+        if outer is not None:
+            outer[0] += wall
+            outer[1] += cpu
+        run.add(start, start + wall, wall - nested[0], cpu - nested[1])
+
+
+class _Metered(Iterator):
+    """Charges the time spent producing each item of a lazy step output to that step."""
+
+    def __init__(self, it: Iterator, run: _StepRun):
+        self._it = it
+        self._run = run
+
+    def __next__(self):
+        return _timed(self._run, lambda: next(self._it))
+
+    def close(self) -> None:
+        close = getattr(self._it, "close", None)
+        if close is not None:
+            close()
+
+
+class _Raised:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+_END = object()
+
+
+class prefetch(Iterator):
+    """
+    A pipeline stage boundary: pulls items from an upstream iterator on its own
+    thread into a queue of at most maxsize items, so the upstream stage (e.g.
+    decode) works ahead while the caller processes earlier items (e.g.
+    inference). A full queue blocks the producer, which bounds memory. Use as
+    a context manager so an abandoned stage stops its thread.
+    """
+
+    def __init__(self, items: Any, maxsize: int):
+        self._queue: queue.Queue = queue.Queue(max(1, maxsize))
+        self._stop = threading.Event()
+        self._done = False
+        # Run in a copy of the caller's context so the current cancel token
+        # reaches ffmpeg processes the upstream stage starts.
+        ctx = contextvars.copy_context()
+        self._thread = threading.Thread(target=ctx.run, args=(self._fill, items), name="stage-prefetch", daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self, items: Any) -> None:
+        try:
+            for item in items:
+                if not self._put(item):
+                    return
+            self._put(_END)
+        except BaseException as exc:
+            self._put(_Raised(exc))
+        finally:
+            # Close an abandoned upstream generator here rather than whenever
+            # it is garbage collected, so what it holds is released now.
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    def __next__(self):
+        if self._done:
+            raise StopIteration
+        item = self._queue.get()
+        if item is _END:
+            self._done = True
+            raise StopIteration
+        if isinstance(item, _Raised):
+            self._done = True
+            raise item.exc
+        return item
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self) -> "prefetch":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _execute(step: PlannedStep, ctx: StepContext, inputs: dict[str, Any], run: _StepRun) -> dict[str, Any]:
+    outputs = _timed(run, lambda: step.spec.fn(ctx, inputs)) or {}
+    return {
+        name: _Metered(iter(value), run) if isinstance(value, Iterator) else value
+        for name, value in outputs.items()
+    }
+
+
+def run_toolchain(
+    tool_chain: list[str],
+    ctx: StepContext,
+    *,
+    goal: str | None = None,
+    registry: StepRegistry = STEP_REGISTRY,
+    max_workers: int = 4,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    Runs the steps of tool_chain (plus implicit providers needed for goal) on a
+    thread pool, starting each as soon as its inputs exist, so independent
+    steps overlap. Artifacts are passed between steps in memory; iterator
+    outputs stay lazy and are pulled by their consumer.
+
+    Returns the final artifacts and one record per step with status, wall and
+    CPU seconds spent in the step itself (excluding upstream work it pulled)
+    and the peak process RSS while the step ran. CPU seconds cover Python
+    threads only, not ffmpeg subprocesses or GPU kernels.
+    """
+    nodes = registry.plan(tool_chain, goal)
+    runs = [_StepRun() for _ in nodes]
+    status: dict[int, str] = {}
+    reasons: dict[int, str] = {}
+    results: dict[int, dict[str, Any]] = {}
+    pending = list(range(len(nodes)))
+    running: dict[Any, int] = {}
+
+    with _MemorySampler() as sampler, ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        while pending or running:
+            for idx in list(pending):
+                node = nodes[idx]
+                if any(dep not in status for dep in node.deps.values()):
+                    continue
+                pending.remove(idx)
+                blocked = [nodes[dep].name for dep in node.deps.values() if status[dep] != "ok"]
+                if node.skip_reason or blocked:
+                    status[idx] = "skipped"
+                    reasons[idx] = node.skip_reason or f"upstream {', '.join(blocked)} skipped"
+                    continue
+                inputs = {artifact: results[dep][artifact] for artifact, dep in node.deps.items()}
+                ctx.progress.start_step(node.name)
+                step_context = contextvars.copy_context()
+                running[pool.submit(step_context.run, _execute, node, ctx, inputs, runs[idx])] = idx
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = running.pop(future)
+                try:
+                    results[idx] = future.result()
+                    status[idx] = "ok"
+                except StepSkipped as exc:
+                    status[idx] = "skipped"
+                    reasons[idx] = str(exc)
+                except Exception as exc:
+                    if isinstance(exc, Cancelled):
+                        logger.info("tool-chain cancelled during step %s", nodes[idx].name)
+                    else:
+                        logger.error("tool-chain step %s failed: %s", nodes[idx].name, exc)
+                    for other in running:
+                        other.cancel()
+                    raise
+
+    artifacts: dict[str, Any] = {}
+    steps = []
+    for idx, node in enumerate(nodes):
+        if status[idx] == "ok":
+            artifacts.update(results[idx])
+        record: dict[str, Any] = {"step": node.name, "status": status[idx], "implicit": node.implicit}
+        if status[idx] == "ok":
+            run = runs[idx]
+            record["wall_seconds"] = round(run.wall_seconds, 3)
+            record["cpu_seconds"] = round(run.cpu_seconds, 3)
+            record["peak_rss_bytes"] = sampler.peak(run.start, run.end)
+        else:
+            record["reason"] = reasons[idx]
+        steps.append(record)
+        logger.info("tool-chain step %s", record)
+    return artifacts, steps
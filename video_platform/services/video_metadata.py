@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+from video_platform.config import settings
+from video_platform.runners.ffmpeg_utils import get_video_info
+
+_lock = threading.Lock()
+_hash_memo: dict[tuple[str, int, int], str] = {}
+_probe_memo: dict[str, dict[str, Any]] = {}
+
+
+def local_path_from_uri(uri: str | None) -> str | None:
+    if not uri:
+        return None
+    if uri.startswith("file://"):
+        path = uri[len("file://"):]
+    elif "://" in uri:
+        return None
+    else:
+        path = uri
+    return path if os.path.isfile(path) else None
+
+
+def _store_dir(kind: str) -> Path:
+    path = Path(settings.probe_cache_dir) / kind
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, payload: dict) -> None:
+    # A unique temp name per writer: threads probing the same file concurrently
+    # must not replace each other's half-written temp file.
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+    ) as tmp:
+        tmp.write(json.dumps(payload))
+    os.replace(tmp.name, path)
+
+
+def _stat_key(path: str) -> tuple[str, int, int]:
+    st = os.stat(path)
+    return os.path.realpath(path), st.st_size, st.st_mtime_ns
+
+
+def file_content_hash(path: str) -> str:
+    """sha256 of the file contents, memoized by (path, size, mtime) so unchanged files are hashed once."""
+    key = _stat_key(path)
+    with _lock:
+        cached = _hash_memo.get(key)
+    if cached:
+        return cached
+
+    index_path = _store_dir("by_stat") / f"{hashlib.sha1(repr(key).encode('utf-8')).hexdigest()}.json"
+    entry = _read_json(index_path)
+    if entry and entry.get("content_hash"):
+        digest = entry["content_hash"]
+    else:
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        _write_json(index_path, {"path": key[0], "size": key[1], "mtime_ns": key[2], "content_hash": digest})
+
+    with _lock:
+        _hash_memo[key] = digest
+    return digest
+
+
+def probe_video(path: str) -> dict[str, Any]:
+    """
+    Returns get_video_info() for path plus content_hash and size_bytes. Results
+    are stored by content hash, so ffprobe runs once per distinct file content.
+    """
+    digest = file_content_hash(path)
+    with _lock:
+        cached = _probe_memo.get(digest)
+    if cached is not None:
+        return dict(cached)
+
+    entry_path = _store_dir("content") / f"{digest}.json"
+    info = _read_json(entry_path)
+    if info is None:
+        info = get_video_info(path)
+        info["content_hash"] = digest
+        info["size_bytes"] = os.path.getsize(path)
+        _write_json(entry_path, info)
+
+    with _lock:
+        _probe_memo[digest] = info
+    return dict(info)
@@ -1,3 +1,3 @@
-from video_platform.utils.time import now_utc
+from video_platform.utils.time import format_timecode, now_utc, parse_timecode, parse_timeline
 
-__all__ = ["now_utc"]
+__all__ = ["format_timecode", "now_utc", "parse_timecode", "parse_timeline"]
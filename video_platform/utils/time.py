@@ -5,3 +5,26 @@ from datetime import datetime, timezone
 
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
+
+
+def parse_timecode(value: str) -> float:
+    seconds = 0.0
+    for part in value.strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def format_timecode(seconds: float, precision: int = 0) -> str:
+    """HH:MM:SS, with precision decimal places on the seconds when above 0."""
+    if precision <= 0:
+        total = max(0, int(round(seconds)))
+        return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}"
+    scale = 10**precision
+    total = max(0, int(round(seconds * scale)))
+    whole, fraction = divmod(total, scale)
+    return f"{whole // 3600:02d}:{whole % 3600 // 60:02d}:{whole % 60:02d}.{fraction:0{precision}d}"
+
+
+def parse_timeline(value: str) -> tuple[float, float]:
+    start, _, end = value.partition("-")
+    return parse_timecode(start), parse_timecode(end or start)
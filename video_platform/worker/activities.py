@@ -1,21 +1,31 @@
 from __future__ import annotations
 
+import os
+import threading
+
 from temporalio import activity
+from temporalio.exceptions import CancelledError
 
 from video_platform.config import settings
 from video_platform.core.enums import Capability, JobStatus
 from video_platform.core.schemas import EditPlan
 from video_platform.db import db_session
+from video_platform.runners.cancellation import Cancelled, cancel_scope
 from video_platform.services import executor, planner, qa, safety
 from video_platform.services.callbacks import callback_url_from_metadata, send_callback
 from video_platform.services.knowledge import search_cases
+from video_platform.services.progress import ProgressReporter
+from video_platform.services.video_metadata import local_path_from_uri, probe_video
 from video_platform.services.repository import (
     create_case_record,
     create_qa_report,
     get_job,
+    get_job_iteration,
+    job_video_metadata,
     log_job_event,
     log_safety_event,
     set_job_status,
+    set_job_video_metadata,
     update_job_iteration,
 )
 from video_platform.worker.contracts import (
@@ -26,6 +36,12 @@ from video_platform.worker.contracts import (
 )
 
 
+# Activities are synchronous and run on the worker's activity thread pool, so
+# blocking DB, HTTP and pipeline work never stalls the worker's event loop.
+# Heavy pipeline runs additionally share a smaller number of slots.
+execution_slots = threading.BoundedSemaphore(max(1, settings.worker_max_concurrent_executions))
+
+
 def _notify_terminal_callback(session, job, final_status: str, qa_report: dict | None = None, output_uri: str | None = None) -> None:
     callback_url = callback_url_from_metadata(job.metadata_json)
     if not callback_url:
@@ -52,7 +68,7 @@ def _notify_terminal_callback(session, job, final_status: str, qa_report: dict |
 
 
 @activity.defn
-async def safety_precheck(job_id: str) -> ActivitySafetyResult:
+def safety_precheck(job_id: str) -> ActivitySafetyResult:
     with db_session() as session:
         job = get_job(session, job_id)
         if job is None:
@@ -106,9 +122,17 @@ async def safety_precheck(job_id: str) -> ActivitySafetyResult:
 
 
 @activity.defn
-async def plan_iteration(job_id: str, iteration: int, prior_issues: list[dict]) -> ActivityPlanResult:
+def plan_iteration(
+    job_id: str, iteration: int, prior_issues: list[dict], speculative: bool = False, variants: int = 1
+) -> ActivityPlanResult:
+    """
+    A speculative plan runs alongside safety_precheck and writes nothing to the
+    job; execute_iteration adopts it (see _adopt_speculative_plan). With
+    variants > 1 the result also lists alternative plans to execute side by side.
+    """
     with db_session() as session:
-        set_job_status(session, job_id, JobStatus.planning)
+        if not speculative:
+            set_job_status(session, job_id, JobStatus.planning)
         job = get_job(session, job_id)
         if job is None:
             raise ValueError(f"job {job_id} not found")
@@ -119,41 +143,161 @@ async def plan_iteration(job_id: str, iteration: int, prior_issues: list[dict])
             forced_capability = Capability(job.capability)
 
         model_bundle = job.model_bundle or "balanced_12g_bundle"
+        previous = get_job_iteration(session, job_id, iteration - 1) if iteration > 1 else None
 
         plan = planner.generate_plan(
             instruction=job.instruction,
             model_bundle=model_bundle,
             prior_issues=prior_issues,
             forced=forced_capability,
+            video_metadata=job_video_metadata(job),
+            base_output_uri=previous.output_uri if previous else None,
         )
 
-        plan_payload = plan.model_dump()
-        plan_payload["retrieved_cases"] = retrieved_cases
+        payloads = []
+        for variant in planner.generate_plan_variants(plan, variants):
+            payload = variant.model_dump()
+            payload["retrieved_cases"] = retrieved_cases
+            if speculative:
+                payload["speculative"] = True
+            payloads.append(payload)
+        result = ActivityPlanResult(edit_plan=payloads[0], variants=payloads if len(payloads) > 1 else [])
+        if speculative:
+            return result
 
         job.capability = plan.capability.value
         if not job.model_bundle:
             job.model_bundle = model_bundle
-        return ActivityPlanResult(edit_plan=plan_payload)
+        return result
+
+
+def _adopt_speculative_plan(session, job_id: str, edit_plan: dict) -> None:
+    # Applies the writes plan_iteration skipped. A retried attempt finds the job
+    # past queued and has nothing left to do.
+    job = get_job(session, job_id)
+    if job is None or job.status != JobStatus.queued.value:
+        return
+    set_job_status(session, job_id, JobStatus.planning)
+    job.capability = edit_plan["capability"]
+    if not job.model_bundle:
+        job.model_bundle = edit_plan["model_bundle"]
+    log_job_event(
+        session=session,
+        job_id=job_id,
+        stage="speculative_plan_adopted",
+        message="Plan computed during the safety precheck adopted",
+        payload={"capability": edit_plan["capability"]},
+    )
 
 
 @activity.defn
-async def execute_iteration(job_id: str, iteration: int, edit_plan: dict) -> ActivityExecutionResult:
+def prefetch_input(job_id: str) -> None:
+    """
+    Probes the job's input on an executor node while the job is still being
+    checked and planned, so the content hash, probe result and file pages are
+    warm when execute_iteration starts. Best effort: failures are only logged.
+    """
+    with db_session() as session:
+        job = get_job(session, job_id)
+        if job is None:
+            return
+        path = local_path_from_uri(job.input_uri)
+        if path is None or not os.path.exists(path):
+            return
+        try:
+            metadata = probe_video(path)
+        except (OSError, RuntimeError, ValueError) as exc:
+            activity.logger.warning("Input prefetch for job %s failed: %s", job_id, exc)
+            return
+        if job_video_metadata(job) is None:
+            set_job_video_metadata(session, job, metadata)
+
+
+def _wait_for_execution_slot() -> None:
+    # Keeps heartbeating while queued behind other executions.
+    while not execution_slots.acquire(timeout=settings.execution_heartbeat_seconds):
+        if activity.is_cancelled():
+            raise CancelledError("execution cancelled while waiting for a slot")
+        activity.heartbeat({"step": "waiting_for_slot"})
+
+
+def _log_progress(job_id: str, iteration: int):
+    def log(snapshot: dict) -> None:
+        with db_session() as session:
+            log_job_event(
+                session=session,
+                job_id=job_id,
+                stage="execution_progress",
+                message=f"Iteration {iteration} {snapshot.get('step') or 'starting'}",
+                payload={"iteration": iteration, **snapshot},
+            )
+
+    return log
+
+
+# Cancellation is cooperative: the progress monitor sees the request on its next
+# heartbeat and stops the pipeline, rather than an exception being injected
+# into this thread at an arbitrary point.
+@activity.defn(no_thread_cancel_exception=True)
+def execute_iteration(
+    job_id: str, iteration: int, edit_plan: dict, variant: int | None = None
+) -> ActivityExecutionResult:
+    # A variant run leaves recording the iteration to select_variant.
     with db_session() as session:
+        if edit_plan.get("speculative"):
+            _adopt_speculative_plan(session, job_id, edit_plan)
         set_job_status(session, job_id, JobStatus.editing)
         job = get_job(session, job_id)
         if job is None:
             raise ValueError(f"job {job_id} not found")
+        input_uri, instruction = job.input_uri, job.instruction
+
+        # A retried attempt picks up the chunks the last one checkpointed (see
+        # executor.execute_plan); its heartbeat details say how far it got.
+        info = activity.info()
+        details = info.heartbeat_details[-1] if info.heartbeat_details else None
+        checkpoint = details.get("checkpoint") if isinstance(details, dict) else None
+        if checkpoint and checkpoint.get("frames"):
+            log_job_event(
+                session=session,
+                job_id=job_id,
+                stage="execution_resumed",
+                message=f"Attempt {info.attempt} resuming iteration {iteration} after {checkpoint['frames']} frames",
+                payload={"iteration": iteration, "attempt": info.attempt, **checkpoint},
+            )
 
-        plan = EditPlan.model_validate(edit_plan)
+    plan = EditPlan.model_validate(edit_plan)
 
-        run = executor.execute_plan(
-            job_id=job_id,
-            iteration=iteration,
-            input_uri=job.input_uri,
-            instruction=job.instruction,
-            plan=plan,
-        )
+    progress = ProgressReporter(
+        heartbeat=activity.heartbeat,
+        on_event=_log_progress(job_id, iteration),
+        is_cancelled=activity.is_cancelled,
+        heartbeat_seconds=settings.execution_heartbeat_seconds,
+        event_seconds=settings.progress_event_seconds,
+        stall_seconds=settings.execution_stall_seconds,
+    )
+    # No DB session is held while the pipeline runs; only execution_slots runs may be in flight.
+    _wait_for_execution_slot()
+    try:
+        with progress, cancel_scope(progress.token):
+            run = executor.execute_plan(
+                job_id=job_id,
+                iteration=iteration,
+                input_uri=input_uri,
+                instruction=instruction,
+                plan=plan,
+                progress=progress,
+                variant=variant,
+            )
+    except Cancelled as exc:
+        raise CancelledError(str(exc)) from exc
+    finally:
+        execution_slots.release()
 
+    if variant is not None:
+        return ActivityExecutionResult(output_uri=run["output_uri"], execution_log=run["execution_log"])
+
+    with db_session() as session:
         update_job_iteration(
             session=session,
             job_id=job_id,
@@ -170,19 +314,76 @@ async def execute_iteration(job_id: str, iteration: int, edit_plan: dict) -> Act
 
 
 @activity.defn
-async def qa_iteration(job_id: str, iteration: int, output_uri: str) -> ActivityQAResult:
+def select_variant(job_id: str, iteration: int, candidates: list[dict]) -> ActivityExecutionResult:
+    """
+    Scores the executed variants of an iteration ({"variant", "edit_plan",
+    "output_uri", "execution_log"} each) and records the best as the iteration.
+    qa_iteration then reports on it as usual.
+    """
+    with db_session() as session:
+        job = get_job(session, job_id)
+        if job is None:
+            raise ValueError(f"job {job_id} not found")
+
+        reports = [
+            qa.evaluate(
+                qa.QAContext(
+                    instruction=job.instruction,
+                    iteration=iteration,
+                    capability=candidate["edit_plan"]["capability"],
+                    output_uri=candidate["output_uri"],
+                    video_metadata=job_video_metadata(job),
+                    mask_signals=candidate["execution_log"].get("mask_signals"),
+                    mask_path=candidate["execution_log"].get("mask_path"),
+                )
+            )
+            for candidate in candidates
+        ]
+        strategies = [candidate["edit_plan"]["constraints"].get("variant_strategy", "baseline") for candidate in candidates]
+        best, summary = qa.compare_variants(reports, strategies, [candidate["output_uri"] for candidate in candidates])
+        for candidate, row in zip(candidates, summary):
+            # Failed variants are missing from candidates; keep their original numbers.
+            row["variant"] = candidate["variant"]
+        winner = candidates[best]
+        execution_log = {**winner["execution_log"], "variants": summary}
+
+        update_job_iteration(
+            session=session,
+            job_id=job_id,
+            iteration=iteration,
+            edit_plan=winner["edit_plan"],
+            execution_log=execution_log,
+            output_uri=winner["output_uri"],
+        )
+        log_job_event(
+            session=session,
+            job_id=job_id,
+            stage="variant_selected",
+            message=f"Selected variant {winner['variant']} ({strategies[best]}) of {len(candidates)}",
+            payload={"iteration": iteration, "variants": summary},
+        )
+        return ActivityExecutionResult(output_uri=winner["output_uri"], execution_log=execution_log)
+
+
+@activity.defn
+def qa_iteration(job_id: str, iteration: int, output_uri: str) -> ActivityQAResult:
     with db_session() as session:
         set_job_status(session, job_id, JobStatus.qa)
         job = get_job(session, job_id)
         if job is None:
             raise ValueError(f"job {job_id} not found")
 
+        iteration_row = get_job_iteration(session, job_id, iteration)
+        execution_log = (iteration_row.execution_log or {}) if iteration_row else {}
         report = qa.evaluate(
             qa.QAContext(
                 instruction=job.instruction,
                 iteration=iteration,
                 capability=job.capability or "unknown",
                 output_uri=output_uri,
+                video_metadata=job_video_metadata(job),
+                mask_signals=execution_log.get("mask_signals"),
+                mask_path=execution_log.get("mask_path"),
             )
         )
         report_payload = report.model_dump()
@@ -216,7 +417,7 @@ async def qa_iteration(job_id: str, iteration: int, output_uri: str) -> Activity
 
 
 @activity.defn
-async def finalize_success(job_id: str, iteration: int, qa_report: dict, output_uri: str) -> None:
+def finalize_success(job_id: str, iteration: int, qa_report: dict, output_uri: str) -> None:
     with db_session() as session:
         job = set_job_status(session, job_id, JobStatus.succeeded)
         job.output_uri = output_uri
@@ -237,7 +438,7 @@ async def finalize_success(job_id: str, iteration: int, qa_report: dict, output_
 
 
 @activity.defn
-async def finalize_human_review(
+def finalize_human_review(
     job_id: str,
     iteration: int,
     qa_report: dict,
@@ -275,7 +476,7 @@ async def finalize_human_review(
 
 
 @activity.defn
-async def finalize_blocked(job_id: str, reason: str) -> None:
+def finalize_blocked(job_id: str, reason: str) -> None:
     with db_session() as session:
         job = get_job(session, job_id)
         if job is None:
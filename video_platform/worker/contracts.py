@@ -7,6 +7,11 @@ from dataclasses import dataclass, field
 class WorkflowInput:
     job_id: str
     forced_capability: str | None = None
+    # Fixed when the workflow starts, so replays see the same commands whatever the
+    # worker's current setting.
+    local_activities: bool = False
+    speculative_planning: bool = False
+    plan_variants: int = 1
 
 
 @dataclass
@@ -19,6 +24,8 @@ class ActivitySafetyResult:
 @dataclass
 class ActivityPlanResult:
     edit_plan: dict
+    # Alternative plans to execute side by side, edit_plan first; empty for a single plan.
+    variants: list[dict] = field(default_factory=list)
 
 
 @dataclass
@@ -41,3 +48,31 @@ class WorkflowResult:
     final_status: str
     final_output_uri: str | None = None
     iterations: int = 0
+
+
+@dataclass
+class BatchWorkflowInput:
+    batch_id: str
+    job_ids: list[str]
+    parallelism: int = 8
+    local_activities: bool = False
+    speculative_planning: bool = False
+    plan_variants: int = 1
+
+
+@dataclass
+class BatchProgress:
+    batch_id: str
+    total: int
+    pending: int
+    running: int
+    completed: int
+    statuses: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class BatchWorkflowResult:
+    batch_id: str
+    total: int
+    statuses: dict[str, int] = field(default_factory=dict)
+    results: list[WorkflowResult] = field(default_factory=list)
@@ -2,50 +2,147 @@
 
 import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from temporalio.worker import Worker
 
 from video_platform.config import settings
 from video_platform.db import init_db
+from video_platform.services import executor
 from video_platform.services.knowledge import ensure_collection
+from video_platform.services.model_manager import detect_device_profile, get_runtime_mode, recommend_bundles
 from video_platform.worker.activities import (
     execute_iteration,
     finalize_blocked,
     finalize_human_review,
     finalize_success,
     plan_iteration,
+    prefetch_input,
     qa_iteration,
     safety_precheck,
+    select_variant,
 )
 from video_platform.worker.temporal_client import wait_for_temporal
-from video_platform.worker.workflows import VideoEditWorkflow
+from video_platform.worker.workflows import BatchVideoEditWorkflow, VideoEditWorkflow
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+WORKER_ROLES = ("control", "executor", "all")
+
+CONTROL_ACTIVITIES = [
+    safety_precheck,
+    plan_iteration,
+    qa_iteration,
+    select_variant,
+    finalize_blocked,
+    finalize_success,
+    finalize_human_review,
+]
+EXECUTOR_ACTIVITIES = [execute_iteration]
+PREFETCH_ACTIVITIES = [prefetch_input]
+
+
+def warmup_models() -> None:
+    """
+    Loads the worker bundle's runners and runs a tiny clip through each before
+    the worker takes tasks, so the first job does not pay load/compile time.
+    """
+    if not settings.enable_model_warmup or get_runtime_mode() != "local":
+        return
+
+    bundle = settings.worker_model_bundle or recommend_bundles(detect_device_profile())[1]
+    started = time.perf_counter()
+    try:
+        timings = executor.warmup_models(bundle)
+    except Exception as exc:
+        # Jobs still report missing models themselves; a failed warmup must not keep the worker down.
+        logger.warning("Model warmup for bundle=%s failed after %.2fs: %s", bundle, time.perf_counter() - started, exc)
+        return
+    logger.info("Model warmup for bundle=%s finished in %.2fs: %s", bundle, time.perf_counter() - started, timings)
+
+
+def build_workers(client, role: str) -> tuple[list[Worker], list[ThreadPoolExecutor]]:
+    """
+    One Worker per task queue the role serves, each with its own activity
+    thread pool and concurrency limit, so a busy executor queue cannot starve
+    the control queue even when both run in one process.
+    """
+    if role not in WORKER_ROLES:
+        raise ValueError(f"unknown WORKER_ROLE {role!r}, expected one of {', '.join(WORKER_ROLES)}")
+
+    workers: list[Worker] = []
+    pools: list[ThreadPoolExecutor] = []
+    if role in ("control", "all"):
+        pool = ThreadPoolExecutor(max_workers=settings.worker_max_concurrent_activities, thread_name_prefix="control")
+        pools.append(pool)
+        workers.append(
+            Worker(
+                client,
+                task_queue=settings.temporal_task_queue,
+                activity_executor=pool,
+                max_concurrent_activities=settings.worker_max_concurrent_activities,
+                workflows=[VideoEditWorkflow, BatchVideoEditWorkflow],
+                activities=CONTROL_ACTIVITIES,
+            )
+        )
+    if role in ("executor", "all"):
+        slots = max(1, settings.worker_max_concurrent_executions)
+        pool = ThreadPoolExecutor(max_workers=slots, thread_name_prefix="executor")
+        pools.append(pool)
+        workers.append(
+            Worker(
+                client,
+                task_queue=settings.temporal_executor_task_queue,
+                activity_executor=pool,
+                max_concurrent_activities=slots,
+                activities=EXECUTOR_ACTIVITIES,
+            )
+        )
+        # Prefetches get their own queue and slots on the executor nodes: on the
+        # executor queue they would take the slot an execution is waiting for.
+        prefetches = max(1, settings.worker_max_concurrent_prefetches)
+        pool = ThreadPoolExecutor(max_workers=prefetches, thread_name_prefix="prefetch")
+        pools.append(pool)
+        workers.append(
+            Worker(
+                client,
+                task_queue=settings.temporal_prefetch_task_queue,
+                activity_executor=pool,
+                max_concurrent_activities=prefetches,
+                activities=PREFETCH_ACTIVITIES,
+            )
+        )
+    return workers, pools
+
 
 async def main() -> None:
+    role = settings.worker_role
     init_db()
     ensure_collection()
+    if role in ("executor", "all"):
+        await asyncio.to_thread(warmup_models)
 
     client = await wait_for_temporal()
-    worker = Worker(
-        client,
-        task_queue=settings.temporal_task_queue,
-        workflows=[VideoEditWorkflow],
-        activities=[
-            safety_precheck,
-            plan_iteration,
-            execute_iteration,
-            qa_iteration,
-            finalize_blocked,
-            finalize_success,
-            finalize_human_review,
-        ],
-    )
+    workers, pools = build_workers(client, role)
 
-    logger.info("Temporal worker started on queue=%s", settings.temporal_task_queue)
-    await worker.run()
+    logger.info(
+        "Temporal worker started as role=%s (control queue=%s, activities=%s; executor queue=%s, executions=%s; "
+        "prefetch queue=%s, prefetches=%s)",
+        role,
+        settings.temporal_task_queue,
+        settings.worker_max_concurrent_activities,
+        settings.temporal_executor_task_queue,
+        settings.worker_max_concurrent_executions,
+        settings.temporal_prefetch_task_queue,
+        settings.worker_max_concurrent_prefetches,
+    )
+    try:
+        await asyncio.gather(*(worker.run() for worker in workers))
+    finally:
+        for pool in pools:
+            pool.shutdown(wait=False)
 
 
 if __name__ == "__main__":
@@ -23,6 +23,24 @@ async def get_client() -> Client | None:
         return None
 
 
+_shared: tuple[asyncio.AbstractEventLoop, Client] | None = None
+
+
+async def get_shared_client() -> Client | None:
+    """
+    One connection per event loop, reused by every workflow start instead of
+    connecting per job. Failed connects are not cached, so the next call retries.
+    """
+    global _shared
+    loop = asyncio.get_running_loop()
+    if _shared is not None and _shared[0] is loop:
+        return _shared[1]
+    client = await get_client()
+    if client is not None:
+        _shared = (loop, client)
+    return client
+
+
 async def wait_for_temporal(max_attempts: int = 30, delay_seconds: float = 2.0) -> Client:
     attempt = 0
     while attempt < max_attempts:
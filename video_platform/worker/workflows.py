@@ -1,12 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+from collections import Counter
 from datetime import timedelta
 
 from temporalio import workflow
+from temporalio.common import RetryPolicy
+from temporalio.exceptions import ChildWorkflowError, WorkflowAlreadyStartedError
 
 from video_platform.config import settings
 from video_platform.core.enums import JobStatus
-from video_platform.worker.contracts import WorkflowInput, WorkflowResult
+from video_platform.worker.contracts import (
+    ActivityExecutionResult,
+    ActivityPlanResult,
+    ActivitySafetyResult,
+    BatchProgress,
+    BatchWorkflowInput,
+    BatchWorkflowResult,
+    WorkflowInput,
+    WorkflowResult,
+)
 
 with workflow.unsafe.imports_passed_through():
     from video_platform.worker.activities import (
@@ -15,20 +28,107 @@ with workflow.unsafe.imports_passed_through():
         finalize_human_review,
         finalize_success,
         plan_iteration,
+        prefetch_input,
         qa_iteration,
         safety_precheck,
+        select_variant,
     )
 
 
+def _ignore_result(task: asyncio.Future) -> None:
+    # The prefetch is best effort; retrieving the outcome keeps a failure from
+    # being reported as never retrieved.
+    if not task.cancelled():
+        task.exception()
+
+
 @workflow.defn
 class VideoEditWorkflow:
+    async def _light_activity(self, payload: WorkflowInput, activity, args: list, timeout: timedelta):
+        # Millisecond-scale steps: as local activities they run inside the workflow
+        # worker with no task-queue dispatch and fewer history events.
+        if payload.local_activities:
+            return await workflow.execute_local_activity(activity, args=args, start_to_close_timeout=timeout)
+        return await workflow.execute_activity(activity, args=args, start_to_close_timeout=timeout)
+
+    async def _execute(self, job_id: str, iteration: int, edit_plan: dict, variant: int | None = None):
+        return await workflow.execute_activity(
+            execute_iteration,
+            args=[job_id, iteration, edit_plan, variant],
+            task_queue=settings.temporal_executor_task_queue,
+            start_to_close_timeout=timedelta(minutes=20),
+            heartbeat_timeout=timedelta(seconds=settings.execution_heartbeat_timeout_seconds),
+        )
+
+    async def _execute_variants(
+        self, payload: WorkflowInput, iteration: int, variants: list[dict]
+    ) -> ActivityExecutionResult:
+        # Variants run concurrently as far as executor capacity allows; the best
+        # of those that finish becomes the iteration's result.
+        results = await asyncio.gather(
+            *(self._execute(payload.job_id, iteration, plan, index) for index, plan in enumerate(variants)),
+            return_exceptions=True,
+        )
+        candidates = []
+        failures = []
+        for index, result in enumerate(results):
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                workflow.logger.warning("Variant %s of job %s failed: %s", index, payload.job_id, result)
+                failures.append(result)
+                continue
+            candidates.append(
+                {
+                    "variant": index,
+                    "edit_plan": variants[index],
+                    "output_uri": result.output_uri,
+                    "execution_log": result.execution_log,
+                }
+            )
+        if not candidates:
+            raise failures[0]
+        return await self._light_activity(
+            payload, select_variant, [payload.job_id, iteration, candidates], timedelta(minutes=5)
+        )
+
+    async def _speculative_precheck(
+        self, payload: WorkflowInput
+    ) -> tuple[ActivitySafetyResult, ActivityPlanResult | None]:
+        # Planning does not depend on the safety verdict, so the first plan (which
+        # writes nothing to the job) and an input prefetch on the executor nodes'
+        # prefetch queue run while safety_precheck does. A blocked job drops both.
+        prefetch = workflow.start_activity(
+            prefetch_input,
+            args=[payload.job_id],
+            task_queue=settings.temporal_prefetch_task_queue,
+            schedule_to_close_timeout=timedelta(minutes=5),
+            retry_policy=RetryPolicy(maximum_attempts=1),
+        )
+        prefetch.add_done_callback(_ignore_result)
+        plan_task = asyncio.ensure_future(
+            self._light_activity(
+                payload, plan_iteration, [payload.job_id, 1, [], True, payload.plan_variants], timedelta(minutes=5)
+            )
+        )
+        safety_result = await self._light_activity(
+            payload, safety_precheck, [payload.job_id], timedelta(minutes=2)
+        )
+        if not safety_result.allowed:
+            plan_task.cancel()
+            prefetch.cancel()
+            return safety_result, None
+        return safety_result, await plan_task
+
     @workflow.run
     async def run(self, payload: WorkflowInput) -> WorkflowResult:
-        safety_result = await workflow.execute_activity(
-            safety_precheck,
-            payload.job_id,
-            start_to_close_timeout=timedelta(minutes=2),
-        )
+        first_plan: ActivityPlanResult | None = None
+        if payload.speculative_planning:
+            safety_result, first_plan = await self._speculative_precheck(payload)
+        else:
+            safety_result = await self._light_activity(
+                payload, safety_precheck, [payload.job_id], timedelta(minutes=2)
+            )
         if not safety_result.allowed:
             await workflow.execute_activity(
                 finalize_blocked,
@@ -47,22 +147,23 @@ class VideoEditWorkflow:
         latest_report: dict = {}
 
         for iteration in range(1, settings.max_iterations + 1):
-            plan = await workflow.execute_activity(
-                plan_iteration,
-                args=[payload.job_id, iteration, prior_issues],
-                start_to_close_timeout=timedelta(minutes=5),
-            )
+            if iteration == 1 and first_plan is not None:
+                plan = first_plan
+            else:
+                plan = await self._light_activity(
+                    payload,
+                    plan_iteration,
+                    [payload.job_id, iteration, prior_issues, False, payload.plan_variants],
+                    timedelta(minutes=5),
+                )
 
-            execution = await workflow.execute_activity(
-                execute_iteration,
-                args=[payload.job_id, iteration, plan.edit_plan],
-                start_to_close_timeout=timedelta(minutes=20),
-            )
+            if plan.variants:
+                execution = await self._execute_variants(payload, iteration, plan.variants)
+            else:
+                execution = await self._execute(payload.job_id, iteration, plan.edit_plan)
 
-            qa = await workflow.execute_activity(
-                qa_iteration,
-                args=[payload.job_id, iteration, execution.output_uri],
-                start_to_close_timeout=timedelta(minutes=5),
+            qa = await self._light_activity(
+                payload, qa_iteration, [payload.job_id, iteration, execution.output_uri], timedelta(minutes=5)
             )
 
             latest_output_uri = execution.output_uri
@@ -108,3 +209,75 @@ class VideoEditWorkflow:
             final_output_uri=latest_output_uri,
             iterations=settings.max_iterations,
         )
+
+
+@workflow.defn
+class BatchVideoEditWorkflow:
+    """
+    Runs one VideoEditWorkflow child per job, at most payload.parallelism at a
+    time, and aggregates their results. A child that fails, or that cannot start
+    because the job already has a running workflow, is counted as failed
+    without stopping the rest of the batch.
+    """
+
+    def __init__(self) -> None:
+        self._batch_id = ""
+        self._total = 0
+        self._running = 0
+        self._results: dict[str, WorkflowResult] = {}
+
+    @workflow.run
+    async def run(self, payload: BatchWorkflowInput) -> BatchWorkflowResult:
+        self._batch_id = payload.batch_id
+        self._total = len(payload.job_ids)
+        slots = asyncio.Semaphore(max(1, payload.parallelism))
+
+        async def run_job(job_id: str) -> None:
+            async with slots:
+                self._running += 1
+                try:
+                    self._results[job_id] = await workflow.execute_child_workflow(
+                        VideoEditWorkflow.run,
+                        WorkflowInput(
+                            job_id=job_id,
+                            local_activities=payload.local_activities,
+                            speculative_planning=payload.speculative_planning,
+                            plan_variants=payload.plan_variants,
+                        ),
+                        id=f"video-edit-{job_id}",
+                    )
+                except ChildWorkflowError as exc:
+                    workflow.logger.warning("Batch %s job %s failed: %s", payload.batch_id, job_id, exc)
+                    self._results[job_id] = WorkflowResult(job_id=job_id, final_status=JobStatus.failed.value)
+                except WorkflowAlreadyStartedError:
+                    # The job already has a workflow of its own (e.g. started outside this
+                    # batch); the batch does not track it.
+                    workflow.logger.warning(
+                        "Batch %s job %s already has a running workflow", payload.batch_id, job_id
+                    )
+                    self._results[job_id] = WorkflowResult(job_id=job_id, final_status=JobStatus.failed.value)
+                finally:
+                    self._running -= 1
+
+        await asyncio.gather(*(run_job(job_id) for job_id in payload.job_ids))
+        return BatchWorkflowResult(
+            batch_id=payload.batch_id,
+            total=self._total,
+            statuses=self._statuses(),
+            results=[self._results[job_id] for job_id in payload.job_ids],
+        )
+
+    def _statuses(self) -> dict[str, int]:
+        return dict(Counter(result.final_status for result in self._results.values()))
+
+    @workflow.query
+    def progress(self) -> BatchProgress:
+        completed = len(self._results)
+        return BatchProgress(
+            batch_id=self._batch_id,
+            total=self._total,
+            pending=self._total - completed - self._running,
+            running=self._running,
+            completed=completed,
+            statuses=self._statuses(),
+        )